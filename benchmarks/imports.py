@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Import time benchmark: wall time of short lived python processes
+which import netjsonconfig, compared with an empty interpreter;
+backends, schemas, jinja2 and jsonschema are loaded on first use,
+so importing the package and ``netjsonconfig --version`` are cheap.
+
+Usage::
+
+    python benchmarks/imports.py [runs]
+"""
+import os
+import subprocess
+import sys
+import timeit
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      os.pardir, 'bin', 'netjsonconfig')
+
+COMMANDS = [
+    ('python', [sys.executable, '-c', 'pass']),
+    ('import', [sys.executable, '-c', 'import netjsonconfig']),
+    ('backends', [sys.executable, '-c', 'from netjsonconfig import OpenWrt, OpenWisp']),
+    ('render', [sys.executable, '-c', 'from netjsonconfig import OpenWrt\n'
+                                      'OpenWrt({"general": {}}).render()']),
+    ('--version', [sys.executable, SCRIPT, '--version']),
+]
+
+
+def measure(command, runs):
+    with open(os.devnull, 'w') as devnull:
+        # warm up the filesystem cache and the bytecode files
+        subprocess.check_call(command, stdout=devnull, stderr=devnull)
+        timings = []
+        for i in range(runs):
+            start = timeit.default_timer()
+            subprocess.check_call(command, stdout=devnull, stderr=devnull)
+            timings.append(timeit.default_timer() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    baseline = None
+    for label, command in COMMANDS:
+        median = measure(command, runs)
+        if baseline is None:
+            baseline = median
+            extra = ''
+        else:
+            extra = '  (+{0:.2f} ms)'.format((median - baseline) * 1000)
+        print('{0:>10}: {1:8.2f} ms{2}'.format(label, median * 1000, extra))
+    print('median of {0} runs'.format(runs))
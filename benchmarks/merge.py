@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark of the backend initialization on large configurations:
+deep copy of the config followed by a merge which deep copies
+every list (previous behaviour) versus the structural sharing
+merge used by the backends (``merge_config(copy=False)``).
+
+Reports time and peak memory allocated per device.
+
+Usage::
+
+    python benchmarks/merge.py [iterations] [size]
+"""
+import sys
+import tracemalloc
+from copy import deepcopy
+from timeit import timeit
+
+from netjsonconfig import OpenWrt
+from netjsonconfig.utils import merge_config
+
+
+def build_config(size):
+    return {
+        "type": "DeviceConfiguration",
+        "general": {"hostname": "bench"},
+        "interfaces": [
+            {
+                "name": "eth0.{0}".format(i),
+                "type": "ethernet",
+                "addresses": [
+                    {
+                        "address": "10.{0}.{1}.1".format(i // 256, i % 256),
+                        "mask": 24,
+                        "proto": "static",
+                        "family": "ipv4"
+                    }
+                ]
+            } for i in range(size)
+        ],
+        "routes": [
+            {
+                "device": "eth0.{0}".format(i),
+                "next": "10.{0}.{1}.254".format(i // 256, i % 256),
+                "destination": "172.16.{0}.0/24".format(i % 256),
+                "cost": i
+            } for i in range(size)
+        ],
+        "files": [
+            {
+                "path": "/etc/blob{0}".format(i),
+                "contents": "x" * 4096
+            } for i in range(size // 10)
+        ]
+    }
+
+
+template = {
+    "ntp": {"enabled": True, "server": ["0.openwrt.pool.ntp.org"]},
+    "interfaces": [{"name": "lo", "type": "loopback"}],
+    "files": [{"path": "/etc/template", "contents": "template"}]
+}
+
+
+def deep_copy(config):
+    config = deepcopy(config)
+    return merge_config(OpenWrt._merge_templates([template]), config)
+
+
+def sharing(config):
+    return OpenWrt(config, templates=[template]).config
+
+
+def peak_memory(function, config):
+    tracemalloc.start()
+    function(config)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    config = build_config(size)
+    for function in (deep_copy, sharing):
+        function(config)
+        elapsed = timeit(lambda: function(config), number=number)
+        peak = peak_memory(function, config)
+        print('{0:>10}: {1:8.3f} ms {2:10.1f} KiB per device'.format(
+            function.__name__, elapsed / number * 1000, peak / 1024.0))
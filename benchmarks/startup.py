@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Startup benchmark: time needed by a fresh python process to import
+netjsonconfig and load all the templates of the backends, with
+precompiled templates (``python setup.py build_templates``)
+versus compiling them from source.
+
+Usage::
+
+    python benchmarks/startup.py [runs]
+"""
+import subprocess
+import sys
+
+from netjsonconfig.backends import jinja
+
+SNIPPET = """
+import time
+start = time.time()
+from netjsonconfig.backends import jinja
+jinja.use_precompiled = {precompiled}
+for package in jinja.TEMPLATE_PACKAGES:
+    env = jinja.get_environment(package)
+    for name in env.list_templates():
+        env.get_template(name)
+print(time.time() - start)
+"""
+
+
+def measure(precompiled, runs):
+    code = SNIPPET.format(precompiled=precompiled)
+    timings = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', code])
+        timings.append(float(output))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    jinja.compile_all()
+    for precompiled in (False, True):
+        label = 'precompiled' if precompiled else 'source'
+        median = measure(precompiled, runs)
+        print('{0:>12}: {1:8.2f} ms (median of {2} runs)'.format(label, median * 1000, runs))
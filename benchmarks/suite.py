@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+"""
+Benchmark suite: runs every phase of the configuration pipeline
+(load, merge, validate, render, generate) on scenarios of increasing
+size and reports the time and the peak memory allocated by each phase.
+
+Phases:
+
+* ``load``: ``json.loads`` of the NetJSON text
+* ``merge``: backend initialization, templates are merged into the config
+* ``validate``: ``validate`` method
+* ``render``: ``render`` method (includes validation, like the public API)
+* ``generate``: configuration archive built in memory (includes validation)
+
+Timings are the minimum and the median of ``--repeat`` runs, peak memory
+is measured in a separate run with ``tracemalloc``.
+
+Usage::
+
+    python benchmarks/suite.py [--scenario NAME ...] [--repeat N]
+                               [--json FILE] [--compare FILE]
+
+``--json`` writes the results in a machine readable format (``-`` for the
+standard output), ``--compare`` prints the change of the median timings
+relative to the results of a previous run (eg: of the previous release).
+"""
+import argparse
+import base64
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from collections import OrderedDict
+from time import perf_counter
+
+from netjsonconfig import OpenWisp, OpenWrt, get_version
+
+PHASES = ('load', 'merge', 'validate', 'render', 'generate')
+
+TEMPLATE = {
+    "ntp": {
+        "enabled": True,
+        "server": ["0.openwrt.pool.ntp.org", "1.openwrt.pool.ntp.org"]
+    },
+    "interfaces": [{"name": "lo", "type": "loopback",
+                    "addresses": [{"address": "127.0.0.1", "mask": 8,
+                                   "proto": "static", "family": "ipv4"}]}],
+    "files": [{"path": "/etc/banner", "contents": "managed by netjsonconfig\n"}]
+}
+
+
+def _address(address, mask, family='ipv4'):
+    return {"address": address, "mask": mask, "proto": "static", "family": family}
+
+
+def _radio(name, protocol, channel):
+    return {
+        "name": name,
+        "phy": name.replace('radio', 'phy'),
+        "driver": "mac80211",
+        "protocol": protocol,
+        "channel": channel,
+        "channel_width": 20,
+        "tx_power": 10,
+        "country": "IT"
+    }
+
+
+def _wifi(name, radio, ssid, network, key=None):
+    wireless = {"radio": radio, "mode": "access_point",
+                "ssid": ssid, "network": [network]}
+    if key:
+        wireless["encryption"] = {"enabled": True, "protocol": "wpa2_personal",
+                                  "cipher": "auto", "key": key}
+    return {"name": name, "type": "wireless", "wireless": wireless}
+
+
+def minimal():
+    return OpenWrt, {"general": {"hostname": "minimal"}}
+
+
+def access_point():
+    """ typical dual band access point """
+    return OpenWrt, {
+        "general": {"hostname": "access-point", "timezone": "Europe/Rome"},
+        "interfaces": [
+            {"name": "eth0", "type": "ethernet",
+             "addresses": [{"proto": "dhcp", "family": "ipv4"}]},
+            {"name": "lan", "type": "bridge", "bridge_members": ["eth1", "eth2"],
+             "addresses": [_address("192.168.1.1", 24),
+                           _address("fd00::1", 64, 'ipv6')]},
+            _wifi("wlan0", "radio0", "office", "lan", "office-passphrase"),
+            _wifi("wlan1", "radio1", "office-5g", "lan", "office-passphrase"),
+            _wifi("wlan2", "radio0", "guests", "lan"),
+            _wifi("wlan3", "radio1", "guests-5g", "lan")
+        ],
+        "radios": [_radio("radio0", "802.11n", 6), _radio("radio1", "802.11ac", 36)],
+        "dns_servers": ["10.0.0.1", "10.0.0.2"],
+        "dns_search": ["example.com"],
+        "routes": [{"device": "eth0", "next": "10.0.0.254",
+                    "destination": "10.1.0.0/16", "cost": 1}],
+        "led": [{"name": "WLAN", "sysfs": "ap:green:wlan", "trigger": "phy0tpt"}],
+        "files": [{"path": "/etc/dropbear/authorized_keys",
+                   "contents": "ssh-rsa AAAA bench@example.com\n", "mode": "0600"}]
+    }
+
+
+def core_router(size=500):
+    """ core router with ``size`` vlan interfaces, routes and rules """
+    return OpenWrt, {
+        "general": {"hostname": "core-router"},
+        "interfaces": [
+            {
+                "name": "eth0.{0}".format(i),
+                "type": "ethernet",
+                "mtu": 1500,
+                "addresses": [
+                    _address("10.{0}.{1}.1".format(i // 256, i % 256), 24),
+                    _address("fd00:{0:x}::1".format(i), 64, 'ipv6')
+                ]
+            } for i in range(size)
+        ],
+        "routes": [
+            {
+                "device": "eth0.{0}".format(i),
+                "next": "10.{0}.{1}.254".format(i // 256, i % 256),
+                "destination": "172.{0}.{1}.0/24".format(16 + i // 256, i % 256),
+                "cost": i
+            } for i in range(size)
+        ],
+        "ip_rules": [
+            {"in": "eth0.{0}".format(i), "src": "10.{0}.{1}.0/24".format(i // 256, i % 256),
+             "lookup": str(i % 250 + 1)} for i in range(size // 5)
+        ],
+        "switch": [
+            {
+                "name": "switch0",
+                "reset": True,
+                "enable_vlan": True,
+                "vlan": [{"device": "switch0", "vlan": i + 1, "ports": "0t 1t"}
+                         for i in range(min(size, 4094))]
+            }
+        ]
+    }
+
+
+def large_files(total=50 * 1024 * 1024, count=50):
+    """ ``total`` bytes of (incompressible) additional files """
+    rand = random.Random(0)
+    size = total // count * 3 // 4
+    files = []
+    for i in range(count):
+        contents = rand.getrandbits(size * 8).to_bytes(size, 'little')
+        files.append({"path": "/etc/blobs/blob{0}".format(i),
+                      "contents": base64.b64encode(contents).decode('ascii')})
+    return OpenWrt, {"general": {"hostname": "large-files"}, "files": files}
+
+
+def openwisp(tunnels=4):
+    """ OpenWisp archive with tap VPNs and traffic control """
+    config = {
+        "general": {"hostname": "openwisp-bench"},
+        "interfaces": [],
+        "openvpn": [],
+        "tc_options": [],
+        "files": []
+    }
+    for i in range(tunnels):
+        name = 'tap{0}'.format(i)
+        vpn = str(2690 + i)
+        x509 = '/tmp/owispmanager/openvpn/x509'
+        config["interfaces"] += [
+            {"name": name, "type": "virtual"},
+            {"name": "br-serv{0}".format(i), "network": "serv{0}".format(i),
+             "type": "bridge", "bridge_members": [name],
+             "addresses": [_address("192.168.{0}.2".format(i), 24)]}
+        ]
+        config["openvpn"].append({
+            "config_name": "openvpn",
+            "config_value": vpn,
+            "enabled": "1",
+            "client": "1",
+            "dev": name,
+            "dev_type": "tap",
+            "proto": "tcp-client",
+            "remote": "vpn.example.com 1212{0}".format(i),
+            "ca": "{0}/ca_{1}.pem".format(x509, vpn),
+            "cert": "{0}/client_{1}.pem".format(x509, vpn),
+            "key": "{0}/client_{1}.pem".format(x509, vpn),
+            "up": "/tmp/owispmanager/openvpn/vpn_{0}_script_up.sh".format(vpn),
+            "down": "/tmp/owispmanager/openvpn/vpn_{0}_script_down.sh".format(vpn),
+            "script_security": "3"
+        })
+        config["tc_options"].append({"name": name, "input_bandwidth": 2048,
+                                     "output_bandwidth": 1024})
+        for path in ('ca', 'client'):
+            config["files"].append({
+                "path": "/openvpn/x509/{0}_{1}.pem".format(path, vpn),
+                "contents": "-----BEGIN CERTIFICATE-----\n{0}\n"
+                            "-----END CERTIFICATE-----\n".format('A' * 1200)
+            })
+    return OpenWisp, config
+
+
+SCENARIOS = OrderedDict([
+    ('minimal', minimal),
+    ('access_point', access_point),
+    ('core_router', core_router),
+    ('large_files', large_files),
+    ('openwisp', openwisp),
+])
+
+
+class StopPipeline(Exception):
+    pass
+
+
+def run_pipeline(backend_class, text, measure, phases=PHASES):
+    """
+    runs ``phases`` in order, ``measure(phase, function)``
+    must call ``function`` and return its result
+    """
+    def step(phase, function):
+        if phase not in phases:
+            raise StopPipeline()
+        return measure(phase, function)
+    try:
+        config = step('load', lambda: json.loads(text))
+        backend = step('merge', lambda: backend_class(config, templates=[TEMPLATE], copy=False))
+        step('validate', backend.validate)
+        step('render', backend.render)
+        step('generate', backend.generate)
+    except StopPipeline:
+        pass
+
+
+def _timed(timings):
+    def measure(phase, function):
+        start = perf_counter()
+        result = function()
+        timings.setdefault(phase, []).append(perf_counter() - start)
+        return result
+    return measure
+
+
+def _traced(peaks):
+    def measure(phase, function):
+        tracemalloc.start()
+        try:
+            return function()
+        finally:
+            peaks[phase] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return measure
+
+
+def run_scenario(name, repeat):
+    backend_class, config = SCENARIOS[name]()
+    text = json.dumps(config)
+    result = OrderedDict([('backend', backend_class.__name__),
+                          ('input_size', len(text)),
+                          ('phases', OrderedDict()),
+                          ('error', None)])
+    timings = {}
+    peaks = {}
+    completed = []
+
+    def warm_up(phase, function):
+        value = function()
+        completed.append(phase)
+        return value
+    # warms up caches (templates, validators), the phases following
+    # a failed one are not measured and the error is reported
+    try:
+        run_pipeline(backend_class, text, warm_up)
+    except Exception as e:
+        result['error'] = '{0}: {1}: {2}'.format(PHASES[len(completed)],
+                                                 e.__class__.__name__, e)
+    for i in range(repeat):
+        run_pipeline(backend_class, text, _timed(timings), completed)
+    run_pipeline(backend_class, text, _traced(peaks), completed)
+    for phase in PHASES:
+        if phase not in timings:
+            continue
+        values = sorted(timings[phase])
+        result['phases'][phase] = OrderedDict([
+            ('min', values[0]),
+            ('median', values[len(values) // 2]),
+            ('peak_memory', peaks.get(phase))
+        ])
+    return result
+
+
+def print_results(results, baseline=None):
+    print('{0:<14}{1:<10}{2:>12}{3:>12}{4:>14}{5:>10}'.format(
+        'scenario', 'phase', 'min ms', 'median ms', 'peak KiB', 'change'))
+    for name, result in results['scenarios'].items():
+        for phase, values in result['phases'].items():
+            change = ''
+            try:
+                previous = baseline['scenarios'][name]['phases'][phase]['median']
+                change = '{0:+.1f}%'.format((values['median'] / previous - 1) * 100)
+            except (KeyError, TypeError, ZeroDivisionError):
+                pass
+            peak = values['peak_memory']
+            print('{0:<14}{1:<10}{2:>12.3f}{3:>12.3f}{4:>14}{5:>10}'.format(
+                name, phase, values['min'] * 1000, values['median'] * 1000,
+                '{0:.1f}'.format(peak / 1024.0) if peak is not None else '-', change))
+        if result['error']:
+            print('{0:<14}error: {1}'.format(name, result['error']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='netjsonconfig benchmark suite')
+    parser.add_argument('--scenario', '-s', action='append', choices=list(SCENARIOS.keys()),
+                        help='scenario to run, may be repeated (default: all)')
+    parser.add_argument('--repeat', '-r', type=int, default=5,
+                        help='timed runs of each scenario (default: 5)')
+    parser.add_argument('--json', '-j', metavar='FILE',
+                        help='write the results as JSON to FILE ("-" for stdout)')
+    parser.add_argument('--compare', '-c', metavar='FILE',
+                        help='JSON results of a previous run to compare with')
+    args = parser.parse_args(argv)
+    results = OrderedDict([
+        ('netjsonconfig', get_version()),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('repeat', args.repeat),
+        ('scenarios', OrderedDict())
+    ])
+    for name in args.scenario or SCENARIOS.keys():
+        results['scenarios'][name] = run_scenario(name, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    if args.json == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
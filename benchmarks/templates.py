@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Benchmark of the template cache: time spent by the backend initialization
+(loading and merging ``templates`` into the device config) per device,
+with the cache enabled (default) and disabled (``template_cache = None``),
+with templates passed as JSON strings (eg: read from files, as the
+command line utility does) and as dictionaries, which are not cached.
+
+Scenarios: ``small`` uses 4 small templates, ``large`` uses 4 templates
+as big as synthetic devices (see ``netjsonconfig.synthetic``).
+
+Usage::
+
+    python benchmarks/templates.py [iterations]
+"""
+import json
+import sys
+from timeit import timeit
+
+from netjsonconfig import OpenWrt
+from netjsonconfig.synthetic import FleetGenerator
+
+
+class NoCacheOpenWrt(OpenWrt):
+    template_cache = None
+
+
+def small_templates():
+    return [
+        {"ntp": {"enabled": True, "server": ["0.openwrt.pool.ntp.org"]}},
+        {"dns_servers": ["10.0.0.1", "10.0.0.2"], "dns_search": ["example.com"]},
+        {"interfaces": [{"name": "lo", "type": "loopback"}]},
+        {"files": [{"path": "/etc/banner", "contents": "managed by netjsonconfig\n"}]}
+    ]
+
+
+def large_templates():
+    generator = FleetGenerator(seed=1)
+    templates = []
+    for i in range(4):
+        template = generator.device(i)
+        del template['general']
+        templates.append(template)
+    return templates
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    config = {"general": {"hostname": "bench"}}
+    for scenario, build in (('small', small_templates), ('large', large_templates)):
+        dicts = build()
+        strings = [json.dumps(template) for template in dicts]
+        for kind, templates in (('strings', strings), ('dicts', dicts)):
+            for label, backend_class in (('cache', OpenWrt), ('no cache', NoCacheOpenWrt)):
+                backend_class(config, templates=templates)
+                elapsed = timeit(lambda: backend_class(config, templates=templates),
+                                 number=number)
+                print('{0:>6} {1:>8} {2:>9}: {3:9.1f} us per device'.format(
+                    scenario, kind, label, elapsed / number * 1e6))
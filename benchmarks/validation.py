@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the per-device validation cost:
+``jsonschema.validate`` (schema checked and validator rebuilt
+on every call) versus the cached validator of the backend class
+and the validator compiled from the schema (``netjsonconfig.compiler``).
+
+Usage::
+
+    python benchmarks/validation.py [iterations]
+"""
+import sys
+from timeit import timeit
+
+from jsonschema import validate
+
+from netjsonconfig import OpenWrt
+
+config = {
+    "type": "DeviceConfiguration",
+    "general": {"hostname": "bench"},
+    "interfaces": [
+        {
+            "name": "eth0.{0}".format(i),
+            "type": "ethernet",
+            "addresses": [
+                {
+                    "address": "10.0.{0}.1".format(i),
+                    "mask": 24,
+                    "proto": "static",
+                    "family": "ipv4"
+                }
+            ]
+        } for i in range(10)
+    ],
+    "radios": [
+        {
+            "name": "radio0",
+            "phy": "phy0",
+            "driver": "mac80211",
+            "protocol": "802.11n",
+            "channel": 11,
+            "channel_width": 20
+        }
+    ]
+}
+
+
+class CompiledOpenWrt(OpenWrt):
+    validation_engine = 'compiled'
+
+
+def uncached():
+    validate(config, OpenWrt.schema)
+
+
+def cached():
+    OpenWrt(config).validate()
+
+
+def compiled():
+    CompiledOpenWrt(config).validate()
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    # warm up the cached validators
+    cached()
+    compiled()
+    for function in (uncached, cached, compiled):
+        elapsed = timeit(function, number=number)
+        print('{0:>10}: {1:8.3f} ms per device'.format(function.__name__,
+                                                       elapsed / number * 1000))
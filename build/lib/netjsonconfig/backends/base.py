@@ -0,0 +1,220 @@
+from collections import OrderedDict
+
+import six
+
+
+class UciWriter(object):
+    """
+    Builds UCI output directly, without templates;
+    used by the ``direct`` render engine.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def section(self, type_, name=None):
+        """ starts a config section, ends the previous one if any """
+        if name is None:
+            self.chunks.append('config {0}\n'.format(type_))
+        else:
+            self.chunks.append("config {0} '{1}'\n".format(type_, self.format(name)))
+
+    def end_section(self):
+        self.chunks.append('\n')
+
+    def option(self, key, value):
+        self.chunks.append("\toption {0} '{1}'\n".format(key, self.format(value)))
+
+    def list(self, key, values):
+        for value in values:
+            self.chunks.append("\tlist {0} '{1}'\n".format(key, self.format(value)))
+
+    def options(self, block, skip=()):
+        """ adds an option for each non empty value of ``block`` """
+        for key, value in block.items():
+            if key not in skip and value not in ['', None]:
+                self.option(key, value)
+
+    @staticmethod
+    def format(value):
+        if isinstance(value, bool):
+            return '1' if value else '0'
+        return six.text_type(value)
+
+    def getvalue(self):
+        output = ''.join(self.chunks)
+        # ensure output always ends with 1 new line
+        if output.endswith('\n\n'):
+            return output[0:-1]
+        return output
+
+
+class BaseRenderer(object):
+    """
+    Renderers are used to generate specific configuration blocks.
+    """
+    block_name = None
+
+    def __init__(self, backend):
+        self.config = backend.config
+        self.backend = backend
+
+    @property
+    def env(self):
+        return self.backend.env
+
+    @classmethod
+    def get_package(cls):
+        return str(cls.__name__).replace('Renderer', '').lower()
+
+    def cleanup(self, output):
+        """
+        Performs cleanup of output (indentation, new lines)
+        """
+        # correct indentation
+        output = output.replace('    ', '')\
+                       .replace('option', '\toption')\
+                       .replace('list', '\tlist')
+        # convert True to 1 and False to 0
+        output = output.replace('True', '1')\
+                       .replace('False', '0')
+        # max 2 consecutive \n delimiters
+        output = output.replace('\n\n\n', '\n\n')
+        # if output is present
+        # ensure it always ends with 1 new line
+        if output.endswith('\n\n'):
+            return output[0:-1]
+        return output
+
+    def render(self):
+        """
+        Renders config block in UCI format, one UCI package after the other
+        """
+        packages = self.render_packages()
+        return '\n'.join(self.format_package(name, contents)
+                         for name, contents in packages.items())
+
+    @staticmethod
+    def format_package(name, contents):
+        """
+        returns the UCI output of a package
+        """
+        if not contents:
+            return 'package {0}\n'.format(name)
+        return 'package {0}\n\n{1}'.format(name, contents)
+
+    def render_packages(self):
+        """
+        Renders the config sections of each UCI package
+
+        :returns: ``OrderedDict`` which maps package names to their contents
+        """
+        with self.backend._measure('{0}.get_context'.format(self.__class__.__name__)):
+            context = self.get_context()
+        if context['is_empty']:
+            return OrderedDict()
+        return OrderedDict([(self.get_package(), self.render_contents(context))])
+
+    def render_contents(self, context):
+        """
+        Renders config sections with jinja2 templating engine
+        or directly if the ``direct`` engine is in use
+        """
+        measure = self.backend._measure
+        name = self.__class__.__name__
+        if self.backend.engine == 'direct':
+            with measure('{0}.render'.format(name)):
+                writer = UciWriter()
+                self.emit(writer, context)
+                return writer.getvalue()
+        # get jinja2 template
+        template_name = '{0}.uci'.format(self.get_package())
+        template = self.env.get_template(template_name)
+        # render template and cleanup
+        with measure('{0}.render'.format(name)):
+            output = template.render(**context)
+        with measure('{0}.cleanup'.format(name)):
+            return self.cleanup(output)
+
+    def emit(self, writer, context):
+        """
+        Writes the config sections in ``writer`` (``UciWriter`` instance),
+        must produce the same output of the jinja2 template
+        """
+        raise NotImplementedError()
+
+    def get_context(self):
+        """
+        Builds context that is passed to jinja2 templates
+        """
+        # get list of private methods that start with "_get_"
+        methods = [method for method in dir(self) if method.startswith('_get_')]
+        context = {}
+        # build context
+        for method in methods:
+            key = method.replace('_get_', '')
+            context[key] = getattr(self, method)()
+        # determine if all context values are empty
+        context['is_empty'] = not any(context.values())
+        return context
+
+
+class BaseParser(object):
+    """
+    Parsers are the inverse of renderers: they convert
+    the sections of a UCI package back to NetJSON.
+
+    Each section is passed to the ``_parse_<type>`` method
+    (dashes replaced by underscores), unknown sections are ignored.
+    """
+    def __init__(self, config, schema):
+        """
+        :param config: NetJSON ``dict`` which is filled by the parser
+        :param schema: JSON-Schema of the backend, used to restore option types
+        """
+        self.config = config
+        self.schema = schema
+
+    @classmethod
+    def get_package(cls):
+        return str(cls.__name__).replace('Parser', '').lower()
+
+    def parse(self, sections):
+        """
+        Adds the NetJSON representation of ``sections``
+        (list of ``uci.Section`` instances) to ``config``
+        """
+        for section in sections:
+            name = '_parse_{0}'.format(section.type.replace('-', '_'))
+            method = getattr(self, name, None)
+            if method is not None:
+                method(section)
+
+    @staticmethod
+    def convert(value, schema):
+        """
+        converts the string ``value`` of a UCI option
+        to the type defined in ``schema``, if possible
+        """
+        type_ = schema.get('type')
+        if isinstance(value, list):
+            return value
+        if type_ == 'boolean':
+            return value in ('1', 'true', 'yes', 'on', 'enabled')
+        if type_ == 'array':
+            return value.split()
+        try:
+            if type_ == 'integer':
+                return int(value)
+            if type_ == 'number':
+                return float(value)
+        except ValueError:
+            pass
+        return value
+
+    def options(self, options, properties, skip=()):
+        """
+        returns a ``dict`` with the options of a section
+        converted according to the schema ``properties``
+        """
+        return dict((key, self.convert(value, properties.get(key, {})))
+                    for key, value in options.items() if key not in skip)
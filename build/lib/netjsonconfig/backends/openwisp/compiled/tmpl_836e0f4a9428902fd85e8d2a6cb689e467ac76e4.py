@@ -0,0 +1,14 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'vpn_script_down.sh'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    pass
+    yield '#!/bin/sh\n# When openvpn lost connection restart AP, after config time\n# This will place the AP in safemode\nREBOOT_ENABLE=`uci -q get owispmanager.vpn_fail.reboot_enabled || echo 0`\nREBOOT_DELAY=`uci -q get owispmanager.vpn_fail.reboot_delay || echo 180`\nif [ "$REBOOT_ENABLE" -eq "1" ]; then\n  touch /tmp/will_reboot\n  sleep $REBOOT_DELAY\n  if [ -f /tmp/will_reboot ]; then\n    reboot\n  fi\nfi\nreturn 0'
+
+blocks = {}
+debug_info = ''
\ No newline at end of file
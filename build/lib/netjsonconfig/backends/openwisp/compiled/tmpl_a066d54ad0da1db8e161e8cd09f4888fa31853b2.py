@@ -0,0 +1,94 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'tc_script.sh'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_tc_options = resolve('tc_options')
+    try:
+        t_1 = environment.filters['int']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'int' found.")
+    try:
+        t_2 = environment.filters['round']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'round' found.")
+    pass
+    yield '#!/bin/sh /etc/rc.common\n\nKERNEL_VERSION=`uname -r`\nKERNEL_MODULES="sch_htb sch_prio sch_sfq cls_fw sch_dsmark sch_ingress sch_tbf sch_red sch_hfsc act_police cls_tcindex cls_flow cls_route cls_u32"\nKERNEL_MPATH=/lib/modules/$KERNEL_VERSION/\n\nTC_COMMAND=/usr/sbin/tc\n\ncheck_prereq() {\n    echo "Checking prerequisites..."\n\n    echo "Checking kernel modules..."\n    for kmod in $KERNEL_MODULES; do\n    if [ ! -f $KERNEL_MPATH/$kmod.ko ]; then\n        echo "Prerequisite error: can\'t find kernel module \'$kmod\' in \'$KERNEL_MPATH\'"\n        exit 1\n    fi\n    done\n\n    echo "Checking tc tool..."\n    if [ ! -x $TC_COMMAND ]; then\n        echo "Prerequisite error: can\'t find traffic control tool ($TC_COMMAND)"\n        exit 1\n    fi\n\n    echo "Prerequisites satisfied."\n}\n\nload_modules() {\n    for kmod in $KERNEL_MODULES; do\n        insmod $KERNEL_MPATH/$kmod.ko  >/dev/null 2>&1\n    done\n}\n\nunload_modules() {\n    for kmod in $KERNEL_MODULES; do\n        rmmod $kmod  >/dev/null 2>&1\n    done\n}\n\n\nstop() {\n'
+    for l_1_interface in (undefined(name='tc_options') if l_0_tc_options is missing else l_0_tc_options):
+        _loop_vars = {}
+        pass
+        yield '    '
+        if environment.getattr(l_1_interface, 'output_bandwidth'):
+            pass
+            yield '\n    tc qdisc del dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' root\n\n    '
+        yield '    '
+        if environment.getattr(l_1_interface, 'input_bandwidth'):
+            pass
+            yield '\n    tc qdisc del dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' ingress\n\n    '
+    l_1_interface = missing
+    yield '\n    unload_modules\n}\n\nstart() {\n    check_prereq\n    load_modules\n\n'
+    for l_1_interface in (undefined(name='tc_options') if l_0_tc_options is missing else l_0_tc_options):
+        l_1_burst_rate = resolve('burst_rate')
+        l_1_divided_rate = resolve('divided_rate')
+        _loop_vars = {}
+        pass
+        yield '    '
+        if environment.getattr(l_1_interface, 'output_bandwidth'):
+            pass
+            yield '\n    # shaping output traffic for '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield '\n    # creating parent qdisc for root\n    tc qdisc add dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' root handle 1: htb default 2\n\n    # aggregated traffic shaping parent class\n        '
+            l_1_burst_rate = (0.187 * environment.getattr(l_1_interface, 'output_bandwidth'))
+            _loop_vars['burst_rate'] = l_1_burst_rate
+            yield '\n    tc class add dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' parent 1 classid 1:1 htb rate '
+            yield str(environment.getattr(l_1_interface, 'output_bandwidth'))
+            yield 'kbit burst '
+            yield str(t_1(t_2((undefined(name='burst_rate') if l_1_burst_rate is missing else l_1_burst_rate))))
+            yield 'k\n\n    '
+            l_1_divided_rate = (environment.getattr(l_1_interface, 'output_bandwidth') / 2)
+            _loop_vars['divided_rate'] = l_1_divided_rate
+            yield '\n    # default traffic shaping class\n    tc class add dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' parent 1:1 classid 1:2 htb rate '
+            yield str(t_1(t_2((undefined(name='divided_rate') if l_1_divided_rate is missing else l_1_divided_rate))))
+            yield 'kbit ceil '
+            yield str(environment.getattr(l_1_interface, 'output_bandwidth'))
+            yield 'kbit\n\n        '
+        yield '    '
+        if environment.getattr(l_1_interface, 'input_bandwidth'):
+            pass
+            yield '\n    # policing input traffic for '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield '\n    # creating parent qdisc for ingress\n    tc qdisc add dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' ingress\n\n    '
+            l_1_burst_rate = (0.187 * environment.getattr(l_1_interface, 'input_bandwidth'))
+            _loop_vars['burst_rate'] = l_1_burst_rate
+            yield '\n    # default policer with lowest preference (last checked)\n    tc filter add dev '
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield ' parent ffff: preference 0 u32 match u32 0x0 0x0 police rate '
+            yield str(environment.getattr(l_1_interface, 'input_bandwidth'))
+            yield 'kbit burst '
+            yield str(t_1(t_2((undefined(name='burst_rate') if l_1_burst_rate is missing else l_1_burst_rate))))
+            yield 'k drop flowid :1\n        '
+    l_1_interface = l_1_burst_rate = l_1_divided_rate = missing
+    yield '\n}\n\nboot() {\n    start\n}\n\nrestart() {\n    stop\n    start\n}'
+
+blocks = {}
+debug_info = '43=25&44=29&46=32&49=35&51=38&63=42&64=48&66=51&68=53&72=55&74=58&76=64&79=67&88=74&90=77&92=79&94=81&97=84'
\ No newline at end of file
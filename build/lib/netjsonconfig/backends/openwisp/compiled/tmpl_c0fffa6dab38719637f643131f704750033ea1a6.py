@@ -0,0 +1,72 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'install.sh'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_hostname = resolve('hostname')
+    l_0_l2vpn = resolve('l2vpn')
+    l_0_bridges = resolve('bridges')
+    l_0_radios = resolve('radios')
+    l_0_cron = resolve('cron')
+    pass
+    yield '#!/bin/sh\nPROGDIR=$(cd -P -- "$(dirname $0)" && pwd -P)\n\n# Deploy new configuration\necho "Deploying new configuration"\n\n# System\necho "Changing hostname"\necho "'
+    yield str((undefined(name='hostname') if l_0_hostname is missing else l_0_hostname))
+    yield '" > /proc/sys/kernel/hostname\n\n# Networking\necho "Applying network configuration"\n# VPNs\n'
+    for l_1_vpn in (undefined(name='l2vpn') if l_0_l2vpn is missing else l_0_l2vpn):
+        _loop_vars = {}
+        pass
+        yield 'echo "Creating tap '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield '"\nopenvpn --mktun --dev '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield ' --dev-type tap\nwhile [ -z "`grep '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield ' /proc/net/dev`" ]; do\n  sleep 1\n  openvpn --mktun --dev '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield ' --dev-type tap\ndone\n'
+    l_1_vpn = missing
+    yield '\n# Network\necho "Creating bridges"\nuci -m import network -f $PROGDIR/uci/network.conf\n# ----------- Openwrt boot-bug workaround\nvconfig set_name_type DEV_PLUS_VID_NO_PAD\nsleep 5\n# ----------- Openwrt boot-bug workaround\n'
+    for l_1_bridge in (undefined(name='bridges') if l_0_bridges is missing else l_0_bridges):
+        _loop_vars = {}
+        pass
+        yield 'echo "Enabling bridge '
+        yield str(environment.getattr(l_1_bridge, 'name'))
+        yield '"\nifup '
+        yield str(environment.getattr(l_1_bridge, 'name'))
+        yield '\n'
+        if (environment.getattr(l_1_bridge, 'proto') == 'static'):
+            pass
+            yield '# Waiting for an IP address before starting WiFi configuration:\n# For instance if 802.1x is used the IP address to reach the RADIUS server\n# could be configured here...\n__timeout=10\nwhile [ -z "$(ip address show dev '
+            yield str(environment.getattr(l_1_bridge, 'name'))
+            yield ' | grep '
+            yield str(environment.getattr(l_1_bridge, 'ip'))
+            yield ')" -o $__timeout -le 0 ]; do\n  echo "Waiting for an IP address for bridge '
+            yield str(environment.getattr(l_1_bridge, 'name'))
+            yield '"\n  sleep 1\n  __timeout=`expr \\( $__timeout - 1 \\)`\n  if [ $__timeout -le 0 ]; then\n    echo "Timeout waiting for an IP address on bridge \''
+            yield str(environment.getattr(l_1_bridge, 'name'))
+            yield '\'!"\n    break\n  fi\ndone\n'
+    l_1_bridge = missing
+    yield '\n# Wifi\necho "Applying wifi configuration"\nuci -m import wireless -f $PROGDIR/uci/wireless.conf\necho "Enabling wifi"\n'
+    for l_1_radio in (undefined(name='radios') if l_0_radios is missing else l_0_radios):
+        _loop_vars = {}
+        pass
+        yield 'wifi up '
+        yield str(environment.getattr(l_1_radio, 'name'))
+        yield '\n'
+    l_1_radio = missing
+    yield '\n'
+    if (undefined(name='l2vpn') if l_0_l2vpn is missing else l_0_l2vpn):
+        pass
+        yield '# VPNs\necho "Applying l2 vpn(s) configuration"\nuci -m import openvpn -f $PROGDIR/uci/openvpn.conf\necho "Enabling l2 vpn(s)"\n/etc/init.d/openvpn start\n'
+    yield '\n# Traffic control\necho "Applying tc configuration"\n$PROGDIR/tc_script.sh start\n\n'
+    if (undefined(name='cron') if l_0_cron is missing else l_0_cron):
+        pass
+        yield '# cron scripts\nmkdir -p $PROGDIR/crontabs\nrm $PROGDIR/crond.pid >/dev/null 2>&1\necho "Starting Cron"\nstart-stop-daemon -m -p /var/run/openwisp_crond.pid -S -b -x crond -- -f -c $PROGDIR/crontabs/ -l 5\n'
+    yield '\necho "New configuration now active"'
+
+blocks = {}
+debug_info = '9=17&14=19&15=23&16=25&17=27&19=29&30=33&31=37&32=39&33=41&38=44&39=48&43=50&54=54&55=58&58=62&70=66'
\ No newline at end of file
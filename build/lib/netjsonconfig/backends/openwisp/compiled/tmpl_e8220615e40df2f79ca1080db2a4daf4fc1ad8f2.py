@@ -0,0 +1,30 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'uninstall.sh'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_l2vpn = resolve('l2vpn')
+    l_0_cron = resolve('cron')
+    pass
+    yield '#!/bin/sh\n\nPROGDIR=$(cd -P -- "$(dirname $0)" && pwd -P)\n\n# Disable traffic control\necho "Removing tc configuration"\n$PROGDIR/tc_script.sh stop\n\n# VPNs\necho "Stopping l2 vpn and removing their configuration"\nuci changes openvpn | grep "=\'openvpn" | cut -d\'.\' -f2 | cut -d\'=\' -f1 | awk \'{print "/var/run/openvpn-"$1".pid"}\' | xargs cat | xargs kill\nuci changes openvpn | grep "=\'openvpn" | cut -d\'.\' -f2 | cut -d\'=\' -f1 | awk \'{"rm /var/run/openvpn-"$1".pid"|getline;print}\'\nuci revert openvpn\n\n'
+    for l_1_vpn in (undefined(name='l2vpn') if l_0_l2vpn is missing else l_0_l2vpn):
+        _loop_vars = {}
+        pass
+        yield 'echo "Removing tap '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield '"\nopenvpn --rmtun --dev '
+        yield str(environment.getattr(l_1_vpn, 'name'))
+        yield ' --dev-type tap\n'
+    l_1_vpn = missing
+    yield '\nuci revert wireless\nuci revert network\n\necho "Restoring original wifi and network configurations"\n/etc/init.d/network restart\nwifi\n\n'
+    if (undefined(name='cron') if l_0_cron is missing else l_0_cron):
+        pass
+        yield 'echo "Stopping Cron"\nstart-stop-daemon -p /var/run/openwisp_crond.pid -K\nrm -rf  $PROGDIR/crontabs/\nrm /var/run/openwisp_crond.pid\n'
+    yield '\necho "Configuration un-installed"'
+
+blocks = {}
+debug_info = '15=14&16=18&17=20&27=24'
\ No newline at end of file
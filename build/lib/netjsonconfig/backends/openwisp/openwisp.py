@@ -0,0 +1,196 @@
+import re
+
+from ..openwrt.openwrt import DEFAULT_FILE_MODE, OpenWrt
+from ...utils import LazyAttribute
+
+
+class OpenWisp(OpenWrt):
+    """ OpenWisp 1.x Backend """
+    schema = LazyAttribute('netjsonconfig.backends.openwisp.schema', 'schema')
+    uci_member = re.compile(r'^uci/([^/]+)\.conf$')
+    generated_member = re.compile(r'^(install\.sh|uninstall\.sh|tc_script\.sh|openvpn/.*)$')
+    manifest_member = 'manifest.json'
+    removed_member = 'removed'
+
+    @property
+    def openwisp_env(self):
+        from ..jinja import get_environment
+        return get_environment('netjsonconfig.backends.openwisp')
+
+    def __init__(self, *args, **kwargs):
+        super(OpenWisp, self).__init__(*args, **kwargs)
+        # the config is modified only here, the other methods (validate,
+        # generate) leave it untouched so that ``fingerprint`` is stable
+        self._sanitize_radios()
+
+    def _copy_config(self, config):
+        """
+        radios are modified by ``_sanitize_radios``
+        """
+        config = super(OpenWisp, self)._copy_config(config)
+        if isinstance(config.get('radios'), list):
+            config['radios'] = [radio.copy() if isinstance(radio, dict) else radio
+                                for radio in config['radios']]
+        return config
+
+    def _sanitize_radios(self):
+        """
+        OpenWisp 1.x requires the following explicit entry
+        in the radio sections of /uci/wireless.conf:
+            option disabled '0'
+        """
+        radios = self.config.get('radios')
+        if not isinstance(radios, list):
+            return
+        for radio in radios:
+            if isinstance(radio, dict):
+                radio.setdefault('disabled', False)
+
+    def _render_template(self, template, context={}):
+        template = self.openwisp_env.get_template(template)
+        return template.render(**context)
+
+    def _add_unique_file(self, files, item):
+        """
+        adds a file in ``files`` only if not present already
+        """
+        if item not in files:
+            files.append(item)
+
+    def _get_install_context(self):
+        """
+        returns the template context for install.sh and uninstall.sh
+        """
+        config = self.config
+        # layer2 VPN list
+        l2vpn = []
+        for vpn in self.config.get('openvpn', []):
+            if vpn.get('dev_type') != 'tap':
+                continue
+            tap = vpn.copy()
+            tap['name'] = tap['config_value']
+            l2vpn.append(tap)
+        # bridge list
+        bridges = []
+        for interface in self.config.get('interfaces', []):
+            if interface['type'] != 'bridge':
+                continue
+            bridge = interface.copy()
+            if bridge.get('addresses'):
+                bridge['proto'] = interface['addresses'][0].get('proto')
+                bridge['ip'] = interface['addresses'][0].get('address')
+            bridges.append(bridge)
+        # crontabs present?
+        cron = False
+        for _file in config.get('files', []):
+            path = _file['path']
+            if path.startswith('/crontabs') or path.startswith('crontabs'):
+                cron = True
+                break
+        # return context
+        return dict(hostname=config['general']['hostname'],  # hostname is required
+                    l2vpn=l2vpn,
+                    bridges=bridges,
+                    radios=config.get('radios', []),  # radios might be empty
+                    cron=cron)
+
+    def _add_install(self, files, context):
+        """
+        generates install.sh and adds it to ``files``
+        """
+        contents = self._render_template('install.sh', context)
+        # add install.sh to list of included files
+        self._add_unique_file(files, {
+            "path": "/install.sh",
+            "contents": contents,
+            "mode": "755"
+        })
+
+    def _add_uninstall(self, files, context):
+        """
+        generates uninstall.sh and adds it to ``files``
+        """
+        contents = self._render_template('uninstall.sh', context)
+        # add uninstall.sh to list of included files
+        self._add_unique_file(files, {
+            "path": "/uninstall.sh",
+            "contents": contents,
+            "mode": "755"
+        })
+
+    def _add_openvpn_scripts(self, files):
+        l2vpn = []
+        for vpn in self.config.get('openvpn', []):
+            if vpn.get('dev_type') != 'tap':
+                continue
+            tap = vpn.copy()
+            if vpn.get('up'):
+                tap['up'] = vpn['up'].split('/')[-1]
+            if vpn.get('down'):
+                tap['down'] = vpn['down'].split('/')[-1]
+            l2vpn.append(tap)
+        # add scripts
+        for vpn in l2vpn:
+            if vpn.get('up'):
+                self._add_unique_file(files, {
+                    "path": "/openvpn/{0}".format(vpn['up']),
+                    "contents": self._render_template('vpn_script_up.sh'),
+                    "mode": "755"
+                })
+            if vpn.get('down'):
+                self._add_unique_file(files, {
+                    "path": "/openvpn/{0}".format(vpn['down']),
+                    "contents": self._render_template('vpn_script_down.sh'),
+                    "mode": "755"
+                })
+
+    def _add_tc_script(self, files):
+        """
+        generates tc_script.sh and adds it to ``files``
+        """
+        # fill context
+        context = dict(tc_options=self.config.get('tc_options', []))
+        # import pdb; pdb.set_trace()
+        contents = self._render_template('tc_script.sh', context)
+        # add tc_script.sh to list of included files
+        self._add_unique_file(files, {
+            "path": "/tc_script.sh",
+            "contents": contents,
+            "mode": "755"
+        })
+
+    def generate(self, fileobj=None, compresslevel=None, manifest=None):
+        """
+        Generates an openwisp configuration archive (zip), see ``OpenWrt.generate``.
+
+        :returns: ``fileobj`` if passed, otherwise in-memory zip archive,
+                  instance of ``BytesIO``
+        """
+        return super(OpenWisp, self).generate(fileobj, compresslevel, manifest)
+
+    def _get_members(self):
+        """
+        returns the UCI packages in ``uci/``, the generated
+        scripts and the additional files as archive members
+        """
+        packages = self.render_packages()
+        # for each package create a file with its contents in /uci
+        members = []
+        for name, contents in packages.items():
+            text_contents = 'package {0}\n\n{1}'.format(name, contents)
+            members.append(('uci/{0}.conf'.format(name), text_contents, DEFAULT_FILE_MODE))
+        # the generated scripts are added to a copy of the
+        # files, the configuration is not modified
+        files = list(self.config.get('files', []))
+        # prepare template context for install and uninstall scripts
+        template_context = self._get_install_context()
+        # add install.sh to included files
+        self._add_install(files, template_context)
+        # add uninstall.sh to included files
+        self._add_uninstall(files, template_context)
+        # add vpn up and down scripts
+        self._add_openvpn_scripts(files)
+        # add tc_script
+        self._add_tc_script(files)
+        # add additional files and the generated scripts
+        return members + self._get_file_members(files)
@@ -0,0 +1,3 @@
+#!/bin/sh
+
+rm -f /tmp/will_reboot
@@ -0,0 +1,89 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'system.uci'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_is_empty = resolve('is_empty')
+    l_0_system = resolve('system')
+    l_0_ntp = resolve('ntp')
+    l_0_leds = resolve('leds')
+    pass
+    if (not (undefined(name='is_empty') if l_0_is_empty is missing else l_0_is_empty)):
+        pass
+        yield '    '
+        if (undefined(name='system') if l_0_system is missing else l_0_system):
+            pass
+            yield '        config system\n        '
+            for (l_1_key, l_1_value) in context.call(environment.getattr((undefined(name='system') if l_0_system is missing else l_0_system), 'items')):
+                _loop_vars = {}
+                pass
+                yield '            '
+                if (l_1_value not in ['', None]):
+                    pass
+                    yield '                option '
+                    yield str(l_1_key)
+                    yield " '"
+                    yield str(l_1_value)
+                    yield "'\n            "
+                yield '        '
+            l_1_key = l_1_value = missing
+            yield '\n    '
+        yield '    '
+        if (undefined(name='ntp') if l_0_ntp is missing else l_0_ntp):
+            pass
+            yield "        config timeserver 'ntp'\n        "
+            if environment.getattr((undefined(name='ntp') if l_0_ntp is missing else l_0_ntp), 'server'):
+                pass
+                yield '            '
+                for l_1_item in environment.getattr((undefined(name='ntp') if l_0_ntp is missing else l_0_ntp), 'server'):
+                    _loop_vars = {}
+                    pass
+                    yield "                list server '"
+                    yield str(l_1_item)
+                    yield "'\n            "
+                l_1_item = missing
+                yield '        '
+            yield '        '
+            for (l_1_key, l_1_value) in context.call(environment.getattr((undefined(name='ntp') if l_0_ntp is missing else l_0_ntp), 'items')):
+                _loop_vars = {}
+                pass
+                yield '            '
+                if ((l_1_key != 'server') and (l_1_value not in ['', None])):
+                    pass
+                    yield '                option '
+                    yield str(l_1_key)
+                    yield " '"
+                    yield str(l_1_value)
+                    yield "'\n            "
+                yield '        '
+            l_1_key = l_1_value = missing
+            yield '\n    '
+        yield '    '
+        for l_1_led in (undefined(name='leds') if l_0_leds is missing else l_0_leds):
+            _loop_vars = {}
+            pass
+            yield "        config led 'led_"
+            yield str(context.call(environment.getattr(environment.getattr(l_1_led, 'name'), 'lower'), _loop_vars=_loop_vars))
+            yield "'\n            "
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_led, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if (l_2_value not in ['', None]):
+                    pass
+                    yield '                    option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n                "
+                yield '            '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_led = missing
+
+blocks = {}
+debug_info = '1=15&2=18&4=21&5=25&6=28&11=36&13=39&14=42&15=46&18=51&19=55&20=58&25=66&26=70&27=72&28=76&29=79'
\ No newline at end of file
@@ -0,0 +1,60 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'wireless.uci'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_is_empty = resolve('is_empty')
+    l_0_radios = resolve('radios')
+    l_0_wifi_interfaces = resolve('wifi_interfaces')
+    pass
+    if (not (undefined(name='is_empty') if l_0_is_empty is missing else l_0_is_empty)):
+        pass
+        yield '    '
+        for l_1_radio in (undefined(name='radios') if l_0_radios is missing else l_0_radios):
+            _loop_vars = {}
+            pass
+            yield "        config wifi-device '"
+            yield str(environment.getattr(l_1_radio, 'name'))
+            yield "'\n        "
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_radio, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '            '
+                if ((l_2_key != 'name') and (l_2_value not in ['', None])):
+                    pass
+                    yield '                option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n            "
+                yield '        '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_radio = missing
+        yield '    '
+        for l_1_wifi_interface in (undefined(name='wifi_interfaces') if l_0_wifi_interfaces is missing else l_0_wifi_interfaces):
+            _loop_vars = {}
+            pass
+            yield '        config wifi-iface\n        '
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_wifi_interface, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '            '
+                if (l_2_value not in ['', None]):
+                    pass
+                    yield '                option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n            "
+                yield '        '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_wifi_interface = missing
+
+blocks = {}
+debug_info = '1=14&2=17&3=21&4=23&5=27&6=30&11=39&13=43&14=47&15=50'
\ No newline at end of file
@@ -0,0 +1,150 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'network.uci'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_is_empty = resolve('is_empty')
+    l_0_globals = resolve('globals')
+    l_0_interfaces = resolve('interfaces')
+    l_0_routes = resolve('routes')
+    l_0_ip_rules = resolve('ip_rules')
+    l_0_switches = resolve('switches')
+    pass
+    if (not (undefined(name='is_empty') if l_0_is_empty is missing else l_0_is_empty)):
+        pass
+        yield '    '
+        if (undefined(name='globals') if l_0_globals is missing else l_0_globals):
+            pass
+            yield "        config globals 'globals'\n            "
+            for (l_1_key, l_1_value) in context.call(environment.getattr((undefined(name='globals') if l_0_globals is missing else l_0_globals), 'items')):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if (l_1_value not in ['', None]):
+                    pass
+                    yield '                    option '
+                    yield str(l_1_key)
+                    yield " '"
+                    yield str(l_1_value)
+                    yield "'\n                "
+                yield '            '
+            l_1_key = l_1_value = missing
+            yield '\n    '
+        yield '    '
+        for l_1_interface in (undefined(name='interfaces') if l_0_interfaces is missing else l_0_interfaces):
+            _loop_vars = {}
+            pass
+            yield "        config interface '"
+            yield str(environment.getattr(l_1_interface, 'name'))
+            yield "'\n            "
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_interface, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if ((l_2_key != 'name') and (l_2_value not in ['', None])):
+                    pass
+                    yield '                    option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n                "
+                yield '            '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_interface = missing
+        yield '    '
+        for l_1_route in (undefined(name='routes') if l_0_routes is missing else l_0_routes):
+            _loop_vars = {}
+            pass
+            yield '        config '
+            yield str(environment.getattr(l_1_route, 'version'))
+            if (environment.getattr(l_1_route, 'version') == 'route'):
+                pass
+                yield " '"
+                yield str(environment.getattr(l_1_route, 'name'))
+                yield "'"
+            yield '\n            '
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_route, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if ((l_2_key not in ['name', 'version']) and (l_2_value not in ['', None])):
+                    pass
+                    yield '                    option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n                "
+                yield '            '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_route = missing
+        yield '    '
+        for l_1_rule in (undefined(name='ip_rules') if l_0_ip_rules is missing else l_0_ip_rules):
+            _loop_vars = {}
+            pass
+            yield '        config '
+            yield str(context.call(environment.getattr(l_1_rule, 'pop'), 'block_name', _loop_vars=_loop_vars))
+            yield '\n            '
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_rule, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if (l_2_value not in ['', None]):
+                    pass
+                    yield '                    option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n                "
+                yield '            '
+            l_2_key = l_2_value = missing
+            yield '\n    '
+        l_1_rule = missing
+        yield '    '
+        for l_1_switch in (undefined(name='switches') if l_0_switches is missing else l_0_switches):
+            _loop_vars = {}
+            pass
+            yield '        config switch\n            '
+            for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_switch, 'items'), _loop_vars=_loop_vars):
+                _loop_vars = {}
+                pass
+                yield '                '
+                if ((l_2_key != 'vlan') and (l_2_value not in ['', None])):
+                    pass
+                    yield '                    option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n                "
+                yield '            '
+            l_2_key = l_2_value = missing
+            yield '\n            '
+            for l_2_vlan in environment.getattr(l_1_switch, 'vlan'):
+                _loop_vars = {}
+                pass
+                yield '                config switch_vlan\n                    '
+                for (l_3_key, l_3_value) in context.call(environment.getattr(l_2_vlan, 'items'), _loop_vars=_loop_vars):
+                    _loop_vars = {}
+                    pass
+                    yield '                        '
+                    if (l_3_value not in ['', None]):
+                        pass
+                        yield '                            option '
+                        yield str(l_3_key)
+                        yield " '"
+                        yield str(l_3_value)
+                        yield "'\n                        "
+                    yield '                    '
+                l_3_key = l_3_value = missing
+                yield '\n            '
+            l_2_vlan = missing
+            yield '    '
+        l_1_switch = missing
+
+blocks = {}
+debug_info = '1=17&2=20&4=23&5=27&6=30&11=38&12=42&13=44&14=48&15=51&20=60&21=64&23=71&24=75&25=78&30=87&31=91&32=93&33=97&34=100&39=109&41=113&42=117&43=120&47=127&49=131&50=135&51=138'
\ No newline at end of file
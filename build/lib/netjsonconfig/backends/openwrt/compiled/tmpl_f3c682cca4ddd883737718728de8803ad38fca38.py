@@ -0,0 +1,69 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'default.uci'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_config_blocks = resolve('config_blocks')
+    try:
+        t_1 = environment.tests['iterable']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No test named 'iterable' found.")
+    try:
+        t_2 = environment.tests['string']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No test named 'string' found.")
+    pass
+    for l_1_config in (undefined(name='config_blocks') if l_0_config_blocks is missing else l_0_config_blocks):
+        _loop_vars = {}
+        pass
+        yield '    config '
+        yield str(context.call(environment.getattr(l_1_config, 'pop'), 'config_name', _loop_vars=_loop_vars))
+        if environment.getattr(l_1_config, 'config_value'):
+            pass
+            yield " '"
+            yield str(context.call(environment.getattr(l_1_config, 'pop'), 'config_value', _loop_vars=_loop_vars))
+            yield "'"
+        yield '\n    '
+        for (l_2_key, l_2_value) in context.call(environment.getattr(l_1_config, 'items'), _loop_vars=_loop_vars):
+            _loop_vars = {}
+            pass
+            yield '        '
+            if (l_2_value not in ['', None]):
+                pass
+                yield '            '
+                if ((not t_2(l_2_value)) and t_1(l_2_value)):
+                    pass
+                    yield '                '
+                    for l_3_list_value in l_2_value:
+                        _loop_vars = {}
+                        pass
+                        yield '                    list '
+                        yield str(l_2_key)
+                        yield " '"
+                        yield str(l_3_list_value)
+                        yield "'\n                "
+                    l_3_list_value = missing
+                    yield '            '
+                else:
+                    pass
+                    yield '                option '
+                    yield str(l_2_key)
+                    yield " '"
+                    yield str(l_2_value)
+                    yield "'\n            "
+                yield '        '
+            yield '    '
+        l_2_key = l_2_value = missing
+        yield '\n'
+    l_1_config = missing
+
+blocks = {}
+debug_info = '1=24&2=28&4=35&5=39&6=42&7=45&8=49&11=58'
\ No newline at end of file
@@ -0,0 +1,763 @@
+import io
+import os
+import re
+import json
+import hashlib
+import six
+from io import BytesIO
+from copy import deepcopy
+from collections import OrderedDict
+
+from . import parsers, renderers, timezones, uci
+from ...utils import (merge_config, canonical_json, new_hash,
+                      LazyAttribute, LRUCache, NULL_TIMER)
+from ...version import get_version
+from ...exceptions import ValidationError
+
+DEFAULT_FILE_MODE = '644'
+FILE_SECTION_DELIMITER = '# ------ files ------ #'
+
+
+class OpenWrt(object):
+    """ OpenWrt Backend """
+    # the schema is built on first access
+    schema = LazyAttribute('netjsonconfig.backends.openwrt.schema', 'schema')
+    # "jsonschema" or "compiled" (see netjsonconfig.compiler)
+    validation_engine = 'jsonschema'
+    # checks of the "format" keyword, other formats are not validated
+    formats = {'timezone': timezones.is_timezone}
+    # "jinja2" (templates) or "direct" (see renderers emit method)
+    engine = 'jinja2'
+    renderers = [
+        renderers.SystemRenderer,
+        renderers.NetworkRenderer,
+        renderers.WirelessRenderer,
+        renderers.DefaultRenderer
+    ]
+    # inverse of renderers, used by the parse method
+    parsers = [
+        parsers.SystemParser,
+        parsers.NetworkParser,
+        parsers.WirelessParser
+    ]
+    # archive members containing UCI packages
+    uci_member = re.compile(r'^etc/config/([^/]+)$')
+    # archive members generated by the backend, ignored by parse
+    generated_member = None
+    # deflate level of generated archives, None uses the zlib default
+    compresslevel = None
+    # whether generated archives contain the manifest by default
+    manifest = False
+    # path of the manifest inside generated archives, ignored by parse
+    manifest_member = 'etc/netjsonconfig/manifest.json'
+    # path of the list of removed members inside delta archives, ignored by parse
+    removed_member = 'etc/netjsonconfig/removed'
+    # merged templates, set to None to disable caching
+    template_cache = LRUCache(maxsize=64)
+    # netjsonconfig.utils.Timings instance, None disables timings
+    timings = None
+
+    def __init__(self, config, templates=[], engine=None, copy=True, timings=None):
+        """
+        :param config: ``dict`` containing valid **NetJSON DeviceConfiguration**
+        :param templates: ``list`` containing **NetJSON** dictionaries that will be
+                          used as a base for the main config, defaults to empty list
+        :param engine: render engine, ``"jinja2"`` or ``"direct"``,
+                       defaults to the ``engine`` attribute of the class
+        :param copy: if ``False`` the backend takes ownership of ``config``,
+                     which is used as is and may be modified, avoiding a copy;
+                     defaults to ``True`` (``config`` is never modified)
+        :param timings: ``netjsonconfig.utils.Timings`` instance which records
+                        the duration of each phase, defaults to the ``timings``
+                        attribute of the class (``None``, disabled)
+        :raises TypeError: raised if ``config`` is not of type ``dict`` or if
+                           ``templates`` is not of type ``list``
+        """
+        if timings is not None:
+            self.timings = timings
+        # configs parsed from JSON strings are not shared with the caller
+        owned = not copy or isinstance(config, six.string_types)
+        with self._measure('load'):
+            config = self._load(config)
+        with self._measure('merge'):
+            merged = self._merge_config(config, templates)
+            # copy what is modified by the backend to avoid modifying
+            # the original config and templates arguments
+            if merged is not config or not owned:
+                merged = self._copy_config(merged)
+        # allow omitting NetJSON type
+        if 'type' not in config:
+            merged['type'] = 'DeviceConfiguration'
+        self.config = merged
+        if engine is not None:
+            if engine not in ('jinja2', 'direct'):
+                raise ValueError('engine must be either "jinja2" or "direct"')
+            self.engine = engine
+
+    @property
+    def env(self):
+        """
+        jinja2 environment shared by all instances, templates are compiled
+        only once; jinja2 is imported the first time it's needed
+        """
+        from ..jinja import get_environment
+        return get_environment('netjsonconfig.backends.openwrt')
+
+    def _measure(self, phase):
+        """
+        returns a context manager which records the duration of ``phase``
+        in ``timings``, or which does nothing if timings are disabled
+        """
+        timings = self.timings
+        if timings is None:
+            return NULL_TIMER
+        return timings.measure(phase)
+
+    @classmethod
+    def _load(cls, config):
+        """ loads config from string or dict """
+        if isinstance(config, six.string_types):
+            try:
+                config = json.loads(config)
+            except ValueError:
+                pass
+        if not isinstance(config, dict):
+            raise TypeError('config block must be an istance '
+                            'of dict or a valid NetJSON string')
+        return config
+
+    def _merge_config(self, config, templates):
+        """ merges config with templates """
+        # merge any present template with main configuration
+        base_config = self._merge_templates(templates)
+        if base_config:
+            return merge_config(base_config, config, copy=False)
+        return config
+
+    def _copy_config(self, config):
+        """
+        Returns a copy of ``config`` which can be modified by the backend;
+        only the top level ``dict`` is copied, any other object is shared
+        with the original config (templates are copied by ``_merge_templates``),
+        subclasses which modify nested objects must extend this method to
+        copy them as well.
+        """
+        return config.copy()
+
+    @classmethod
+    def _merge_templates(cls, templates):
+        """
+        merges templates in a single base config owned by the caller;
+        if all the templates are JSON strings the merged config is cached
+        in ``template_cache`` as JSON, parsing it once is faster than
+        parsing and merging each template again
+        """
+        # type check
+        if not isinstance(templates, list):
+            raise TypeError('templates argument must be an instance of list')
+        if not templates:
+            return {}
+        strings = all(isinstance(template, six.string_types) for template in templates)
+        cache = cls.template_cache
+        # the strings are the key, python caches their hash
+        key = (cls,) + tuple(templates) if strings and cache is not None else None
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        base_config = {}
+        for template in templates:
+            template = cls._load(template)
+            base_config = merge_config(base_config, template, copy=False)
+        if key is not None:
+            cache.set(key, json.dumps(base_config))
+        elif not strings:
+            # the merged config shares the nested objects of the templates
+            base_config = deepcopy(base_config)
+        return base_config
+
+    def render(self, files=True):
+        """
+        Converts the configuration dictionary into the native OpenWRT UCI format.
+
+        :param files: whether to include "additional files" in the output or not;
+                      defaults to ``True``
+        :returns: string with output
+        """
+        return ''.join(self.iter_render(files=files))
+
+    def iter_render(self, files=True):
+        """
+        Like ``render`` but returns a generator which yields the output
+        one block at a time (each UCI package and each file),
+        without holding the whole output in memory.
+
+        :param files: whether to include "additional files" in the output or not;
+                      defaults to ``True``
+        :returns: generator of strings
+        """
+        self.validate()
+        separate = False
+        for name, contents in self._iter_render_packages():
+            # add an additional new line
+            # to separate packages
+            if separate:
+                yield '\n'
+            separate = True
+            yield renderers.BaseRenderer.format_package(name, contents)
+        if files:
+            for output in self._iter_render_files():
+                yield output.replace('\n\n\n', '\n\n')  # max 3 \n
+
+    def render_packages(self):
+        """
+        Renders the configuration into UCI packages, without
+        concatenating them in a single string like ``render`` does.
+
+        :returns: ``OrderedDict`` which maps each UCI package name
+                  to its contents (without the ``package`` line)
+        """
+        self.validate()
+        return OrderedDict(self._iter_render_packages())
+
+    def _iter_render_packages(self):
+        """ yields ``(name, contents)`` of each UCI package """
+        for renderer_class in self.renderers:
+            renderer = renderer_class(self)
+            for item in renderer.render_packages().items():
+                yield item
+
+    def render_to(self, fileobj, files=True, encoding='utf-8'):
+        """
+        Like ``render`` but writes the output to ``fileobj`` while it's
+        being produced, peak memory usage is bounded by the largest block.
+
+        :param fileobj: writable file object, either text or binary
+        :param files: whether to include "additional files" in the output or not;
+                      defaults to ``True``
+        :param encoding: encoding used if ``fileobj`` is binary, defaults to ``utf-8``
+        :returns: None
+        """
+        binary = isinstance(fileobj, (io.RawIOBase, io.BufferedIOBase)) or \
+            'b' in getattr(fileobj, 'mode', '')
+        for output in self.iter_render(files=files):
+            if binary:
+                output = output.encode(encoding)
+            fileobj.write(output)
+
+    def _render_files(self):
+        """ renders "additional files", used in main render method """
+        return ''.join(self._iter_render_files())
+
+    def _iter_render_files(self):
+        """ yields the rendered "additional files" one at a time """
+        files = self.config.get('files', [])
+        # add delimiter
+        if files:
+            yield '\n{0}\n\n'.format(FILE_SECTION_DELIMITER)
+        for f in files:
+            with self._measure('render_files'):
+                if isinstance(f['contents'], list):
+                    contents = '\n'.join(f['contents'])
+                else:
+                    contents = f['contents']
+                path = f['path']
+                mode = f.get('mode', DEFAULT_FILE_MODE)
+                # add file to output
+                output = '# path: {0}\n'\
+                         '# mode: {1}\n\n'\
+                         '{2}\n\n'.format(path, mode, contents)
+            yield output
+
+    def validate(self):
+        with self._measure('validate'):
+            if self.validation_engine == 'compiled':
+                is_valid = self.get_compiled_validator()
+                # fast path: valid configurations do not need jsonschema,
+                # which is still used to build the detailed validation error
+                if is_valid is not None and is_valid(self.config):
+                    return
+            from jsonschema.exceptions import best_match
+            error = best_match(self.get_validator().iter_errors(self.config))
+        if error is not None:
+            raise ValidationError(error)
+
+    @classmethod
+    def get_validator(cls):
+        """
+        Returns the JSON-Schema validator of the backend class.
+
+        The validator (and its ``$ref`` resolver) is built lazily the first
+        time it's needed and is then shared by all the instances of the class;
+        each subclass gets its own validator because its schema may differ.
+
+        :returns: ``jsonschema.Draft4Validator`` instance
+        """
+        validator = cls.__dict__.get('_validator')
+        # rebuild if the schema has been replaced
+        if validator is None or validator.schema is not cls.schema:
+            from jsonschema import Draft4Validator, FormatChecker
+            Draft4Validator.check_schema(cls.schema)
+            format_checker = FormatChecker(formats=())
+            for name, function in cls.formats.items():
+                format_checker.checks(name)(function)
+            validator = Draft4Validator(cls.schema, format_checker=format_checker)
+            cls._validator = validator
+        return validator
+
+    @classmethod
+    def get_compiled_validator(cls):
+        """
+        Returns the validation function compiled from the schema of the
+        backend class, used when ``validation_engine`` is ``"compiled"``;
+        like ``get_validator`` it is built once per class.
+
+        :returns: function returning ``True`` if the configuration is valid,
+                  ``None`` if the schema cannot be compiled
+        """
+        cache = cls.__dict__.get('_compiled_validator')
+        # rebuild if the schema has been replaced
+        if cache is None or cache[0] is not cls.schema:
+            from ...compiler import compile_schema
+            try:
+                function = compile_schema(cls.schema, cls.formats)
+            except NotImplementedError:
+                function = None
+            cache = (cls.schema, function)
+            cls._compiled_validator = cache
+        return cache[1]
+
+    def json(self, *args, **kwargs):
+        """
+        returns a string formatted in **NetJSON**;
+        performs validation before returning output;
+
+        ``*args`` and ``*kwargs`` will be passed to ``json.dumps``;
+
+        :returns: string
+        """
+        self.validate()
+        return json.dumps(self.config, *args, **kwargs)
+
+    def delta(self, previous):
+        """
+        Returns the ``uci batch`` script which turns the UCI configuration
+        of ``previous`` into the configuration of this instance, section by
+        section; only the options which differ are set, deleted or added.
+
+        Additional files are not included in the output.
+
+        :param previous: backend instance, or configuration (``dict`` or
+                         NetJSON string) which is loaded with the same backend
+        :returns: string, empty if the UCI configuration did not change
+        """
+        if not isinstance(previous, OpenWrt):
+            previous = self.__class__(previous)
+        old = previous.render_packages()
+        new = self.render_packages()
+        return uci.diff(self._parse_packages(old), self._parse_packages(new))
+
+    @staticmethod
+    def _parse_packages(packages):
+        return OrderedDict((name, uci.parse_package(contents))
+                           for name, contents in packages.items())
+
+    def fingerprint(self, algorithm=None):
+        """
+        Returns a stable hash of the configuration (templates included),
+        of the backend class and of the version of the library, which
+        changes only if the output of the backend may change; useful to
+        find out which devices need to be regenerated without rendering
+        their configuration. Does not perform validation.
+
+        :param algorithm: hash algorithm, see ``netjsonconfig.utils.new_hash``;
+                          defaults to ``xxh64`` if ``xxhash`` is installed,
+                          ``sha256`` otherwise
+        :returns: hexadecimal digest string
+        """
+        digest = new_hash(algorithm)
+        backend = '{0}.{1}'.format(self.__class__.__module__, self.__class__.__name__)
+        digest.update('{0}\n{1}\n'.format(backend, get_version()).encode('utf-8'))
+        digest.update(canonical_json(self.config).encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def render_many(cls, configs, templates=[], workers=None, method='render',
+                    ordered=True, **kwargs):
+        """
+        Renders the configuration of many devices across a pool of processes;
+        ``templates`` are loaded and merged only once per worker process.
+
+        Errors (eg: validation errors) are reported per device and do not abort the batch.
+
+        :param configs: iterable of **NetJSON DeviceConfiguration** dictionaries
+                        or strings
+        :param templates: ``list`` containing **NetJSON** dictionaries shared
+                          by all the devices, defaults to empty list
+        :param workers: number of worker processes, defaults to the number of CPUs
+        :param method: backend method to call on each device, defaults to ``render``
+        :param ordered: whether results are yielded in the same order of ``configs``
+                        (default) or as soon as they are completed
+        :param kwargs: additional arguments passed to ``method``
+        :returns: generator of ``RenderResult`` named tuples
+                  (``index``, ``output``, ``error``)
+        """
+        from ...fleet import render_many
+        return render_many(cls, configs, templates=templates, workers=workers,
+                           method=method, ordered=ordered, **kwargs)
+
+    @classmethod
+    def parse(cls, source):
+        """
+        Converts UCI configuration back to **NetJSON DeviceConfiguration**,
+        it's the inverse of ``render`` and ``write``; files are read one
+        at a time and each UCI package is parsed as soon as it's read.
+
+        Options are converted to the types defined in the schema, the parts
+        of the configuration which can't be expressed in NetJSON are ignored.
+
+        :param source: UCI text, path of a configuration archive (zip or tar.gz),
+                       of a directory containing its extracted contents or of
+                       a copy of ``/etc/config``, or archive file object
+        :returns: ``dict`` containing **NetJSON DeviceConfiguration**
+        :raises ValueError: if the UCI configuration is not valid
+        """
+        config = {'type': 'DeviceConfiguration'}
+        if isinstance(source, six.string_types) and ('\n' in source or not source):
+            packages = uci.parse(source)
+        else:
+            packages = OrderedDict()
+            for path, contents, mode in parsers.iter_archive(source):
+                match = cls.uci_member.match(path)
+                if match:
+                    text = contents.decode('utf-8')
+                    if text.lstrip().startswith('package'):
+                        packages.update(uci.parse(text))
+                    else:
+                        packages[match.group(1)] = uci.parse_package(text)
+                elif path in (cls.manifest_member, cls.removed_member):
+                    continue
+                elif not (cls.generated_member and cls.generated_member.match(path)):
+                    cls._parse_file(config, path, contents, mode)
+        for parser_class in cls.parsers:
+            sections = packages.pop(parser_class.get_package(), None)
+            if sections:
+                parser_class(config, cls.schema).parse(sections)
+        for package, sections in packages.items():
+            parsers.DefaultParser(config, cls.schema, package).parse(sections)
+        return config
+
+    @staticmethod
+    def _parse_file(config, path, contents, mode):
+        item = OrderedDict([('path', '/{0}'.format(path)),
+                            ('contents', contents.decode('utf-8'))])
+        if mode:
+            item['mode'] = '{0:o}'.format(mode)
+        config.setdefault('files', []).append(item)
+
+    @classmethod
+    def parse_many(cls, sources, workers=None, ordered=True):
+        """
+        Parses many configuration archives or directories
+        across a pool of processes, see ``parse``.
+
+        Errors are reported per archive and do not abort the batch.
+
+        :param sources: iterable of ``parse`` sources, eg: archive paths
+        :param workers: number of worker processes, defaults to the number of CPUs
+        :param ordered: whether results are yielded in input order
+        :returns: generator of ``netjsonconfig.fleet.RenderResult`` instances
+                  whose ``output`` is the NetJSON ``dict``
+        """
+        from ...fleet import parse_many
+        return parse_many(cls, sources, workers=workers, ordered=ordered)
+
+    @classmethod
+    def get_packages(cls):
+        return [r.get_package() for r in cls.renderers]
+
+    def generate(self, fileobj=None, compresslevel=None, manifest=None):
+        """
+        Generates a configuration archive (zip) containing a file for each
+        UCI package in ``etc/config/`` and the additional ``files``;
+        optionally the archive also contains the manifest of its members
+        (see ``get_manifest``) in ``manifest_member``.
+
+        The archive is built in memory, unless ``fileobj`` is passed,
+        in which case it's streamed into it (eg: an HTTP response);
+        nothing is written to the working directory.
+
+        :param fileobj: writable binary file object, seeking is not required
+        :param compresslevel: deflate compression level (``0`` to ``9``),
+                              defaults to the ``compresslevel`` attribute
+        :param manifest: whether the manifest is added to the archive,
+                         defaults to the ``manifest`` attribute
+        :returns: ``fileobj`` if passed, otherwise in-memory zip archive,
+                  instance of ``BytesIO`` positioned at its start
+        """
+        return self._write_archive(fileobj, compresslevel, manifest)
+
+    def generate_delta(self, previous, fileobj=None, compresslevel=None, manifest=None):
+        """
+        Generates a delta archive (zip) containing only the members (UCI
+        packages and additional files) which were added or whose contents
+        or permissions changed since ``previous``, plus ``removed_member``,
+        which lists the paths of the members removed since ``previous``
+        (one per line, empty if none was removed). Members generated by the
+        backend (``generated_member``) are always included.
+
+        If the manifest is enabled it lists all the members of the current
+        configuration, so that it can be used as ``previous`` next time.
+
+        :param previous: manifest of the previous archive (``dict`` returned by
+                         ``get_manifest`` or its JSON string), backend instance,
+                         or configuration (``dict`` or NetJSON string) which is
+                         loaded with the same backend
+        :param fileobj: see ``generate``
+        :param compresslevel: see ``generate``
+        :param manifest: see ``generate``
+        :returns: ``fileobj`` if passed, otherwise in-memory zip archive,
+                  instance of ``BytesIO`` positioned at its start
+        """
+        previous = self._get_previous_manifest(previous)
+        return self._write_archive(fileobj, compresslevel, manifest, previous)
+
+    def _get_previous_manifest(self, previous):
+        """
+        returns the manifest of the ``previous`` argument of ``generate_delta``
+        """
+        if isinstance(previous, OpenWrt):
+            return previous.get_manifest()
+        previous = self._load(previous)
+        if self._is_manifest(previous):
+            return previous
+        return self.__class__(previous).get_manifest()
+
+    @staticmethod
+    def _is_manifest(value):
+        members = value.get('members')
+        return (list(value.keys()) == ['members'] and
+                isinstance(members, list) and
+                all(isinstance(member, dict) and 'sha256' in member
+                    for member in members))
+
+    def get_manifest(self):
+        """
+        Returns the manifest of the members of the archive built by
+        ``generate``: path, permissions, size in bytes and SHA-256 of each
+        UCI package and additional file, sorted by path; comparing the
+        manifests of two configurations shows which members changed
+        without extracting or comparing the archives.
+
+        :returns: ``dict`` with a ``members`` key containing a ``list``
+                  of ``dict`` with ``path``, ``mode``, ``size`` and ``sha256``
+        """
+        return self._build_manifest(self._get_members())
+
+    def checksum(self, algorithm='sha256', compresslevel=None, manifest=None):
+        """
+        Returns the checksum of the archive built by ``generate``.
+
+        Archives are reproducible: members are sorted by path, their date is
+        fixed and their permissions depend only on the configuration, so equal
+        configurations give byte-identical archives and can share the same
+        cached artifact (provided the version of the library, of zlib and the
+        compression level are the same). Archives streamed into file objects
+        which are not seekable differ because zip data descriptors are used.
+
+        :param algorithm: hash algorithm, see ``netjsonconfig.utils.new_hash``
+        :param compresslevel: see ``generate``
+        :param manifest: see ``generate``
+        :returns: hexadecimal digest string
+        """
+        digest = new_hash(algorithm)
+        archive = self.generate(compresslevel=compresslevel, manifest=manifest)
+        digest.update(archive.getvalue())
+        return digest.hexdigest()
+
+    def _write_archive(self, fileobj, compresslevel, manifest, previous=None):
+        """
+        writes the archive into ``fileobj`` or, if ``None``, into a new
+        ``BytesIO`` instance positioned at its start; returns the file object
+        """
+        import zipfile
+        if fileobj is None:
+            output = BytesIO()
+            self._write_archive(output, compresslevel, manifest, previous)
+            output.seek(0)
+            return output
+        if compresslevel is None:
+            compresslevel = self.compresslevel
+        if manifest is None:
+            manifest = self.manifest
+        kwargs = {}
+        # supported since python 3.7
+        if compresslevel is not None:
+            kwargs['compresslevel'] = compresslevel
+        with self._measure('generate'):
+            zip = zipfile.ZipFile(fileobj, mode='w',
+                                  compression=zipfile.ZIP_DEFLATED, **kwargs)
+            try:
+                self._generate_contents(zip, manifest, previous)
+            finally:
+                zip.close()
+        return fileobj
+
+    def _generate_contents(self, zip, manifest=False, previous=None):
+        """
+        Adds configuration files to zipfile instance.
+
+        :param zip: zipfile instance
+        :param manifest: whether the manifest is added after the members
+        :param previous: manifest of the previous archive, if passed only
+                         the members which changed are added (delta archive)
+        :returns: None
+        """
+        members = self._get_members()
+        if previous is None:
+            self._add_members(zip, members)
+        else:
+            self._add_delta(zip, members, previous)
+        if manifest:
+            self._add_manifest(zip, members)
+
+    def _get_members(self):
+        """
+        returns the members of the archive (UCI packages and
+        additional files) as a list of ``(path, contents, mode)``
+        """
+        packages = self.render_packages()
+        # for each package create a file with its contents in /etc/config
+        members = [('etc/config/{0}'.format(name), contents, DEFAULT_FILE_MODE)
+                   for name, contents in packages.items()]
+        return members + self._get_file_members()
+
+    def _get_file_members(self, files=None):
+        """
+        returns the additional files of the configuration (or ``files``)
+        as a list of ``(path, contents, mode)`` archive members
+        """
+        if files is None:
+            files = self.config.get('files', [])
+        members = []
+        for file_item in files:
+            contents = file_item['contents']
+            # contents can also be a list of lines
+            if isinstance(contents, list):
+                contents = '\n'.join(contents)
+            members.append((file_item['path'].lstrip('/'),
+                            contents,
+                            file_item.get('mode', DEFAULT_FILE_MODE)))
+        return members
+
+    def _add_members(self, zip, members):
+        """
+        Adds ``(path, contents, mode)`` members to zipfile instance, sorted
+        by path, so that the archive doesn't depend on the order of the
+        packages and of the files in the configuration.
+
+        :param zip: zipfile instance
+        :param members: ``list`` of ``(path, contents, mode)`` tuples
+        :returns: None
+        """
+        for name, contents, mode in self._sort_members(members):
+            self._add_file(zip, name, contents, mode)
+
+    @staticmethod
+    def _sort_members(members):
+        return sorted(members, key=lambda member: member[0])
+
+    @staticmethod
+    def _encode_contents(contents):
+        if isinstance(contents, six.text_type):
+            return contents.encode('utf-8')
+        return contents
+
+    def _build_manifest(self, members):
+        """
+        returns the manifest of ``(path, contents, mode)`` members
+        """
+        manifest = []
+        for path, contents, mode in self._sort_members(members):
+            contents = self._encode_contents(contents)
+            manifest.append({'path': path,
+                             'mode': mode,
+                             'size': len(contents),
+                             'sha256': hashlib.sha256(contents).hexdigest()})
+        return {'members': manifest}
+
+    def _add_delta(self, zip, members, previous):
+        """
+        Adds the members which changed since the ``previous`` manifest
+        and the list of the removed members to zipfile instance.
+
+        :param zip: zipfile instance
+        :param members: ``list`` of ``(path, contents, mode)`` tuples
+        :param previous: manifest of the previous archive
+        :returns: None
+        """
+        old = dict((member['path'], member) for member in previous['members'])
+        changed = set()
+        for member in self._build_manifest(members)['members']:
+            path = member['path']
+            old_member = old.pop(path, None)
+            if (old_member is None or
+                    old_member.get('sha256') != member['sha256'] or
+                    old_member.get('mode') != member['mode'] or
+                    (self.generated_member and self.generated_member.match(path))):
+                changed.add(path)
+        self._add_members(zip, [member for member in members if member[0] in changed])
+        removed = ''.join('{0}\n'.format(path) for path in sorted(old))
+        self._add_file(zip, self.removed_member, removed)
+
+    def _add_manifest(self, zip, members):
+        """
+        Adds the manifest of ``members`` to zipfile instance.
+
+        :param zip: zipfile instance
+        :param members: ``list`` of ``(path, contents, mode)`` tuples
+        :returns: None
+        """
+        manifest = self._build_manifest(members)
+        contents = json.dumps(manifest, indent=4, sort_keys=True)
+        self._add_file(zip, self.manifest_member, contents + '\n')
+
+    def _add_file(self, zip, name, contents, mode=DEFAULT_FILE_MODE):
+        """
+        Adds a single file to zipfile instance.
+
+        :param zip: zipfile instance
+        :param name: path of the file inside the archive
+        :param contents: contents of the file, ``str`` or ``bytes``
+        :param mode: permissions of the file as octal string, eg: ``"755"``
+        :returns: None
+        """
+        import zipfile
+        contents = self._encode_contents(contents)
+        # the date of ZipInfo is fixed, the archive depends only on the config
+        info = zipfile.ZipInfo(name)
+        info.compress_type = zip.compression
+        # unix permissions of a regular file, the default
+        # creator system depends on the platform
+        info.create_system = 3
+        info.external_attr = (0o100000 | int(mode, 8)) << 16
+        # the level of the archive is not applied to ZipInfo instances
+        compresslevel = getattr(zip, 'compresslevel', None)
+        if compresslevel is not None:
+            zip.writestr(info, contents, compresslevel=compresslevel)
+        else:
+            zip.writestr(info, contents)
+
+    def write(self, name, path='./', compresslevel=None, manifest=None):
+        """
+        Like ``generate`` but writes to disk.
+
+        :param name: file name, the zip extension will be added automatically
+        :param path: directory where the file will be written to, defaults to ``./``
+        :param compresslevel: see ``generate``
+        :param manifest: see ``generate``
+        :returns: None
+        """
+        file_name = os.path.join(path, '{0}.zip'.format(name))
+        with open(file_name, 'wb') as f:
+            self.generate(fileobj=f, compresslevel=compresslevel, manifest=manifest)
@@ -0,0 +1,87 @@
+"""
+Timezones supported by OpenWrt: human readable names (the values
+allowed in the ``timezone`` option of the ``general`` object) mapped
+to the POSIX TZ strings written in ``/etc/config/system``.
+
+The table is stored in ``timezones.txt`` (one ``name<TAB>TZ`` pair per
+line) and is loaded and indexed the first time it's needed.
+"""
+import pkgutil
+import re
+import sys
+from collections import OrderedDict
+
+import six
+
+DATA_FILE = 'timezones.txt'
+
+_timezones = None
+_names = None
+
+# POSIX TZ strings, eg: ``EST5EDT`` or ``CET-1CEST,M3.5.0,M10.5.0/3``
+_STD = r'(?:[A-Za-z]{3,}|<[A-Za-z0-9+-]{3,}>)'
+_OFFSET = r'[+-]?\d{1,2}(?::\d{2}){0,2}'
+_RULE = r'(?:J\d{1,3}|\d{1,3}|M\d{1,2}\.\d\.\d)(?:/[+-]?\d{1,3}(?::\d{2}){0,2})?'
+POSIX_TZ = re.compile(r'^{std}{offset}(?:{std}(?:{offset})?(?:,{rule},{rule})?)?$'.format(
+    std=_STD, offset=_OFFSET, rule=_RULE))
+
+
+def get_timezones():
+    """
+    :returns: ``OrderedDict`` mapping timezone names to POSIX TZ strings
+    """
+    global _timezones, _names
+    if _timezones is None:
+        data = pkgutil.get_data(__name__.rsplit('.', 1)[0], DATA_FILE)
+        timezones = OrderedDict(line.split('\t', 1) for line
+                                in data.decode('utf-8').splitlines() if line)
+        names = {}
+        # many names share the same TZ string, the first one is used
+        for name, value in timezones.items():
+            names.setdefault(value, name)
+        _timezones, _names = timezones, names
+    return _timezones
+
+
+def get_tz(name, default=None):
+    """
+    :param name: timezone name, eg: ``Europe/Rome``
+    :returns: POSIX TZ string of ``name``, ``default`` if unknown
+    """
+    return get_timezones().get(name, default)
+
+
+def get_name(tz, default=None):
+    """
+    Inverse of ``get_tz``.
+
+    :param tz: POSIX TZ string, eg: ``CET-1CEST,M3.5.0,M10.5.0/3``
+    :returns: first timezone name using ``tz``, ``default`` if unknown
+    """
+    get_timezones()
+    return _names.get(tz, default)
+
+
+def is_timezone(value):
+    """
+    checks the ``timezone`` format of the schema: timezone names and,
+    as in previous versions, POSIX TZ strings (eg: ``UTC``), which are
+    written as they are; non string values are left to the ``type`` keyword
+    """
+    if not isinstance(value, six.string_types):
+        return True
+    if value in get_timezones() or value in _names:
+        return True
+    return POSIX_TZ.match(value) is not None
+
+
+def __getattr__(name):
+    # ``timezones`` attribute of the previous versions
+    if name == 'timezones':
+        return get_timezones()
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+
+
+# module level __getattr__ is supported since python 3.7 (PEP 562)
+if sys.version_info < (3, 7):  # pragma: nocover
+    timezones = get_timezones()
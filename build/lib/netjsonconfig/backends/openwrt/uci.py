@@ -0,0 +1,239 @@
+"""
+Minimal parser of the UCI format and generation of
+``uci batch`` commands between two configurations
+"""
+import re
+from collections import OrderedDict, namedtuple
+
+Section = namedtuple('Section', ['type', 'name', 'options'])
+Section.__doc__ = """
+UCI config section:
+
+* ``type``: section type, eg: ``interface``
+* ``name``: section name, ``None`` for anonymous sections
+* ``options``: ``OrderedDict`` of options, values of
+  ``list`` options are instances of ``list``
+"""
+
+LINE_RE = re.compile(r'^(package|config|option|list)(?:\s+(.*))?$')
+KEY_RE = re.compile(r"""'([^']*)'|"([^"]*)"|(\S+)""")
+
+
+def _unquote(value):
+    """
+    removes the outermost quotes of ``value``; quotes inside single quoted
+    values can be escaped as ``'\\''`` (like ``uci export`` does) or not
+    escaped at all (like the backends do)
+    """
+    quote = value[0]
+    if quote not in ('"', "'") or len(value) < 2 or not value.endswith(quote):
+        return value
+    value = value[1:-1]
+    if quote == "'":
+        return value.replace("'\\''", "'")
+    return re.sub(r'\\(.)', r'\1', value)
+
+
+def _split(line, arguments):
+    """ splits the arguments of a UCI statement in key and value """
+    if not arguments:
+        raise ValueError('invalid UCI line: {0!r}'.format(line))
+    match = KEY_RE.match(arguments)
+    key = next(group for group in match.groups() if group is not None)
+    value = arguments[match.end():].strip()
+    return key, _unquote(value) if value else None
+
+
+def parse_package(text):
+    """
+    Parses the config sections of a single UCI package.
+
+    :param text: UCI text without the ``package`` line
+    :returns: ``list`` of ``Section`` instances
+    :raises ValueError: if ``text`` is not valid UCI
+    """
+    return list(parse('package _\n' + text).values())[0]
+
+
+def parse(text):
+    """
+    Parses UCI text containing one or more packages, like
+    the output of ``uci export`` or of the ``render`` method
+    of the backends (additional files are ignored).
+
+    :param text: UCI text
+    :returns: ``OrderedDict`` mapping package names to lists of ``Section``
+    :raises ValueError: if ``text`` is not valid UCI
+    """
+    packages = OrderedDict()
+    sections = None
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            # additional files follow the UCI packages in the output of render
+            if line == '# ------ files ------ #':
+                break
+            continue
+        match = LINE_RE.match(line)
+        if not match:
+            raise ValueError('invalid UCI line: {0!r}'.format(line))
+        statement, arguments = match.groups()
+        if statement == 'package':
+            name = _split(line, arguments)[0]
+            sections = packages.setdefault(name, [])
+            section = None
+        elif sections is None:
+            raise ValueError('UCI statement outside package: {0!r}'.format(line))
+        elif statement == 'config':
+            type_, name = _split(line, arguments)
+            section = Section(type_, name, OrderedDict())
+            sections.append(section)
+        elif section is None:
+            raise ValueError('UCI option outside section: {0!r}'.format(line))
+        else:
+            key, value = _split(line, arguments)
+            if value is None:
+                raise ValueError('UCI option without value: {0!r}'.format(line))
+            if statement == 'list':
+                current = section.options.get(key)
+                if not isinstance(current, list):
+                    current = section.options[key] = []
+                current.append(value)
+            else:
+                section.options[key] = value
+    return packages
+
+
+def quote(value):
+    """ quotes ``value`` for ``uci batch`` """
+    return "'{0}'".format(value.replace("'", "'\\''"))
+
+
+def _index(sections):
+    """
+    returns the named sections and the references of the
+    anonymous sections grouped by type (``@type[index]``)
+    """
+    named = OrderedDict()
+    anonymous = OrderedDict()
+    counters = {}
+    for section in sections:
+        index = counters.get(section.type, 0)
+        counters[section.type] = index + 1
+        if section.name is None:
+            reference = '@{0}[{1}]'.format(section.type, index)
+            anonymous.setdefault(section.type, []).append((reference, section))
+        else:
+            named[section.name] = section
+    return named, anonymous
+
+
+def _set_options(path, options):
+    commands = []
+    for key, value in options.items():
+        if isinstance(value, list):
+            for item in value:
+                commands.append('add_list {0}.{1}={2}'.format(path, key, quote(item)))
+        else:
+            commands.append('set {0}.{1}={2}'.format(path, key, quote(value)))
+    return commands
+
+
+def _diff_options(path, old, new):
+    commands = []
+    for key in old:
+        if key not in new:
+            commands.append('delete {0}.{1}'.format(path, key))
+    for key, value in new.items():
+        previous = old.get(key)
+        if value == previous:
+            continue
+        if isinstance(value, list):
+            # items appended to an existing list
+            if isinstance(previous, list) and value[:len(previous)] == previous:
+                commands += _set_options(path, {key: value[len(previous):]})
+                continue
+            if previous is not None:
+                commands.append('delete {0}.{1}'.format(path, key))
+        elif isinstance(previous, list):
+            commands.append('delete {0}.{1}'.format(path, key))
+        commands += _set_options(path, {key: value})
+    return commands
+
+
+def diff_package(package, old, new):
+    """
+    Returns the ``uci batch`` commands which turn
+    the ``old`` sections of ``package`` into ``new``.
+
+    Named sections are matched by name, anonymous sections by
+    type and position and referenced with the ``@type[index]`` syntax.
+
+    :param package: package name
+    :param old: ``list`` of ``Section`` instances
+    :param new: ``list`` of ``Section`` instances
+    :returns: ``list`` of commands
+    """
+    commands = []
+    old_named, old_anonymous = _index(old)
+    new_named, new_anonymous = _index(new)
+    # anonymous sections first, while the indexes
+    # computed on the old configuration are still valid
+    additions = []
+    for type_, sections in old_anonymous.items():
+        new_sections = new_anonymous.get(type_, [])
+        for (reference, section), (_, new_section) in zip(sections, new_sections):
+            path = '{0}.{1}'.format(package, reference)
+            commands += _diff_options(path, section.options, new_section.options)
+        # removed from the last one to keep the other indexes valid
+        for reference, section in reversed(sections[len(new_sections):]):
+            commands.append('delete {0}.{1}'.format(package, reference))
+    for type_, sections in new_anonymous.items():
+        count = len(old_anonymous.get(type_, []))
+        for reference, section in sections[count:]:
+            additions.append('add {0} {1}'.format(package, type_))
+            path = '{0}.@{1}[-1]'.format(package, type_)
+            additions += _set_options(path, section.options)
+    # named sections
+    for name, section in old_named.items():
+        new_section = new_named.get(name)
+        path = '{0}.{1}'.format(package, name)
+        if new_section is None or new_section.type != section.type:
+            commands.append('delete {0}'.format(path))
+        else:
+            commands += _diff_options(path, section.options, new_section.options)
+    for name, section in new_named.items():
+        old_section = old_named.get(name)
+        if old_section is not None and old_section.type == section.type:
+            continue
+        path = '{0}.{1}'.format(package, name)
+        commands.append('set {0}={1}'.format(path, quote(section.type)))
+        commands += _set_options(path, section.options)
+    return commands + additions
+
+
+def diff(old, new):
+    """
+    Returns the ``uci batch`` script which turns the ``old``
+    UCI configuration into ``new``; changed packages are committed.
+
+    :param old: ``dict`` mapping package names to lists of ``Section``
+                (as returned by ``parse``)
+    :param new: ``dict`` mapping package names to lists of ``Section``
+    :returns: string, empty if there are no changes
+    """
+    commands = []
+    changed = []
+    for package in list(old.keys()) + [p for p in new.keys() if p not in old]:
+        package_commands = diff_package(package, old.get(package, []),
+                                        new.get(package, []))
+        if package_commands:
+            commands += package_commands
+            changed.append(package)
+    if not commands:
+        return ''
+    commands += ['commit {0}'.format(package) for package in changed]
+    return '\n'.join(commands) + '\n'
@@ -0,0 +1,332 @@
+"""
+Compiles a JSON-Schema (draft 4) into specialized python code
+
+The generated code only answers the question "is this instance valid?",
+which is all that's needed for the common case of a valid configuration;
+backends fall back to ``jsonschema`` to build the detailed
+``ValidationError`` when the compiled validator rejects an instance.
+"""
+import re
+
+import six
+
+# keywords that do not affect validation
+ANNOTATIONS = frozenset(['$schema', 'id', 'title', 'description',
+                         'default', 'definitions', 'format'])
+# validation keywords handled by the compiler
+SUPPORTED = frozenset(['$ref', 'type', 'enum', 'pattern', 'minLength',
+                       'maxLength', 'minimum', 'maximum', 'exclusiveMinimum',
+                       'exclusiveMaximum', 'multipleOf', 'required',
+                       'properties', 'additionalProperties', 'minProperties',
+                       'maxProperties', 'items', 'additionalItems', 'minItems',
+                       'maxItems', 'uniqueItems', 'allOf', 'anyOf', 'oneOf',
+                       'not'])
+
+TYPE_CHECKS = {
+    'string': 'isinstance({0}, string_types)',
+    'integer': '(isinstance({0}, integer_types) and not isinstance({0}, bool))',
+    'number': '(isinstance({0}, number_types) and not isinstance({0}, bool))',
+    'boolean': 'isinstance({0}, bool)',
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'null': '{0} is None'
+}
+
+
+def _freeze(value):
+    """
+    returns an hashable representation of a JSON value
+    which follows the equality rules of JSON-Schema
+    (``True`` is not equal to ``1``, ``1`` is equal to ``1.0``)
+    """
+    if isinstance(value, dict):
+        return ('object', frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ('array', tuple(_freeze(v) for v in value))
+    if isinstance(value, bool):
+        return ('boolean', value)
+    return value
+
+
+def _unique(items):
+    seen = set()
+    for item in items:
+        key = _freeze(item)
+        if key in seen:
+            return False
+        seen.add(key)
+    return True
+
+
+class SchemaCompiler(object):
+    """
+    Translates each (sub)schema into a python function returning
+    ``True`` if the instance is valid, ``False`` otherwise.
+
+    ``format`` is an annotation unless its value is a key of ``formats``,
+    which maps format names to functions checking string values.
+    """
+    def __init__(self, schema, formats=None):
+        self.schema = schema
+        self.formats = formats or {}
+        self.functions = []
+        self.constants = {}
+        self.names = {}
+
+    def compile(self):
+        """
+        :returns: validation function accepting the instance to validate
+        :raises NotImplementedError: if the schema uses unsupported keywords
+        """
+        entry = self._function(self.schema)
+        namespace = {
+            'string_types': six.string_types,
+            'integer_types': six.integer_types,
+            'number_types': six.integer_types + (float,),
+            '_freeze': _freeze,
+            '_unique': _unique
+        }
+        namespace.update(self.constants)
+        code = compile(self.source, '<compiled schema>', 'exec')
+        exec(code, namespace)
+        return namespace[entry]
+
+    @property
+    def source(self):
+        return '\n\n'.join(self.functions) + '\n'
+
+    def _constant(self, value):
+        name = '_c{0}'.format(len(self.constants))
+        self.constants[name] = value
+        return name
+
+    def _resolve(self, ref):
+        if not ref.startswith('#'):
+            raise NotImplementedError('remote $ref not supported: {0}'.format(ref))
+        node = self.schema
+        for part in ref[1:].split('/')[1:]:
+            part = part.replace('~1', '/').replace('~0', '~')
+            node = node[int(part) if isinstance(node, list) else part]
+        return node
+
+    def _function(self, schema):
+        """ returns the name of the function validating ``schema`` """
+        # in draft 4 $ref overrides any other keyword
+        while '$ref' in schema:
+            schema = self._resolve(schema['$ref'])
+        key = id(schema)
+        if key in self.names:
+            return self.names[key]
+        name = '_v{0}'.format(len(self.names))
+        # register name before compiling the body to support recursion
+        self.names[key] = name
+        body = self._body(schema)
+        lines = ['def {0}(x):'.format(name)]
+        lines += ['    ' + line for line in body]
+        lines.append('    return True')
+        self.functions.append('\n'.join(lines))
+        return name
+
+    def _body(self, schema):
+        unknown = set(schema) - SUPPORTED - ANNOTATIONS
+        unsupported = [k for k in unknown if k in ('patternProperties', 'dependencies')]
+        if unsupported:
+            raise NotImplementedError('unsupported keywords: {0}'.format(unsupported))
+        lines = []
+        lines += self._type(schema)
+        lines += self._enum(schema)
+        lines += self._guarded('string', self._string(schema), schema)
+        lines += self._guarded('number', self._number(schema), schema)
+        lines += self._guarded('object', self._object(schema), schema)
+        lines += self._guarded('array', self._array(schema), schema)
+        lines += self._combinators(schema)
+        return lines
+
+    def _guarded(self, type_, lines, schema):
+        """ keywords that apply only to instances of a specific type """
+        if not lines:
+            return []
+        # type already enforced by the "type" keyword
+        if schema.get('type') == type_ or \
+           (type_ == 'number' and schema.get('type') == 'integer'):
+            return lines
+        return ['if {0}:'.format(TYPE_CHECKS[type_].format('x'))] + \
+               ['    ' + line for line in lines]
+
+    def _check(self, schema, expression):
+        """
+        returns a python expression which evaluates to ``True`` if the
+        value of ``expression`` is valid against ``schema``;
+        returns ``None`` if any value is valid
+        """
+        keywords = set(schema) - ANNOTATIONS
+        if schema.get('format') in self.formats:
+            keywords.add('format')
+        if not keywords:
+            return None
+        # simple type checks are inlined to avoid a function call
+        if keywords == set(['type']):
+            types = schema['type']
+            if isinstance(types, six.string_types):
+                types = [types]
+            checks = [TYPE_CHECKS[t].format(expression) for t in types]
+            return ' or '.join(checks)
+        return '{0}({1})'.format(self._function(schema), expression)
+
+    def _type(self, schema):
+        types = schema.get('type')
+        if types is None:
+            return []
+        if isinstance(types, six.string_types):
+            types = [types]
+        checks = ' or '.join(TYPE_CHECKS[t].format('x') for t in types)
+        return ['if not ({0}):'.format(checks),
+                '    return False']
+
+    def _enum(self, schema):
+        if 'enum' not in schema:
+            return []
+        values = schema['enum']
+        if all(isinstance(v, six.string_types) for v in values):
+            name = self._constant(frozenset(values))
+            check = 'isinstance(x, string_types) and x in {0}'.format(name)
+        else:
+            name = self._constant(frozenset(_freeze(v) for v in values))
+            check = '_freeze(x) in {0}'.format(name)
+        return ['if not ({0}):'.format(check),
+                '    return False']
+
+    def _string(self, schema):
+        lines = []
+        if 'minLength' in schema:
+            lines += ['if len(x) < {0!r}:'.format(schema['minLength']),
+                      '    return False']
+        if 'maxLength' in schema:
+            lines += ['if len(x) > {0!r}:'.format(schema['maxLength']),
+                      '    return False']
+        if 'pattern' in schema:
+            name = self._constant(re.compile(schema['pattern']))
+            lines += ['if not {0}.search(x):'.format(name),
+                      '    return False']
+        if schema.get('format') in self.formats:
+            name = self._constant(self.formats[schema['format']])
+            lines += ['if not {0}(x):'.format(name),
+                      '    return False']
+        return lines
+
+    def _number(self, schema):
+        lines = []
+        if 'minimum' in schema:
+            operator = '<=' if schema.get('exclusiveMinimum') else '<'
+            lines += ['if x {0} {1!r}:'.format(operator, schema['minimum']),
+                      '    return False']
+        if 'maximum' in schema:
+            operator = '>=' if schema.get('exclusiveMaximum') else '>'
+            lines += ['if x {0} {1!r}:'.format(operator, schema['maximum']),
+                      '    return False']
+        if 'multipleOf' in schema:
+            divisor = schema['multipleOf']
+            if isinstance(divisor, float):
+                check = 'int(x / {0!r}) != x / {0!r}'.format(divisor)
+            else:
+                check = 'x % {0!r}'.format(divisor)
+            lines += ['if {0}:'.format(check),
+                      '    return False']
+        return lines
+
+    def _object(self, schema):
+        lines = []
+        if 'minProperties' in schema:
+            lines += ['if len(x) < {0!r}:'.format(schema['minProperties']),
+                      '    return False']
+        if 'maxProperties' in schema:
+            lines += ['if len(x) > {0!r}:'.format(schema['maxProperties']),
+                      '    return False']
+        for key in schema.get('required', []):
+            lines += ['if {0!r} not in x:'.format(key),
+                      '    return False']
+        properties = schema.get('properties', {})
+        for key, subschema in properties.items():
+            check = self._check(subschema, 'x[{0!r}]'.format(key))
+            if check is None:
+                continue
+            lines += ['if {0!r} in x and not ({1}):'.format(key, check),
+                      '    return False']
+        additional = schema.get('additionalProperties', True)
+        if additional is not True:
+            known = self._constant(frozenset(properties))
+            if additional is False:
+                check = 'k not in {0}'.format(known)
+            else:
+                check = self._check(additional, 'v') or 'True'
+                check = 'k not in {0} and not ({1})'.format(known, check)
+            lines += ['for k, v in x.items():',
+                      '    if {0}:'.format(check),
+                      '        return False']
+        return lines
+
+    def _array(self, schema):
+        lines = []
+        if 'minItems' in schema:
+            lines += ['if len(x) < {0!r}:'.format(schema['minItems']),
+                      '    return False']
+        if 'maxItems' in schema:
+            lines += ['if len(x) > {0!r}:'.format(schema['maxItems']),
+                      '    return False']
+        if schema.get('uniqueItems'):
+            lines += ['if not _unique(x):',
+                      '    return False']
+        items = schema.get('items', {})
+        if isinstance(items, dict):
+            check = self._check(items, 'i')
+            if check is not None:
+                lines += ['for i in x:',
+                          '    if not ({0}):'.format(check),
+                          '        return False']
+            return lines
+        # tuple validation
+        for index, subschema in enumerate(items):
+            function = self._function(subschema)
+            lines += ['if len(x) > {0} and not {1}(x[{0}]):'.format(index, function),
+                      '    return False']
+        additional = schema.get('additionalItems', True)
+        if additional is False:
+            lines += ['if len(x) > {0}:'.format(len(items)),
+                      '    return False']
+        elif additional is not True:
+            function = self._function(additional)
+            lines += ['for i in x[{0}:]:'.format(len(items)),
+                      '    if not {0}(i):'.format(function),
+                      '        return False']
+        return lines
+
+    def _combinators(self, schema):
+        lines = []
+        for subschema in schema.get('allOf', []):
+            lines += ['if not {0}(x):'.format(self._function(subschema)),
+                      '    return False']
+        if 'anyOf' in schema:
+            calls = ['{0}(x)'.format(self._function(s)) for s in schema['anyOf']]
+            lines += ['if not ({0}):'.format(' or '.join(calls)),
+                      '    return False']
+        if 'oneOf' in schema:
+            calls = ['{0}(x)'.format(self._function(s)) for s in schema['oneOf']]
+            lines += ['if ({0}) != 1:'.format(' + '.join(calls)),
+                      '    return False']
+        if 'not' in schema:
+            lines += ['if {0}(x):'.format(self._function(schema['not'])),
+                      '    return False']
+        return lines
+
+
+def compile_schema(schema, formats=None):
+    """
+    Compiles ``schema`` into a python validation function.
+
+    :param schema: JSON-Schema (draft 4) ``dict``
+    :param formats: ``dict`` mapping ``format`` values to functions which
+                    return ``True`` if a string is valid, other formats are ignored
+    :returns: function returning ``True`` if the instance passed is valid
+    :raises NotImplementedError: if ``schema`` uses unsupported keywords
+    """
+    return SchemaCompiler(schema, formats).compile()
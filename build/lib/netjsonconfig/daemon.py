@@ -0,0 +1,357 @@
+"""
+Render daemon: keeps backends, validators and templates loaded
+in a pool of worker processes and serves render requests over a Unix
+socket, so clients don't pay the startup cost on each call::
+
+    python -m netjsonconfig.daemon --workers 4
+
+The command line utility forwards its requests to the daemon if it's running.
+
+The protocol is a sequence of messages, each one is a JSON object encoded in
+UTF-8 and preceded by its length (4 bytes, big endian); each request message
+is followed by a response message on the same connection.
+"""
+import argparse
+import base64
+import errno
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+
+from six.moves import socketserver
+
+# methods which can be called by clients
+METHODS = ('render', 'generate', 'write', 'delta', 'generate_delta', 'json')
+HEADER = struct.Struct('!I')
+
+
+def default_socket_path():
+    """
+    Returns the path of the socket: the ``NETJSONCONFIG_SOCKET``
+    environment variable if set, otherwise ``netjsonconfig.sock`` in
+    ``XDG_RUNTIME_DIR``; ``None`` if neither variable is set, shared
+    directories like ``/tmp`` are never used because any user could
+    create the socket there and receive the configurations.
+    """
+    path = os.environ.get('NETJSONCONFIG_SOCKET')
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'netjsonconfig.sock')
+    return None
+
+
+def is_trusted_socket(path):
+    """
+    Returns ``True`` if ``path`` is a socket owned by the current
+    user which can't be accessed by other users (eg: not created by
+    someone else to receive the configurations sent by clients).
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISSOCK(info.st_mode) and
+            info.st_uid == os.getuid() and
+            not info.st_mode & 0o077)
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def receive_message(sock):
+    """
+    returns the next message, ``None`` if the connection was closed
+    """
+    header = _receive(sock, HEADER.size)
+    if header is None:
+        return None
+    data = _receive(sock, HEADER.unpack(header)[0])
+    if data is None:
+        raise EOFError('connection closed while receiving a message')
+    return json.loads(data.decode('utf-8'))
+
+
+def _receive(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            if chunks:
+                raise EOFError('connection closed while receiving a message')
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class Client(object):
+    """
+    Client of the render daemon, the connection is reused for many requests.
+
+    :param path: path of the socket, defaults to ``default_socket_path()``
+    :param timeout: socket timeout in seconds, ``None`` waits indefinitely
+    :raises socket.error: if the daemon is not running or if the socket
+                          is not trusted (see ``is_trusted_socket``)
+    """
+    def __init__(self, path=None, timeout=None):
+        self.path = path or default_socket_path()
+        if self.path is None:
+            raise socket.error(errno.ENOENT, 'socket path not set')
+        if not is_trusted_socket(self.path):
+            raise socket.error(errno.EACCES, 'untrusted socket: {0}'.format(self.path))
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except socket.error:
+            self.sock.close()
+            raise
+
+    def request(self, backend, method, config, templates=[], arguments={}):
+        """
+        Runs ``method`` of ``backend`` in the daemon.
+
+        :param backend: ``"openwrt"`` or ``"openwisp"``
+        :param method: one of ``METHODS``
+        :param config: configuration ``dict`` or NetJSON string
+        :param templates: ``list`` of templates
+        :param arguments: keyword arguments of ``method``
+        :returns: response ``dict``: ``status`` is ``"ok"`` and ``output``
+                  contains the output of the method (``bytes`` for archives),
+                  or ``status`` is ``"error"`` and ``type``, ``message``,
+                  ``details`` and ``phase`` (``init`` or ``method``)
+                  describe the error
+        """
+        send_message(self.sock, {
+            'backend': backend,
+            'method': method,
+            'config': config,
+            'templates': templates,
+            'arguments': arguments
+        })
+        response = receive_message(self.sock)
+        if response is None:
+            raise EOFError('connection closed by the daemon')
+        if response.get('encoding') == 'base64':
+            response['output'] = base64.b64decode(response['output'])
+        return response
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def forward(backend, method, config, templates=[], arguments={}, path=None):
+    """
+    Forwards a request to the daemon if it's running.
+
+    :returns: response ``dict`` (see ``Client.request``), ``None`` if the
+              daemon is not running or can't be used (eg: the socket belongs
+              to another user, the connection was closed or the response is
+              not valid), in which case the request should be run locally
+    """
+    try:
+        with Client(path) as client:
+            return client.request(backend, method, config, templates, arguments)
+    except (socket.error, EOFError, ValueError, struct.error):
+        return None
+
+
+def _backends():
+    from . import OpenWisp, OpenWrt
+    return {'openwrt': OpenWrt, 'openwisp': OpenWisp}
+
+
+def handle_request(request):
+    """
+    Runs a request in the current process.
+
+    :param request: request ``dict``, see ``Client.request``
+    :returns: response ``dict``
+    """
+    backend_class = _backends().get(request.get('backend'))
+    method = request.get('method')
+    if backend_class is None or method not in METHODS:
+        return _error('init', ValueError('invalid backend or method'))
+    try:
+        backend = backend_class(request.get('config'),
+                                templates=request.get('templates') or [])
+    except Exception as e:
+        return _error('init', e)
+    # any error is sent to the client, which would
+    # otherwise only see the connection being closed
+    try:
+        output = getattr(backend, method)(**request.get('arguments') or {})
+    except Exception as e:
+        return _error('method', e)
+    response = {'status': 'ok', 'output': output}
+    # archives
+    if hasattr(output, 'getvalue'):
+        response['output'] = base64.b64encode(output.getvalue()).decode('ascii')
+        response['encoding'] = 'base64'
+    return response
+
+
+def _error(phase, exception):
+    details = getattr(exception, 'details', exception)
+    return {
+        'status': 'error',
+        'phase': phase,
+        'type': exception.__class__.__name__,
+        'message': getattr(exception, 'message', None) or str(exception),
+        'details': str(details)
+    }
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                request = receive_message(self.request)
+            except (EOFError, ValueError, socket.error):
+                return
+            if request is None:
+                return
+            send_message(self.request, handle_request(request))
+
+
+def warm_up():
+    """
+    Loads what is needed by the backends before the workers are forked:
+    validators, compiled validators and templates of both render engines.
+    """
+    for backend_class in _backends().values():
+        backend_class.get_validator()
+        backend_class.get_compiled_validator()
+        for engine in ('jinja2', 'direct'):
+            backend = backend_class({'general': {'hostname': 'warm-up'},
+                                     'interfaces': [{'name': 'eth0', 'type': 'ethernet'}],
+                                     'custom': [{'config_name': 'warm-up'}]},
+                                    engine=engine)
+            backend.render()
+            for template in backend.env.list_templates():
+                backend.env.get_template(template)
+
+
+class _Stop(Exception):
+    pass
+
+
+class Daemon(object):
+    """
+    Pre-forking daemon: the socket is created and the backends are warmed
+    up in the main process, then ``workers`` processes are forked which
+    accept connections on the same socket, sharing the loaded state;
+    workers which exit unexpectedly are replaced.
+
+    :param path: path of the socket, defaults to ``default_socket_path()``
+    :param workers: number of worker processes, defaults to the number of CPUs
+    """
+    def __init__(self, path=None, workers=None):
+        from multiprocessing import cpu_count
+        self.path = path or default_socket_path()
+        if self.path is None:
+            raise RuntimeError('the socket path must be passed when neither '
+                               'NETJSONCONFIG_SOCKET nor XDG_RUNTIME_DIR are set')
+        self.workers = workers or cpu_count()
+        self.pids = set()
+
+    def _bind(self):
+        # remove stale sockets left by daemons which were killed
+        if os.path.lexists(self.path):
+            if os.lstat(self.path).st_uid != os.getuid():
+                raise RuntimeError('{0} belongs to another user'.format(self.path))
+            try:
+                Client(self.path).close()
+            except socket.error:
+                os.remove(self.path)
+            else:
+                raise RuntimeError('a daemon is already listening on {0}'.format(self.path))
+        umask = os.umask(0o177)
+        try:
+            self.server = socketserver.UnixStreamServer(self.path, RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid:
+            self.pids.add(pid)
+            return
+        # worker process
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        try:
+            self.server.serve_forever()
+        finally:
+            os._exit(0)
+
+    def _stop(self, signum, frame):
+        raise _Stop()
+
+    def serve(self):
+        """ runs the daemon until it receives ``SIGTERM`` or ``SIGINT`` """
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        try:
+            self._bind()
+        except _Stop:
+            return
+        # connections received before the workers are started wait in the backlog
+        try:
+            warm_up()
+            while True:
+                while len(self.pids) < self.workers:
+                    self._spawn()
+                try:
+                    pid, status = os.wait()
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        raise
+                    continue
+                self.pids.discard(pid)
+        except _Stop:
+            pass
+        finally:
+            for pid in self.pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                except OSError:
+                    pass
+            self.server.server_close()
+            os.remove(self.path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m netjsonconfig.daemon',
+                                     description='netjsonconfig render daemon')
+    parser.add_argument('--socket', '-s', default=None,
+                        help='path of the unix socket, defaults to $NETJSONCONFIG_SOCKET '
+                             'or $XDG_RUNTIME_DIR/netjsonconfig.sock')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='number of worker processes, defaults to the number of CPUs')
+    args = parser.parse_args(argv)
+    try:
+        daemon = Daemon(args.socket, args.workers)
+        daemon.serve()
+    except RuntimeError as e:
+        sys.stderr.write('netjsonconfig: {0}\n'.format(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':  # pragma: nocover
+    main()
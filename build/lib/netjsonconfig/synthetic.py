@@ -0,0 +1,337 @@
+"""
+Synthetic fleet generator: builds valid NetJSON DeviceConfiguration
+objects of tunable size for load testing, streamed as NDJSON::
+
+    python -m netjsonconfig.synthetic --count 100000 --seed 1 > fleet.ndjson
+"""
+import argparse
+import errno
+import json
+import random
+import string
+import sys
+from collections import OrderedDict
+from itertools import count as counter
+
+from . import OpenWisp, OpenWrt
+
+BACKENDS = OrderedDict([('openwrt', OpenWrt), ('openwisp', OpenWisp)])
+
+
+class FleetGenerator(object):
+    """
+    Generates NetJSON DeviceConfiguration objects; the choices which are
+    constrained by the schema of ``backend_class`` (radio drivers and
+    protocols, encryption protocols, rule actions) are taken from the schema.
+
+    Each device depends only on ``seed`` and on its index,
+    so any slice of a fleet can be generated again on its own.
+
+    :param backend_class: backend class, eg: ``OpenWrt``
+    :param seed: seed of the random generator
+    :param interfaces: ethernet interfaces per device
+    :param addresses: addresses per ethernet interface
+    :param bridges: bridges per device, each one groups two ethernet interfaces
+    :param radios: radios per device
+    :param wifi: wifi interfaces per radio
+    :param routes: static routes per device
+    :param ip_rules: policy routing rules per device
+    :param vlans: switch vlans per device
+    :param custom: sections of the custom ``firewall`` package per device
+    :param files: additional files per device
+    :param file_size: size in bytes of each additional file
+    """
+    def __init__(self, backend_class=OpenWrt, seed=0, interfaces=4, addresses=2,
+                 bridges=1, radios=2, wifi=2, routes=4, ip_rules=2, vlans=4,
+                 custom=2, files=1, file_size=256):
+        self.backend_class = backend_class
+        self.seed = seed
+        self.interfaces = interfaces
+        self.addresses = addresses
+        self.bridges = bridges
+        self.radios = radios
+        self.wifi = wifi
+        self.routes = routes
+        self.ip_rules = ip_rules
+        self.vlans = vlans
+        self.custom = custom
+        self.files = files
+        self.file_size = file_size
+        schema = backend_class.schema
+        properties = schema['properties']
+        radio = properties['radios']['items']['properties']
+        wireless = schema['definitions']['wireless_interface']['allOf'][2]
+        encryption = wireless['properties']['wireless']['properties']['encryption']
+        self.drivers = radio['driver']['enum']
+        self.radio_protocols = radio['protocol']['enum']
+        # enterprise and wep protocols need external servers or specific keys
+        self.encryption_protocols = [p for p in encryption['properties']['protocol']['enum']
+                                     if 'personal' in p or p == 'none']
+        self.rule_actions = properties['ip_rules']['items']['properties']['action']['enum']
+        self.tc_options = 'tc_options' in properties
+
+    def __iter__(self):
+        return self.generate()
+
+    def generate(self, count=None, start=0):
+        """
+        Yields one device configuration at a time.
+
+        :param count: number of devices, ``None`` for an endless stream
+        :param start: index of the first device
+        :returns: generator of configuration dictionaries
+        """
+        indexes = counter(start) if count is None else range(start, start + count)
+        for index in indexes:
+            yield self.device(index)
+
+    def device(self, index):
+        """
+        Returns the configuration of the device at position ``index`` of the fleet.
+
+        :param index: position of the device in the fleet
+        :returns: configuration ``dict``
+        """
+        rand = random.Random(self.seed * 2 ** 32 + index)
+        config = OrderedDict([
+            ('type', 'DeviceConfiguration'),
+            ('general', {'hostname': 'device-{0}'.format(index)}),
+            ('interfaces', []),
+        ])
+        ethernet = self._ethernet(rand, index)
+        bridged = self._bridges(ethernet)
+        config['interfaces'] += ethernet + bridged
+        if self.radios:
+            radios = self._radios(rand)
+            config['radios'] = radios
+            config['interfaces'] += self._wifi(rand, radios, bridged or ethernet)
+        if self.routes and ethernet:
+            config['routes'] = self._routes(rand, ethernet)
+        if self.ip_rules and ethernet:
+            config['ip_rules'] = self._ip_rules(rand, ethernet)
+        if self.vlans:
+            config['switch'] = [self._switch(rand)]
+        config['dns_servers'] = ['10.255.0.{0}'.format(rand.randint(1, 254))]
+        config['ntp'] = {'enabled': True, 'server': ['0.openwrt.pool.ntp.org']}
+        if self.custom:
+            config['firewall'] = self._firewall(rand)
+        if self.tc_options and bridged:
+            config['tc_options'] = [{'name': bridge['name'],
+                                     'input_bandwidth': rand.choice([1024, 2048, 4096]),
+                                     'output_bandwidth': rand.choice([512, 1024, 2048])}
+                                    for bridge in bridged]
+        if self.files:
+            config['files'] = self._files(rand)
+        return config
+
+    def _ethernet(self, rand, index):
+        interfaces = []
+        # the last interfaces are bridge members, without addresses
+        addressed = self.interfaces - self.bridges * 2
+        for i in range(self.interfaces):
+            addresses = []
+            for j in range(self.addresses if i < addressed else 0):
+                if j == 0 and rand.random() < 0.2:
+                    addresses.append({'proto': 'dhcp', 'family': 'ipv4'})
+                elif j % 2:
+                    addresses.append({
+                        'address': 'fd{0:02x}:{1:x}:{2:x}::{3:x}'.format(
+                            index % 256, index // 256 % 65536, i, j),
+                        'mask': 64,
+                        'proto': 'static',
+                        'family': 'ipv6'
+                    })
+                else:
+                    addresses.append({
+                        'address': '10.{0}.{1}.{2}'.format(i % 256, j % 256, rand.randint(1, 254)),
+                        'mask': 24,
+                        'proto': 'static',
+                        'family': 'ipv4'
+                    })
+            interface = {'name': 'eth{0}'.format(i), 'type': 'ethernet'}
+            if rand.random() < 0.3:
+                interface['mtu'] = rand.choice([1280, 1492, 1500, 9000])
+            if addresses:
+                interface['addresses'] = addresses
+            interfaces.append(interface)
+        return interfaces
+
+    def _bridges(self, ethernet):
+        bridges = []
+        members = [i for i in ethernet if 'addresses' not in i]
+        for i in range(self.bridges):
+            bridge_members = [m['name'] for m in members[i * 2:i * 2 + 2]]
+            bridges.append({
+                'name': 'br-lan{0}'.format(i),
+                'network': 'lan{0}'.format(i),
+                'type': 'bridge',
+                'bridge_members': bridge_members,
+                'addresses': [{
+                    'address': '192.168.{0}.1'.format(i % 256),
+                    'mask': 24,
+                    'proto': 'static',
+                    'family': 'ipv4'
+                }]
+            })
+        return bridges
+
+    def _radios(self, rand):
+        radios = []
+        for i in range(self.radios):
+            protocol = rand.choice(self.radio_protocols)
+            five_ghz = protocol in ('802.11a', '802.11ac')
+            radios.append({
+                'name': 'radio{0}'.format(i),
+                'phy': 'phy{0}'.format(i),
+                'driver': rand.choice(self.drivers),
+                'protocol': protocol,
+                'channel': rand.choice([36, 40, 44, 48] if five_ghz else [1, 6, 11]),
+                'channel_width': rand.choice([20, 40, 80] if protocol == '802.11ac' else [20]),
+                'tx_power': rand.randint(5, 20),
+                'country': rand.choice(['IT', 'DE', 'US', 'FR'])
+            })
+        return radios
+
+    def _wifi(self, rand, radios, networks):
+        interfaces = []
+        for radio in radios:
+            for i in range(self.wifi):
+                protocol = rand.choice(self.encryption_protocols)
+                wireless = {
+                    'radio': radio['name'],
+                    'mode': 'access_point',
+                    'ssid': 'ssid-{0}-{1}'.format(radio['name'], i)
+                }
+                # without interfaces and bridges there's nothing to attach to
+                if networks:
+                    network = rand.choice(networks)
+                    wireless['network'] = [network.get('network', network['name'])]
+                if protocol != 'none':
+                    wireless['encryption'] = {
+                        'enabled': True,
+                        'protocol': protocol,
+                        'cipher': rand.choice(['auto', 'ccmp', 'tkip']),
+                        'key': self._text(rand, 16)
+                    }
+                interfaces.append({
+                    'name': 'wlan{0}'.format(len(interfaces)),
+                    'type': 'wireless',
+                    'wireless': wireless
+                })
+        return interfaces
+
+    def _routes(self, rand, ethernet):
+        return [{
+            'device': rand.choice(ethernet)['name'],
+            'next': '10.0.0.{0}'.format(rand.randint(1, 254)),
+            'destination': '172.{0}.{1}.0/24'.format(16 + i // 256 % 16, i % 256),
+            'cost': rand.randint(0, 100)
+        } for i in range(self.routes)]
+
+    def _ip_rules(self, rand, ethernet):
+        rules = []
+        for i in range(self.ip_rules):
+            rule = {
+                'in': rand.choice(ethernet)['name'],
+                'src': '10.{0}.0.0/16'.format(i % 256)
+            }
+            if rand.random() < 0.3:
+                rule['action'] = rand.choice(self.rule_actions)
+            else:
+                rule['lookup'] = str(rand.randint(1, 250))
+            rules.append(rule)
+        return rules
+
+    def _switch(self, rand):
+        return {
+            'name': 'switch0',
+            'reset': True,
+            'enable_vlan': True,
+            'vlan': [{
+                'device': 'switch0',
+                'vlan': i + 1,
+                'ports': '0t {0}'.format(' '.join(str(p) for p in
+                                                  sorted(rand.sample(range(1, 6), 2))))
+            } for i in range(self.vlans)]
+        }
+
+    def _firewall(self, rand):
+        return [{
+            'config_name': 'rule',
+            'config_value': 'rule{0}'.format(i),
+            'src': 'wan',
+            'dest_port': str(rand.randint(1, 65535)),
+            'proto': rand.choice(['tcp', 'udp']),
+            'target': rand.choice(['ACCEPT', 'REJECT', 'DROP'])
+        } for i in range(self.custom)]
+
+    def _files(self, rand):
+        return [{
+            'path': '/etc/synthetic/file{0}'.format(i),
+            'contents': self._text(rand, self.file_size),
+            'mode': rand.choice(['0644', '0600', '0755'])
+        } for i in range(self.files)]
+
+    @staticmethod
+    def _text(rand, size):
+        characters = string.ascii_letters + string.digits
+        return ''.join(rand.choice(characters) for i in range(size))
+
+
+def write_ndjson(configs, stream):
+    """
+    Writes ``configs`` to ``stream`` one JSON object per line.
+
+    :param configs: iterable of configuration dictionaries
+    :param stream: writable text file object
+    :returns: number of configurations written
+    """
+    written = 0
+    for config in configs:
+        stream.write(json.dumps(config, separators=(',', ':')))
+        stream.write('\n')
+        written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m netjsonconfig.synthetic',
+                                     description='Generates a synthetic fleet of '
+                                                 'NetJSON DeviceConfiguration objects '
+                                                 'as NDJSON (one object per line)')
+    parser.add_argument('--backend', '-b', choices=list(BACKENDS.keys()), default='openwrt')
+    parser.add_argument('--count', '-n', type=int, default=None,
+                        help='number of devices, endless stream if omitted')
+    parser.add_argument('--start', type=int, default=0, help='index of the first device')
+    parser.add_argument('--seed', '-s', type=int, default=0)
+    parser.add_argument('--output', '-o', default='-', help='output file, defaults to stdout')
+    for option, default in (('interfaces', 4), ('addresses', 2), ('bridges', 1),
+                            ('radios', 2), ('wifi', 2), ('routes', 4), ('ip-rules', 2),
+                            ('vlans', 4), ('custom', 2), ('files', 1), ('file-size', 256)):
+        parser.add_argument('--{0}'.format(option), type=int, default=default,
+                            help='defaults to {0}'.format(default))
+    args = parser.parse_args(argv)
+    generator = FleetGenerator(BACKENDS[args.backend], seed=args.seed,
+                               interfaces=args.interfaces, addresses=args.addresses,
+                               bridges=args.bridges, radios=args.radios, wifi=args.wifi,
+                               routes=args.routes, ip_rules=args.ip_rules, vlans=args.vlans,
+                               custom=args.custom, files=args.files,
+                               file_size=args.file_size)
+    configs = generator.generate(args.count, args.start)
+    if args.output == '-':
+        write_ndjson(configs, sys.stdout)
+    else:
+        with open(args.output, 'w') as f:
+            write_ndjson(configs, f)
+
+
+if __name__ == '__main__':  # pragma: nocover
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
+    except IOError as e:
+        # output closed by the consumer, eg: piped to head
+        if e.errno != errno.EPIPE:
+            raise
+        sys.exit(1)
@@ -0,0 +1,298 @@
+import json
+import hashlib
+from collections import OrderedDict
+from copy import deepcopy
+from importlib import import_module
+from threading import Lock
+from timeit import default_timer
+
+try:
+    import xxhash
+except ImportError:  # pragma: nocover
+    xxhash = None
+
+
+def merge_config(template, config, copy=True):
+    """
+    Merges ``config`` on top of ``template``.
+
+    Conflicting keys are handled in the following way:
+
+    * simple values (eg: ``str``, ``int``, ``float``, ecc) in ``config`` will
+      overwrite the ones in ``template``
+    * values of type ``list`` in both ``config`` and ``template`` will be summed
+      in order to create a list which contains elements of both
+    * values of type ``dict`` will be merged recursively
+
+    ``template`` and ``config`` are never modified; if ``copy`` is ``False``
+    only the dictionaries and lists changed by the merge are copied, while
+    the rest of the result is shared with ``template`` and ``config``.
+
+    :param template: template ``dict``
+    :param config: config ``dict``
+    :param copy: whether the elements of merged lists are deep copied,
+                 defaults to ``True``
+    :returns: merged ``dict``
+    """
+    result = template.copy()
+    for key, value in config.items():
+        if isinstance(value, dict):
+            if not copy and key not in result:
+                result[key] = value
+                continue
+            node = result.get(key, {})
+            result[key] = merge_config(node, value, copy)
+        elif isinstance(value, list) and isinstance(result.get(key), list):
+            if copy:
+                result[key] = deepcopy(result[key]) + deepcopy(value)
+            else:
+                result[key] = result[key] + value
+        else:
+            result[key] = value
+    return result
+
+
+class LRUCache(object):
+    """
+    Thread safe mapping which holds at most ``maxsize`` items,
+    the least recently used item is discarded when full;
+    keeps track of hits and misses.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            # reinsert to mark the item as most recently used
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """ removes all the items and resets the statistics """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        :returns: ``dict`` with ``hits``, ``misses``,
+                  ``size`` and ``maxsize`` of the cache
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._data),
+                    'maxsize': self.maxsize}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+class Timings(object):
+    """
+    Records the wall time and the number of calls of named phases;
+    thread safe, can be shared by many backend instances.
+
+    ``callback``, if given, is called with ``(phase, elapsed)``
+    each time a phase ends, eg: to forward timings to a metrics service.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._phases = OrderedDict()
+        self._lock = Lock()
+
+    def measure(self, phase):
+        """
+        Returns a context manager which records the time spent in its block.
+
+        :param phase: name of the phase, eg: ``validate``
+        """
+        return _Timer(self, phase)
+
+    def add(self, phase, elapsed):
+        """
+        Records a call of ``phase`` which lasted ``elapsed`` seconds.
+        """
+        with self._lock:
+            stats = self._phases.get(phase)
+            if stats is None:
+                stats = self._phases[phase] = [0, 0.0]
+            stats[0] += 1
+            stats[1] += elapsed
+        if self.callback is not None:
+            self.callback(phase, elapsed)
+
+    def stats(self):
+        """
+        :returns: ``OrderedDict`` which maps each phase (in order of
+                  first call) to a ``dict`` with ``calls`` and ``time``
+                  (total seconds)
+        """
+        with self._lock:
+            return OrderedDict((phase, {'calls': calls, 'time': time})
+                               for phase, (calls, time) in self._phases.items())
+
+    def clear(self):
+        with self._lock:
+            self._phases.clear()
+
+    def report(self):
+        """
+        :returns: ``stats`` formatted as a text table
+        """
+        stats = self.stats()
+        width = max([len(phase) for phase in stats] + [len('phase')])
+        lines = ['{0:<{width}} {1:>7} {2:>12}'.format('phase', 'calls', 'ms', width=width)]
+        for phase, values in stats.items():
+            lines.append('{0:<{width}} {1:>7} {2:>12.3f}'.format(
+                phase, values['calls'], values['time'] * 1000, width=width))
+        return '\n'.join(lines)
+
+    def __contains__(self, phase):
+        return phase in self._phases
+
+    def __len__(self):
+        return len(self._phases)
+
+
+class _Timer(object):
+    __slots__ = ('timings', 'phase', 'start')
+
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = default_timer()
+
+    def __exit__(self, *args):
+        self.timings.add(self.phase, default_timer() - self.start)
+
+
+class _NullTimer(object):
+    """ context manager which does nothing, used when timings are disabled """
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class LazyAttribute(object):
+    """
+    Class attribute whose value is the attribute ``name`` of ``module``,
+    the module is imported the first time the attribute is accessed;
+    assigning the attribute on the class replaces the lazy value.
+
+    :param module: absolute name of the module
+    :param name: attribute of the module
+    """
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+
+    def __get__(self, instance, owner):
+        return getattr(import_module(self.module), self.name)
+
+
+# types which may contain integral floats
+_NUMBER_CONTAINERS = (dict, list, tuple, float)
+
+
+def canonical_json(value):
+    """
+    Serializes ``value`` to JSON in a canonical form: keys are sorted,
+    there's no whitespace and integral floats are converted to
+    integers (``1.0`` becomes ``1``), so equal configurations
+    always produce the same string.
+
+    :param value: JSON serializable object
+    :returns: string
+    """
+    return json.dumps(_normalize_numbers(value), sort_keys=True,
+                      separators=(',', ':'))
+
+
+def _normalize_numbers(value):
+    """
+    returns ``value`` with integral floats converted to integers;
+    containers are copied only if any of their items is converted
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = enumerate(value)
+    elif isinstance(value, float) and value.is_integer():
+        return int(value)
+    else:
+        return value
+    result = None
+    for key, item in items:
+        if not isinstance(item, _NUMBER_CONTAINERS):
+            continue
+        normalized = _normalize_numbers(item)
+        if normalized is not item:
+            if result is None:
+                result = dict(value) if isinstance(value, dict) else list(value)
+            result[key] = normalized
+    return value if result is None else result
+
+
+def new_hash(algorithm=None):
+    """
+    Returns a new hash object.
+
+    :param algorithm: ``xxh64`` (requires the ``xxhash`` package) or any
+                      algorithm supported by ``hashlib``; defaults to ``xxh64``
+                      if ``xxhash`` is installed, ``sha256`` otherwise
+    :returns: hash object with ``update`` and ``hexdigest`` methods
+    :raises ValueError: if ``algorithm`` is not supported
+    """
+    if algorithm is None:
+        algorithm = 'xxh64' if xxhash else 'sha256'
+    if algorithm == 'xxh64':
+        if xxhash is None:
+            raise ValueError('the xxh64 algorithm requires the xxhash package')
+        return xxhash.xxh64()
+    return hashlib.new(algorithm)
+
+
+def sorted_dict(dictionary):
+    return OrderedDict(sorted(dictionary.items()))
+
+
+class _TabsMixin(object):  # pragma: nocover
+    """
+    mixin that adds _tabs method to test classes
+    """
+    def _tabs(self, string):
+        """
+        replace 4 spaces with 1 tab
+        """
+        return string.replace('    ', '\t')
@@ -1,4 +1,31 @@
+import sys
+from importlib import import_module
+
 from .version import VERSION, __version__, get_version  # noqa
 
-from .backends.openwrt.openwrt import OpenWrt  # noqa
-from .backends.openwisp.openwisp import OpenWisp  # noqa
+# backends are imported on first access, importing them loads
+# jinja2 and jsonschema which are not needed by every consumer
+# (eg: ``netjsonconfig --version``, the render daemon client)
+_lazy_attributes = {
+    'OpenWrt': 'netjsonconfig.backends.openwrt.openwrt',
+    'OpenWisp': 'netjsonconfig.backends.openwisp.openwisp'
+}
+
+
+def __getattr__(name):
+    module = _lazy_attributes.get(name)
+    if module is None:
+        raise AttributeError("module 'netjsonconfig' has no attribute '{0}'".format(name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+# module level __getattr__ is supported since python 3.7 (PEP 562)
+if sys.version_info < (3, 7):  # pragma: nocover
+    from .backends.openwrt.openwrt import OpenWrt  # noqa
+    from .backends.openwisp.openwisp import OpenWisp  # noqa
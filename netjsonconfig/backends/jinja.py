@@ -0,0 +1,205 @@
+"""
+Jinja2 environments shared by all the backend instances
+
+Templates can be precompiled into python modules with::
+
+    python setup.py build_templates
+
+(this is done automatically by ``setup.py build``), the compiled
+modules are stored in the ``compiled`` directory of each backend package.
+"""
+import os
+import json
+import hashlib
+import pkgutil
+from importlib import import_module
+
+import six
+import jinja2
+from jinja2 import (Environment, PackageLoader, ModuleLoader,
+                    ChoiceLoader, TemplateNotFound)
+from jinja2.bccache import BytecodeCache, FileSystemBytecodeCache
+
+# environment variable pointing to a directory used as on-disk bytecode cache
+CACHE_DIR_VARIABLE = 'NETJSONCONFIG_TEMPLATE_CACHE'
+# packages shipping jinja2 templates
+TEMPLATE_PACKAGES = ['netjsonconfig.backends.openwrt',
+                     'netjsonconfig.backends.openwisp']
+COMPILED_DIR = 'compiled'
+MANIFEST_NAME = 'manifest.json'
+
+# set to False to always load templates from source
+use_precompiled = True
+
+_environments = {}
+_bytecode_cache = None
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """
+    keeps compiled templates in a ``dict``, allows environments
+    created after ``set_bytecode_cache`` to skip template compilation
+    """
+    def __init__(self):
+        self.storage = {}
+
+    def load_bytecode(self, bucket):
+        code = self.storage.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket):
+        self.storage[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self):
+        self.storage.clear()
+
+
+def set_bytecode_cache(cache):
+    """
+    Configures the jinja2 bytecode cache used by all the backends.
+
+    :param cache: one of the following:
+
+                  * ``None``: disables the bytecode cache
+                  * ``"memory"``: in-memory cache
+                  * ``str``: path of a directory used as on-disk cache
+                  * ``jinja2.BytecodeCache`` instance
+    :returns: the ``BytecodeCache`` instance in use or ``None``
+    """
+    global _bytecode_cache
+    if cache == 'memory':
+        cache = MemoryBytecodeCache()
+    elif isinstance(cache, six.string_types):
+        if not os.path.isdir(cache):
+            os.makedirs(cache)
+        cache = FileSystemBytecodeCache(cache)
+    elif cache is not None and not isinstance(cache, BytecodeCache):
+        raise TypeError('cache must be None, "memory", a directory path '
+                        'or an instance of jinja2.BytecodeCache')
+    _bytecode_cache = cache
+    # environments are rebuilt on next use with the new cache
+    _environments.clear()
+    return cache
+
+
+def get_bytecode_cache():
+    """ returns the ``BytecodeCache`` instance in use or ``None`` """
+    return _bytecode_cache
+
+
+class PrecompiledLoader(ModuleLoader):
+    """
+    Loads templates precompiled by ``compile_templates``; a template is
+    loaded only if its source has not changed since it was compiled
+    (eg: customized by the user), otherwise ``TemplateNotFound`` is raised
+    so that ``ChoiceLoader`` falls back to the source template.
+    """
+    def __init__(self, package, path, directory):
+        super(PrecompiledLoader, self).__init__(directory)
+        self.package = package
+        self.path = path
+        self.checksums = _read_manifest(directory)
+
+    def load(self, environment, name, globals=None):
+        checksum = self.checksums.get(name)
+        if checksum is None or checksum != _checksum(self.package, self.path, name):
+            raise TemplateNotFound(name)
+        return super(PrecompiledLoader, self).load(environment, name, globals)
+
+    def list_templates(self):
+        return sorted(self.checksums)
+
+
+def _checksum(package, path, name):
+    data = pkgutil.get_data(package, '{0}/{1}'.format(path, name))
+    return hashlib.sha1(data).hexdigest()
+
+
+def _compiled_directory(package):
+    module = import_module(package)
+    return os.path.join(os.path.dirname(module.__file__), COMPILED_DIR)
+
+
+def _read_manifest(directory):
+    """
+    returns the template checksums stored in the manifest
+    or an empty ``dict`` if the templates were compiled
+    by a different jinja2 version
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    if manifest.get('jinja2') != jinja2.__version__:
+        return {}
+    return manifest.get('templates', {})
+
+
+def _create_environment(loader):
+    # compiled modules depend on these options, keep
+    # them equal in compile_templates and get_environment
+    return Environment(loader=loader,
+                       bytecode_cache=_bytecode_cache,
+                       trim_blocks=True)
+
+
+def compile_templates(package, path='templates', target=None):
+    """
+    Compiles the templates of ``package`` into python modules
+    which are loaded by ``get_environment`` in place of the sources.
+
+    :param package: python package name, eg: ``netjsonconfig.backends.openwrt``
+    :param path: templates directory inside ``package``
+    :param target: output directory, defaults to the ``compiled``
+                   directory of ``package``
+    :returns: output directory
+    """
+    target = target or _compiled_directory(package)
+    env = _create_environment(PackageLoader(package, path))
+    env.compile_templates(target, zip=None, ignore_errors=False)
+    manifest = {
+        'jinja2': jinja2.__version__,
+        'templates': dict((name, _checksum(package, path, name))
+                          for name in env.list_templates())
+    }
+    with open(os.path.join(target, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    return target
+
+
+def compile_all():
+    """ compiles the templates of all the backends """
+    return [compile_templates(package) for package in TEMPLATE_PACKAGES]
+
+
+def get_environment(package, path='templates'):
+    """
+    Returns the jinja2 environment which loads templates
+    from ``path`` of ``package``; environments are created
+    once and shared by all the backend instances.
+
+    Precompiled templates are used when available and up to date.
+
+    :param package: python package name, eg: ``netjsonconfig.backends.openwrt``
+    :param path: templates directory inside ``package``
+    :returns: ``jinja2.Environment`` instance
+    """
+    key = (package, path)
+    env = _environments.get(key)
+    if env is None:
+        loader = PackageLoader(package, path)
+        directory = _compiled_directory(package)
+        if use_precompiled and os.path.isdir(directory):
+            loader = ChoiceLoader([PrecompiledLoader(package, path, directory),
+                                   loader])
+        env = _create_environment(loader)
+        _environments[key] = env
+    return env
+
+
+# on-disk cache can be enabled through an environment variable,
+# useful for short lived processes like the command line utility
+if os.environ.get(CACHE_DIR_VARIABLE):
+    set_bytecode_cache(os.environ[CACHE_DIR_VARIABLE])
@@ -0,0 +1,412 @@
+"""
+Parsers which convert UCI configuration back to NetJSON,
+each one is the inverse of the renderer of the same package
+"""
+import os
+import re
+from collections import OrderedDict
+
+import six
+
+from .timezones import get_name, get_tz
+from ..base import BaseParser
+
+SECONDARY_INTERFACE_RE = re.compile(r'^(.+)_(\d+)$')
+
+
+def _uci_name(interface):
+    """ name of the UCI interface section of a NetJSON interface """
+    network = interface.get('network')
+    if network:
+        return network
+    return interface['name'].replace('.', '_').replace('-', '_')
+
+
+class NetworkParser(BaseParser):
+    """
+    Parses the output of ``NetworkRenderer``
+    """
+    def __init__(self, config, schema):
+        super(NetworkParser, self).__init__(config, schema)
+        definitions = schema['definitions']
+        properties = schema['properties']
+        self.interface_properties = definitions['interface_settings']['properties']
+        self.address_properties = self.interface_properties['addresses']['items']['properties']
+        self.rule_properties = properties['ip_rules']['items']['properties']
+        self.switch_properties = properties['switch']['items']['properties']
+        self.vlan_properties = self.switch_properties['vlan']['items']['properties']
+        # uci section name: (netjson interface, uci options)
+        self.interfaces = OrderedDict()
+
+    def _parse_globals(self, section):
+        self.config['globals'] = dict(section.options)
+
+    def _parse_interface(self, section):
+        options = OrderedDict(section.options)
+        if self._parse_secondary_interface(section.name, options):
+            return
+        ifname = options.pop('ifname', None)
+        interface = OrderedDict()
+        if options.get('type') == 'bridge':
+            del options['type']
+            interface['name'] = section.name
+            interface['type'] = 'bridge'
+            interface['bridge_members'] = ifname.split() if ifname else []
+            options.pop('bridge_empty', None)
+        else:
+            interface['name'] = ifname or section.name
+            interface['type'] = 'loopback' if ifname == 'lo' else 'ethernet'
+            if section.name != _uci_name(interface):
+                interface['network'] = section.name
+        if 'auto' in options:
+            interface['autostart'] = self.convert(options.pop('auto'), {'type': 'boolean'})
+        if 'enabled' in options:
+            interface['disabled'] = not self.convert(options.pop('enabled'), {'type': 'boolean'})
+        self._parse_dns(options)
+        address = self._parse_address(options)
+        # options of the address
+        for key in list(options.keys()):
+            if address and key in self.address_properties:
+                address[key] = self.convert(options.pop(key), self.address_properties[key])
+        interface.update(self.options(options, self.interface_properties))
+        if address:
+            interface['addresses'] = [address]
+        self.config.setdefault('interfaces', []).append(interface)
+        self.interfaces[section.name] = (interface, section.options)
+
+    def _parse_secondary_interface(self, name, options):
+        """
+        additional addresses of an interface are rendered in
+        sections named ``<name>_<counter>``; returns ``True``
+        if ``options`` have been added to the primary interface
+        """
+        match = SECONDARY_INTERFACE_RE.match(name)
+        if not match or match.group(1) not in self.interfaces:
+            return False
+        interface, primary = self.interfaces[match.group(1)]
+        addresses = interface.get('addresses', [])
+        ifnames = [primary.get('ifname'), 'br-{0}'.format(interface['name'])]
+        if int(match.group(2)) != len(addresses) + 1 or options.get('ifname') not in ifnames:
+            return False
+        address = self._parse_address(options)
+        if not address:
+            return False
+        # options which differ from the first section belong to the address
+        for key, value in options.items():
+            if key not in ('ifname', 'dns', 'dns_search', 'type', 'bridge_empty') \
+               and primary.get(key) != value:
+                address[key] = self.convert(value, self.address_properties.get(key, {}))
+        interface.setdefault('addresses', []).append(address)
+        return True
+
+    def _parse_address(self, options):
+        from ipaddress import ip_interface
+        proto = options.pop('proto', 'none')
+        ipaddr = options.pop('ipaddr', None)
+        ip6addr = options.pop('ip6addr', None)
+        if proto == 'none':
+            return None
+        address = OrderedDict()
+        cidr = ipaddr or ip6addr
+        # addresses exported by devices may use the netmask option
+        if ipaddr and '/' not in ipaddr and 'netmask' in options:
+            netmask = options.pop('netmask')
+            cidr = str(ip_interface(u'{0}/{1}'.format(ipaddr, netmask)))
+        if cidr and '/' in cidr:
+            address['address'], mask = cidr.split('/', 1)
+            address['mask'] = self.convert(mask, {'type': 'integer'})
+        if proto == 'dhcpv6':
+            proto = 'dhcp'
+            ip6addr = True
+        address['proto'] = proto
+        address['family'] = 'ipv6' if ip6addr else 'ipv4'
+        return address
+
+    def _parse_dns(self, options):
+        dns = options.pop('dns', None)
+        dns_search = options.pop('dns_search', None)
+        if dns and 'dns_servers' not in self.config:
+            self.config['dns_servers'] = self.convert(dns, {'type': 'array'})
+        if dns_search and 'dns_search' not in self.config:
+            self.config['dns_search'] = self.convert(dns_search, {'type': 'array'})
+
+    def _parse_route(self, section):
+        from ipaddress import ip_interface
+        options = OrderedDict(section.options)
+        # device and destination are required by the NetJSON schema
+        if 'target' not in options or 'interface' not in options:
+            return
+        # the unspecified address means "no gateway" (link scope route)
+        gateway = '::' if section.type == 'route6' else '0.0.0.0'
+        target = options.pop('target')
+        netmask = options.pop('netmask', None)
+        if netmask:
+            network = ip_interface(six.text_type('{0}/{1}'.format(target, netmask)))
+            destination = '{0}/{1}'.format(target, network.network.prefixlen)
+        else:
+            destination = target
+        route = OrderedDict([
+            ('device', options.pop('interface')),
+            ('next', options.pop('gateway', gateway)),
+            ('destination', destination)
+        ])
+        if 'metric' in options:
+            route['cost'] = self.convert(options.pop('metric'), {'type': 'integer'})
+        route.update(options)
+        self.config.setdefault('routes', []).append(route)
+
+    _parse_route6 = _parse_route
+
+    def _parse_rule(self, section):
+        rule = self.options(section.options, self.rule_properties)
+        self.config.setdefault('ip_rules', []).append(rule)
+
+    _parse_rule6 = _parse_rule
+
+    def _parse_switch(self, section):
+        switch = self.options(section.options, self.switch_properties)
+        switch['vlan'] = []
+        self.config.setdefault('switch', []).append(switch)
+
+    def _parse_switch_vlan(self, section):
+        vlan = self.options(section.options, self.vlan_properties)
+        switches = self.config.get('switch', [])
+        for switch in switches:
+            if switch.get('name') == vlan.get('device'):
+                break
+        else:
+            if not switches:
+                return
+            switch = switches[-1]
+        switch['vlan'].append(vlan)
+
+
+class SystemParser(BaseParser):
+    """
+    Parses the output of ``SystemRenderer``
+    """
+    def _parse_system(self, section):
+        properties = self.schema['properties']['general']['properties']
+        general = self.options(section.options, properties)
+        # timezones may be rendered with their zoneinfo value
+        timezone = general.get('timezone')
+        if timezone:
+            general['timezone'] = self._parse_timezone(timezone)
+        self.config['general'] = general
+
+    def _parse_timezone(self, timezone):
+        # TZ strings are converted to the first name which uses them
+        if get_tz(timezone) is not None:
+            return timezone
+        return get_name(timezone, timezone)
+
+    def _parse_timeserver(self, section):
+        properties = self.schema['properties']['ntp']['properties']
+        ntp = self.options(section.options, properties)
+        if isinstance(ntp.get('server'), six.string_types):
+            ntp['server'] = ntp['server'].split()
+        self.config['ntp'] = ntp
+
+    def _parse_led(self, section):
+        properties = self.schema['properties']['led']['items']['properties']
+        led = self.options(section.options, properties)
+        self.config.setdefault('led', []).append(led)
+
+
+class WirelessParser(BaseParser):
+    """
+    Parses the output of ``WirelessRenderer``;
+    requires the interfaces parsed by ``NetworkParser``
+    """
+    modes = {
+        'ap': 'access_point',
+        'sta': 'station',
+        'adhoc': 'adhoc',
+        'wds': 'wds',
+        'monitor': 'monitor',
+        'mesh': '802.11s'
+    }
+    wifi_options = {
+        'distance': 'ack_distance',
+        'rts': 'rts_threshold',
+        'frag': 'frag_threshold'
+    }
+    encryption_protocols = {
+        'wep-open': 'wep_open',
+        'wep-shared': 'wep_shared',
+        'psk': 'wpa_personal',
+        'psk2': 'wpa2_personal',
+        'psk-mixed': 'wpa_personal_mixed',
+        'wpa': 'wpa_enterprise',
+        'wpa2': 'wpa2_enterprise',
+        'wpa-mixed': 'wpa_enterprise_mixed'
+    }
+
+    def _parse_wifi_device(self, section):
+        properties = self.schema['properties']['radios']['items']['properties']
+        options = OrderedDict(section.options)
+        radio = OrderedDict([('name', section.name)])
+        radio['driver'] = options.pop('type', None)
+        if 'txpower' in options:
+            radio['tx_power'] = options.pop('txpower')
+        hwmode = options.pop('hwmode', '11g')
+        htmode = options.pop('htmode', 'NONE')
+        chanbw = options.pop('chanbw', None)
+        if htmode.startswith('VHT'):
+            radio['protocol'] = '802.11ac'
+            radio['channel_width'] = htmode[3:]
+        elif htmode.startswith('HT'):
+            radio['protocol'] = '802.11n'
+            radio['channel_width'] = htmode[2:]
+        else:
+            radio['protocol'] = '802.{0}'.format(hwmode)
+            radio['channel_width'] = chanbw or '20'
+        radio.update(options)
+        radio = self.options(radio, properties)
+        self.config.setdefault('radios', []).append(radio)
+
+    def _parse_wifi_iface(self, section):
+        properties = self.schema['definitions']['wireless_interface']['allOf'][2]
+        properties = properties['properties']['wireless']['properties']
+        options = OrderedDict(section.options)
+        wireless = OrderedDict()
+        wireless['radio'] = options.pop('device', None)
+        mode = options.pop('mode', 'ap')
+        wireless['mode'] = self.modes.get(mode, mode)
+        for uci_key, netjson_key in self.wifi_options.items():
+            if uci_key in options:
+                wireless[netjson_key] = options.pop(uci_key)
+        encryption = self._parse_encryption(options)
+        if encryption:
+            wireless['encryption'] = encryption
+        networks = options.pop('network', '').split()
+        wireless.update(options)
+        wireless = self.options(wireless, properties)
+        interface = self._find_interface(wireless, networks)
+        if networks and networks != [_uci_name(interface)]:
+            wireless['network'] = networks
+        interface['type'] = 'wireless'
+        interface['wireless'] = wireless
+
+    def _find_interface(self, wireless, networks):
+        """
+        returns the interface the wifi-iface belongs to; wifi-ifaces
+        are attached to their own interface unless ``wireless.network``
+        is specified, eg: to attach them to a bridge
+        """
+        interfaces = self.config.setdefault('interfaces', [])
+        candidates = [i for i in interfaces if 'wireless' not in i and i['type'] != 'bridge']
+        ifname = wireless.get('ifname')
+        for interface in candidates:
+            if ifname and interface['name'] == ifname:
+                return interface
+        for interface in candidates:
+            if networks and _uci_name(interface) == networks[0]:
+                return interface
+        # interface which is member of a bridge the wifi-iface is attached to
+        members = []
+        for interface in interfaces:
+            if interface['type'] == 'bridge' and _uci_name(interface) in networks:
+                members += interface['bridge_members']
+        for interface in candidates:
+            if interface['name'] in members and not interface.get('addresses'):
+                return interface
+        name = ifname or (networks[0] if networks else 'wlan0')
+        interface = OrderedDict([('name', name), ('type', 'wireless')])
+        interfaces.append(interface)
+        return interface
+
+    def _parse_encryption(self, options):
+        value = options.pop('encryption', None)
+        if not value:
+            return None
+        parts = value.split('+')
+        protocol = self.encryption_protocols.get(parts[0], parts[0])
+        encryption = OrderedDict([('protocol', protocol)])
+        if protocol.startswith('wep'):
+            options.pop('key', None)
+            key = options.pop('key1', '')
+            if protocol == 'wep_open' and key.startswith('s:'):
+                key = key[2:]
+            encryption['key'] = key
+        else:
+            encryption['key'] = options.pop('key', '')
+        if len(parts) > 1:
+            encryption['ciphers'] = parts[1:]
+        return encryption
+
+
+class DefaultParser(BaseParser):
+    """
+    Parses custom packages, inverse of ``DefaultRenderer``
+    """
+    def __init__(self, config, schema, package):
+        super(DefaultParser, self).__init__(config, schema)
+        self.package = package
+
+    def parse(self, sections):
+        blocks = self.config.setdefault(self.package, [])
+        for section in sections:
+            block = OrderedDict([('config_name', section.type)])
+            if section.name is not None:
+                block['config_value'] = section.name
+            block.update(section.options)
+            blocks.append(block)
+
+
+def iter_archive(source):
+    """
+    Yields ``(path, contents, mode)`` for each file contained in ``source``,
+    reading one member at a time; ``mode`` is ``None`` if unknown.
+
+    A directory without subdirectories is treated as a copy of ``/etc/config``.
+
+    :param source: path of a directory or of an archive (zip or tar),
+                   or file object of an archive
+    """
+    import tarfile
+    import zipfile
+    if isinstance(source, six.string_types) and os.path.isdir(source):
+        for path, contents, mode in _iter_directory(source):
+            yield path, contents, mode
+        return
+    if zipfile.is_zipfile(source):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        archive = zipfile.ZipFile(source)
+        try:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if info.filename.endswith('/'):
+                    continue
+                mode = (info.external_attr >> 16) & 0o777 or None
+                yield info.filename, archive.read(info), mode
+        finally:
+            archive.close()
+        return
+    if hasattr(source, 'seek'):
+        source.seek(0)
+        archive = tarfile.open(fileobj=source, mode='r')
+    else:
+        archive = tarfile.open(source, mode='r')
+    try:
+        for member in archive:
+            if member.isfile():
+                yield member.name, archive.extractfile(member).read(), member.mode & 0o777
+    finally:
+        archive.close()
+
+
+def _iter_directory(directory):
+    # a flat directory is a copy of /etc/config, containing only UCI packages
+    flat = not any(os.path.isdir(os.path.join(directory, name))
+                   for name in os.listdir(directory))
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            full_path = os.path.join(dirpath, filename)
+            path = os.path.relpath(full_path, directory).replace(os.sep, '/')
+            if flat:
+                path = 'etc/config/{0}'.format(path)
+            with open(full_path, 'rb') as f:
+                contents = f.read()
+            yield path, contents, os.stat(full_path).st_mode & 0o777
@@ -1,8 +1,10 @@
 import json
+from collections import OrderedDict
 from copy import deepcopy
-from ipaddress import ip_interface, ip_network
 
-from .timezones import timezones
+import six
+
+from .timezones import get_tz
 from ..base import BaseRenderer
 from ...utils import sorted_dict
 
@@ -125,6 +127,7 @@ class NetworkRenderer(BaseRenderer):
         return uci_interfaces
 
     def _get_routes(self):
+        from ipaddress import ip_interface
         routes = self.config.get('routes', [])
         # results container
         uci_routes = []
@@ -157,6 +160,7 @@ class NetworkRenderer(BaseRenderer):
         return uci_routes
 
     def _get_ip_rules(self):
+        from ipaddress import ip_network
         rules = self.config.get('ip_rules', [])
         uci_rules = []
         for rule in rules:
@@ -193,7 +197,33 @@ class NetworkRenderer(BaseRenderer):
             uci_switch['vlan'] = [sorted_dict(vlan) for vlan in uci_switch['vlan']]
             uci_switches.append(uci_switch)
         return uci_switches
-    
+
+    def emit(self, writer, context):
+        if context['globals']:
+            writer.section('globals', 'globals')
+            writer.options(context['globals'])
+            writer.end_section()
+        for interface in context['interfaces']:
+            writer.section('interface', interface['name'])
+            writer.options(interface, skip=['name'])
+            writer.end_section()
+        for route in context['routes']:
+            name = route['name'] if route['version'] == 'route' else None
+            writer.section(route['version'], name)
+            writer.options(route, skip=['name', 'version'])
+            writer.end_section()
+        for rule in context['ip_rules']:
+            writer.section(rule['block_name'])
+            writer.options(rule, skip=['block_name'])
+            writer.end_section()
+        for switch in context['switches']:
+            writer.section('switch')
+            writer.options(switch, skip=['vlan'])
+            writer.end_section()
+            for vlan in switch['vlan']:
+                writer.section('switch_vlan')
+                writer.options(vlan)
+                writer.end_section()
 
 
 class SystemRenderer(BaseRenderer):
@@ -205,11 +235,9 @@ class SystemRenderer(BaseRenderer):
         general = self.config.get('general', {}).copy()
         if general:
             timezone_human = general.get('timezone', 'Coordinated Universal Time')
-            #timezone_value = timezones[timezone_human]
             general.update({
                 'hostname': general.get('hostname', 'OpenWRT'),
-                #'timezone': timezone_value,
-                'timezone': timezone_human,
+                'timezone': get_tz(timezone_human, timezone_human),
             })
         return sorted_dict(general)
 
@@ -222,6 +250,23 @@ class SystemRenderer(BaseRenderer):
             uci_leds.append(sorted_dict(led))
         return uci_leds
 
+    def emit(self, writer, context):
+        if context['system']:
+            writer.section('system')
+            writer.options(context['system'])
+            writer.end_section()
+        ntp = context['ntp']
+        if ntp:
+            writer.section('timeserver', 'ntp')
+            if ntp.get('server'):
+                writer.list('server', ntp['server'])
+            writer.options(ntp, skip=['server'])
+            writer.end_section()
+        for led in context['leds']:
+            writer.section('led', 'led_{0}'.format(led['name'].lower()))
+            writer.options(led)
+            writer.end_section()
+
 
 class WirelessRenderer(BaseRenderer):
     """
@@ -368,6 +413,16 @@ class WirelessRenderer(BaseRenderer):
             uci['encryption'] += '+{0}'.format('+'.join(encryption['ciphers']))
         return uci
 
+    def emit(self, writer, context):
+        for radio in context['radios']:
+            writer.section('wifi-device', radio['name'])
+            writer.options(radio, skip=['name'])
+            writer.end_section()
+        for wifi_interface in context['wifi_interfaces']:
+            writer.section('wifi-iface')
+            writer.options(wifi_interface)
+            writer.end_section()
+
 
 class DefaultRenderer(BaseRenderer):
     """
@@ -401,3 +456,42 @@ class DefaultRenderer(BaseRenderer):
                 custom_packages[key] = block_list
         # sort custom packages
         return sorted_dict(custom_packages)
+
+    def render_packages(self):
+        packages = OrderedDict()
+        with self.backend._measure('{0}.get_context'.format(self.__class__.__name__)):
+            custom_packages = self._get_custom_packages()
+        for package, blocks in custom_packages.items():
+            context = {'config_blocks': blocks}
+            packages[package] = self.render_contents(context)
+        return packages
+
+    def emit(self, writer, context):
+        for block in context['config_blocks']:
+            skip = ['config_name']
+            config_value = block.get('config_value')
+            if config_value:
+                skip.append('config_value')
+            writer.section(block['config_name'], config_value or None)
+            for key, value in block.items():
+                if key in skip or value in ['', None]:
+                    continue
+                if _is_list(value):
+                    writer.list(key, value)
+                else:
+                    writer.option(key, value)
+            writer.end_section()
+
+
+def _is_list(value):
+    """
+    equivalent of ``value is not string and value is iterable``
+    in the jinja2 templates
+    """
+    if isinstance(value, six.string_types):
+        return False
+    try:
+        iter(value)
+    except TypeError:
+        return False
+    return True
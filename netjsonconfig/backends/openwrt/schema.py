@@ -1,7 +1,6 @@
 """
 OpenWrt specific JSON-Schema definition
 """
-from .timezones import timezones
 from ...schema import schema as default_schema
 from ...utils import merge_config
 
@@ -70,8 +69,8 @@ schema = merge_config(default_schema, {
             "properties": {
                 "timezone": {
                     "type": "string",
-                    "default": "Coordinated Universal Time"
-                    #"enum": list(timezones.keys())
+                    "default": "Coordinated Universal Time",
+                    "format": "timezone"
                 }
             }
         },
@@ -304,7 +303,8 @@ schema = merge_config(default_schema, {
                     },
                     "mode": {
                         "type": "string",
-                        "maxLength": 4
+                        "maxLength": 4,
+                        "pattern": "^[0-7]{3,4}$"
                     }
                 }
             }
@@ -0,0 +1,135 @@
+"""
+Fleet rendering: processes many device configurations
+with the same backend and templates across a process pool
+"""
+from collections import namedtuple
+from multiprocessing import Pool, cpu_count
+
+from .utils import merge_config
+
+RenderResult = namedtuple('RenderResult', ['index', 'output', 'error'])
+RenderResult.__doc__ = """
+Outcome of a single device of a fleet render:
+
+* ``index``: position of the device config in the input sequence
+* ``output``: return value of the backend method, ``None`` on error
+* ``error``: exception raised while processing the item, ``None`` on success;
+  usually ``ValidationError`` or ``TypeError`` (``ValueError``,
+  ``EnvironmentError`` or archive errors for ``parse_many``)
+"""
+
+# per-process state, filled by _init_worker
+_worker = {}
+
+
+def _init_worker(backend_class, templates, method, kwargs, copy=False):
+    """
+    initializes a worker: templates are loaded and merged
+    only once and reused for every device handled by the worker;
+    configs received by worker processes are unpickled copies,
+    so they don't need to be copied again by the backend
+    """
+    _worker['backend_class'] = backend_class
+    _worker['base'] = backend_class._merge_templates(templates)
+    _worker['method'] = method
+    _worker['kwargs'] = kwargs
+    _worker['copy'] = copy
+
+
+def _process(item):
+    """ processes a single ``(index, config)`` item """
+    index, config = item
+    backend_class = _worker['backend_class']
+    base = _worker['base']
+    copy = _worker['copy']
+    try:
+        if base:
+            # the base is merged directly, without going through the
+            # template cache; it's shared by the devices of the worker,
+            # the backend copies what it modifies (see ``_copy_config``)
+            config = merge_config(base, backend_class._load(config), copy=False)
+            copy = True
+        backend = backend_class(config, copy=copy)
+        output = getattr(backend, _worker['method'])(**_worker['kwargs'])
+    # any failure is reported for the device, a configuration which
+    # makes a renderer fail must not abort the rest of the batch
+    except Exception as e:
+        return RenderResult(index, None, e)
+    return RenderResult(index, output, None)
+
+
+def render_many(backend_class, configs, templates=[], workers=None,
+                method='render', ordered=True, chunksize=1, **kwargs):
+    """
+    Runs ``method`` of ``backend_class`` on each item of ``configs``.
+
+    :param backend_class: backend class, eg: ``OpenWrt``
+    :param configs: iterable of configuration dictionaries or NetJSON strings
+    :param templates: ``list`` of templates shared by all the devices
+    :param workers: number of worker processes, defaults to the number of CPUs;
+                    ``1`` processes the configurations in the current process
+    :param method: backend method to call, defaults to ``render``
+    :param ordered: if ``True`` (default) results are yielded in input order,
+                    otherwise as soon as they are completed
+    :param chunksize: number of configurations sent to a worker at once
+    :param kwargs: additional keyword arguments passed to ``method``
+    :returns: generator of ``RenderResult`` instances
+    :raises TypeError: if ``templates`` is not of type ``list``
+    """
+    if not isinstance(templates, list):
+        raise TypeError('templates argument must be an instance of list')
+    initargs = (backend_class, templates, method, kwargs)
+    return _run(_process, _init_worker, initargs, configs, workers, ordered, chunksize)
+
+
+def _init_parse_worker(backend_class, copy=False):
+    _worker['backend_class'] = backend_class
+
+
+def _parse(item):
+    """ parses a single ``(index, source)`` item """
+    index, source = item
+    try:
+        output = _worker['backend_class'].parse(source)
+    # any failure is reported for the source, a malformed
+    # archive must not abort the rest of the batch
+    except Exception as e:
+        return RenderResult(index, None, e)
+    return RenderResult(index, output, None)
+
+
+def parse_many(backend_class, sources, workers=None, ordered=True, chunksize=1):
+    """
+    Runs the ``parse`` class method of ``backend_class`` on each
+    item of ``sources``, the inverse of ``render_many``.
+
+    :param backend_class: backend class, eg: ``OpenWrt``
+    :param sources: iterable of UCI strings, archive or directory paths
+    :param workers: number of worker processes, defaults to the number of CPUs;
+                    ``1`` parses the sources in the current process
+    :param ordered: if ``True`` (default) results are yielded in input order,
+                    otherwise as soon as they are completed
+    :param chunksize: number of sources sent to a worker at once
+    :returns: generator of ``RenderResult`` instances
+    """
+    return _run(_parse, _init_parse_worker, (backend_class,),
+                sources, workers, ordered, chunksize)
+
+
+def _run(function, initializer, initargs, items, workers, ordered, chunksize):
+    workers = workers or cpu_count()
+    items = enumerate(items)
+    # no pool needed, avoid the overhead of spawning processes
+    if workers == 1:
+        initializer(*initargs, copy=True)
+        for item in items:
+            yield function(item)
+        return
+    pool = Pool(workers, initializer=initializer, initargs=initargs)
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for result in imap(function, items, chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
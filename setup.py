@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import sys
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Command
+from setuptools.command.build_py import build_py
+from distutils.errors import DistutilsSetupError
 
 # avoid ImportError
 sys.path.insert(0, 'netjsonconfig')
@@ -39,6 +41,43 @@ def get_install_requires():
         requirements.append('py2-ipaddress')
     return requirements
 
+def compile_templates():
+    """
+    precompiles jinja2 templates into python modules;
+    jinja2 is declared as build requirement in pyproject.toml,
+    fails loudly if it's missing instead of shipping a package
+    without precompiled templates
+    """
+    try:
+        from netjsonconfig.backends.jinja import compile_all
+    except ImportError as e:
+        raise DistutilsSetupError('cannot precompile templates ({0}), '
+                                  'install the build requirements listed '
+                                  'in pyproject.toml first'.format(e))
+    for directory in compile_all():
+        print('templates compiled in {0}'.format(directory))
+
+
+class BuildTemplatesCommand(Command):
+    description = 'precompile jinja2 templates into python modules'
+    user_options = []
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        compile_templates()
+
+
+class BuildPyCommand(build_py):
+    def run(self):
+        compile_templates()
+        build_py.run(self)
+
+
 description = 'Netjsonconfig is a python library that converts NetJSON DeviceConfiguration '\
               'objects into real router configurations that can be installed on systems like '\
               'OpenWRT or OpenWisp Firmware.'
@@ -67,6 +106,13 @@ setup(
         'Topic :: System :: Networking',
     ],
     install_requires=get_install_requires(),
+    extras_require={
+        'xxhash': ['xxhash']
+    },
     test_suite='nose.collector',
     scripts=['bin/netjsonconfig'],
+    cmdclass={
+        'build_py': BuildPyCommand,
+        'build_templates': BuildTemplatesCommand
+    },
 )
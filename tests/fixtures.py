@@ -0,0 +1,41 @@
+"""
+collects the configurations used in the test suites of the backends
+"""
+import os
+import unittest
+from copy import deepcopy
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# True while the suites are running, tests which collect
+# configurations are part of the suites themselves
+_collecting = []
+
+
+def collect_configs(backend_class, method, suites):
+    """
+    runs the test ``suites`` (directory names inside ``tests/``)
+    and returns ``(backend class, config)`` tuples for each call
+    of ``backend_class.method`` (subclasses included)
+    """
+    recorded = []
+    if _collecting:
+        return recorded
+    original = getattr(backend_class, method)
+
+    def wrapper(self, *args, **kwargs):
+        recorded.append((type(self), deepcopy(self.config)))
+        return original(self, *args, **kwargs)
+
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for name in suites:
+        suite.addTests(loader.discover(os.path.join(TESTS_DIR, name),
+                                       top_level_dir=os.path.dirname(TESTS_DIR)))
+    setattr(backend_class, method, wrapper)
+    _collecting.append(True)
+    try:
+        suite.run(unittest.TestResult())
+    finally:
+        _collecting.pop()
+        setattr(backend_class, method, original)
+    return recorded
@@ -1,6 +1,7 @@
+import json
 import os
 import unittest
-import tarfile
+import zipfile
 from copy import deepcopy
 from io import BytesIO
 from time import sleep
@@ -121,9 +122,9 @@ class TestBackend(unittest.TestCase, _TabsMixin):
                 "hostname": "openwisp_test"
             }
         })
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        system = tar.getmember('uci/system.conf')
-        contents = tar.extractfile(system).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        system = zip.getinfo('uci/system.conf')
+        contents = zip.read(system).decode()
         expected = self._tabs("""package system
 
 config system
@@ -131,7 +132,7 @@ config system
     option timezone 'UTC'
 """)
         self.assertEqual(contents, expected)
-        tar.close()
+        zip.close()
 
     def test_hostname_required(self):
         o = OpenWisp({
@@ -145,53 +146,53 @@ config system
     def test_install_script(self):
         config = deepcopy(self.config)
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        install = tar.getmember('install.sh')
-        contents = tar.extractfile(install).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        install = zip.getinfo('install.sh')
+        contents = zip.read(install).decode()
         self.assertIn('openvpn --mktun --dev 2693 --dev-type tap', contents)
         self.assertIn('ifup br-serv', contents)
         self.assertIn('$(ip address show dev br-serv | grep 192.168.1.2)', contents)
         self.assertIn('wifi up radio0', contents)
         self.assertNotIn('Starting Cron', contents)
         # esure is executable
-        self.assertEqual(install.mode, 493)
-        tar.close()
+        self.assertEqual((install.external_attr >> 16) & 0o777, 493)
+        zip.close()
 
     def test_ensure_tun_vpn_ignored(self):
         config = deepcopy(self.config)
         config['openvpn'][0]['dev_type'] = 'tun'
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        install = tar.getmember('install.sh')
-        contents = tar.extractfile(install).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        install = zip.getinfo('install.sh')
+        contents = zip.read(install).decode()
         self.assertNotIn('openvpn --mktun --dev 2693 --dev-type tap', contents)
-        tar.close()
+        zip.close()
 
     def test_uninstall_script(self):
         config = deepcopy(self.config)
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        uninstall = tar.getmember('uninstall.sh')
-        contents = tar.extractfile(uninstall).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        uninstall = zip.getinfo('uninstall.sh')
+        contents = zip.read(uninstall).decode()
         self.assertIn('openvpn --rmtun --dev 2693 --dev-type tap', contents)
         self.assertNotIn('Stopping Cron', contents)
         # esure is executable
-        self.assertEqual(uninstall.mode, 493)
-        tar.close()
+        self.assertEqual((uninstall.external_attr >> 16) & 0o777, 493)
+        zip.close()
 
     def test_up_and_down_scripts(self):
         config = deepcopy(self.config)
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        up = tar.getmember('openvpn/vpn_2693_script_up.sh')
-        contents = tar.extractfile(up).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        up = zip.getinfo('openvpn/vpn_2693_script_up.sh')
+        contents = zip.read(up).decode()
         self.assertIn('rm -f /tmp/will_reboot', contents)
-        self.assertEqual(up.mode, 493)  # esure is executable
-        down = tar.getmember('openvpn/vpn_2693_script_down.sh')
-        contents = tar.extractfile(down).read().decode()
+        self.assertEqual((up.external_attr >> 16) & 0o777, 493)  # esure is executable
+        down = zip.getinfo('openvpn/vpn_2693_script_down.sh')
+        contents = zip.read(down).decode()
         self.assertIn('REBOOT_DELAY', contents)
-        self.assertEqual(down.mode, 493)  # esure is executable
-        tar.close()
+        self.assertEqual((down.external_attr >> 16) & 0o777, 493)  # esure is executable
+        zip.close()
 
     def test_double_generation(self):
         o = OpenWisp(self.config)
@@ -205,12 +206,32 @@ config system
         output = o.render()
         self.assertIn("option disabled '0'", output)
 
+    def test_config_not_modified(self):
+        config = deepcopy(self.config)
+        o = OpenWisp(config)
+        o.validate()
+        o.render()
+        self.assertEqual(config, self.config)
+        # unless ownership is transferred
+        o = OpenWisp(config, copy=False)
+        o.validate()
+        self.assertIs(config['radios'][0]['disabled'], False)
+
+    def test_radios_not_shared(self):
+        template = {'radios': deepcopy(self.config['radios'])}
+        o = OpenWisp({'general': {'hostname': 'radios'}}, templates=[template])
+        o.validate()
+        self.assertFalse(o.config['radios'][0]['disabled'])
+        self.assertNotIn('disabled', template['radios'][0])
+        cached = OpenWisp._merge_templates([template])
+        self.assertNotIn('disabled', cached['radios'][0])
+
     def test_tc_script(self):
         config = deepcopy(self.config)
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        tc = tar.getmember('tc_script.sh')
-        contents = tar.extractfile(tc).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        tc = zip.getinfo('tc_script.sh')
+        contents = zip.read(tc).decode()
         self.assertIn('tc qdisc del dev tap0 root', contents)
         self.assertIn('tc qdisc del dev tap0 ingress', contents)
         self.assertIn('tc qdisc add dev tap0 root handle 1: htb default 2', contents)
@@ -218,7 +239,7 @@ config system
         self.assertIn('tc class add dev tap0 parent 1:1 classid 1:2 htb rate 512kbit ceil 1024kbit', contents)
         self.assertIn('tc qdisc add dev tap0 ingress', contents)
         self.assertIn('tc filter add dev tap0 parent ffff: preference 0 u32 match u32 0x0 0x0 police rate 2048kbit burst 383k drop flowid :1', contents)
-        tar.close()
+        zip.close()
 
     def test_cron(self):
         config = deepcopy(self.config)
@@ -229,14 +250,14 @@ config system
             }
         ]
         o = OpenWisp(config)
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        install = tar.getmember('install.sh')
-        contents = tar.extractfile(install).read().decode()
+        zip = zipfile.ZipFile(o.generate())
+        install = zip.getinfo('install.sh')
+        contents = zip.read(install).decode()
         self.assertIn('Starting Cron', contents)
-        uninstall = tar.getmember('uninstall.sh')
-        contents = tar.extractfile(uninstall).read().decode()
+        uninstall = zip.getinfo('uninstall.sh')
+        contents = zip.read(uninstall).decode()
         self.assertIn('Stopping Cron', contents)
-        tar.close()
+        zip.close()
 
     def test_checksum(self):
         """ ensures checksum of same config doesn't change """
@@ -246,3 +267,37 @@ config system
         sleep(1)
         checksum2 = md5(o.generate().getvalue()).hexdigest()
         self.assertEqual(checksum1, checksum2)
+
+    def test_manifest(self):
+        o = OpenWisp({"general": {"hostname": "test"}})
+        zip = zipfile.ZipFile(o.generate(manifest=True))
+        self.assertEqual(zip.namelist()[-1], 'manifest.json')
+        manifest = json.loads(zip.read('manifest.json').decode())
+        paths = [member['path'] for member in manifest['members']]
+        self.assertEqual(paths, ['install.sh', 'tc_script.sh', 'uci/system.conf', 'uninstall.sh'])
+        self.assertEqual(manifest, o.get_manifest())
+        zip.close()
+        self.assertNotIn('files', OpenWisp.parse(o.generate(manifest=True)))
+
+    def test_generate_delta(self):
+        previous = {"general": {"hostname": "test"},
+                    "files": [{"path": "/etc/a", "contents": "a"}]}
+        o = OpenWisp({"general": {"hostname": "test"},
+                      "dropbear": [{"config_name": "dropbear", "Port": "22"}]})
+        zip = zipfile.ZipFile(o.generate_delta(previous))
+        # the generated scripts are always included
+        self.assertEqual(zip.namelist(), ['install.sh', 'tc_script.sh',
+                                          'uci/dropbear.conf', 'uninstall.sh', 'removed'])
+        self.assertEqual(zip.read('removed'), b'etc/a\n')
+        zip.close()
+
+    def test_fingerprint_stable(self):
+        o = OpenWisp(deepcopy(self.config))
+        fingerprint = o.fingerprint()
+        o.validate()
+        self.assertEqual(o.fingerprint(), fingerprint)
+        o.generate()
+        self.assertEqual(o.fingerprint(), fingerprint)
+        self.assertEqual(OpenWisp(deepcopy(self.config)).fingerprint(), fingerprint)
+        # the generated scripts are not added to the configuration
+        self.assertEqual(o.config['files'], self.config['files'])
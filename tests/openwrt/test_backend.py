@@ -1,14 +1,17 @@
 import os
 import json
+import hashlib
 import unittest
-import tarfile
+import six
+import zipfile
 from io import BytesIO
+from copy import deepcopy
 from time import sleep
 from hashlib import md5
 
 from netjsonconfig import OpenWrt
 from netjsonconfig.exceptions import ValidationError
-from netjsonconfig.utils import _TabsMixin
+from netjsonconfig.utils import _TabsMixin, Timings
 
 
 class TestBackend(unittest.TestCase, _TabsMixin):
@@ -21,6 +24,39 @@ class TestBackend(unittest.TestCase, _TabsMixin):
         o.validate()
         self.assertDictEqual(config, {'interfaces': []})
 
+    def test_config_not_modified(self):
+        config = {
+            "general": {"hostname": "not_modified"},
+            "interfaces": [{"name": "eth0", "type": "ethernet"}],
+            "files": [{"path": "/etc/config.txt", "contents": "config"}]
+        }
+        template = {
+            "interfaces": [{"name": "lo", "type": "loopback"}],
+            "files": [{"path": "/etc/template.txt", "contents": "template"}]
+        }
+        original_config = deepcopy(config)
+        original_template = deepcopy(template)
+        for engine in ['jinja2', 'direct']:
+            o = OpenWrt(config, templates=[template], engine=engine)
+            o.validate()
+            o.render()
+            o.render_packages()
+            o.json()
+            o.config['type'] = 'CHANGED'
+            self.assertEqual(config, original_config)
+            self.assertEqual(template, original_template)
+
+    def test_config_ownership(self):
+        config = {"general": {"hostname": "owned"}}
+        o = OpenWrt(config, copy=False)
+        self.assertIs(o.config, config)
+        self.assertEqual(config['type'], 'DeviceConfiguration')
+        # templates are never modified
+        template = {"general": {"timezone": "UTC"}}
+        o = OpenWrt({"general": {}}, templates=[template], copy=False)
+        o.config['general']['hostname'] = 'owned'
+        self.assertEqual(template, {"general": {"timezone": "UTC"}})
+
     def test_json_method(self):
         config = {
             "type": "DeviceConfiguration",
@@ -61,6 +97,16 @@ class TestBackend(unittest.TestCase, _TabsMixin):
         else:
             self.fail('ValidationError not raised')
 
+    def test_validator_cache(self):
+        validator = OpenWrt.get_validator()
+        self.assertIs(OpenWrt.get_validator(), validator)
+        OpenWrt({'type': 'DeviceConfiguration'}).validate()
+        self.assertIs(OpenWrt.get_validator(), validator)
+        # subclasses with different schema have their own validator
+        from netjsonconfig import OpenWisp
+        self.assertIsNot(OpenWisp.get_validator(), validator)
+        self.assertIs(OpenWisp.get_validator().schema, OpenWisp.schema)
+
     def test_find_bridge_skip_error(self):
         o = OpenWrt({'interfaces': ['WRONG']})
         with self.assertRaises(ValidationError):
@@ -150,21 +196,20 @@ class TestBackend(unittest.TestCase, _TabsMixin):
                 }
             ]
         })
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        self.assertEqual(len(tar.getmembers()), 2)
+        zip = zipfile.ZipFile(o.generate())
+        self.assertEqual(len(zip.namelist()), 2)
         # network
-        network = tar.getmember('etc/config/network')
-        contents = tar.extractfile(network).read().decode()
+        network = zip.getinfo('etc/config/network')
+        contents = zip.read(network).decode()
         expected = self._tabs("""config interface 'wlan0'
     option ifname 'wlan0'
     option ipaddr '192.168.1.1/24'
     option proto 'static'
-
 """)
         self.assertEqual(contents, expected)
         # wireless
-        wireless = tar.getmember('etc/config/wireless')
-        contents = tar.extractfile(wireless).read().decode()
+        wireless = zip.getinfo('etc/config/wireless')
+        contents = zip.read(wireless).decode()
         expected = self._tabs("""config wifi-device 'radio0'
     option channel '3'
     option htmode 'HT20'
@@ -176,13 +221,151 @@ class TestBackend(unittest.TestCase, _TabsMixin):
 config wifi-iface
     option device 'radio0'
     option hidden '1'
-    option ifname 'wlan0'
     option mode 'ap'
     option network 'wlan0'
     option ssid 'MyWifiAP'
 """)
         self.assertEqual(contents, expected)
-        tar.close()
+        zip.close()
+
+    def test_generate_fileobj(self):
+        class Stream(object):
+            """ not seekable, like an HTTP response """
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(bytes(data))
+                return len(data)
+
+            def flush(self):
+                pass
+        o = OpenWrt({
+            "general": {"hostname": "stream"},
+            "files": [{"path": "/etc/large", "contents": "x" * 100000}]
+        })
+        stream = Stream()
+        self.assertIs(o.generate(fileobj=stream), stream)
+        zip = zipfile.ZipFile(BytesIO(b''.join(stream.chunks)))
+        self.assertEqual(zip.namelist(), ['etc/config/system', 'etc/large'])
+        self.assertEqual(zip.read('etc/large'), b'x' * 100000)
+        zip.close()
+        # nothing is written to the working directory
+        self.assertFalse(os.path.exists('zipfile_writestr.zip'))
+        stored = len(o.generate(compresslevel=0).getvalue())
+        compressed = len(o.generate(compresslevel=9).getvalue())
+        self.assertTrue(compressed < stored)
+
+    def test_reproducible_archive(self):
+        config = {
+            "general": {"hostname": "reproducible"},
+            "firewall": [{"config_name": "rule", "src": "wan"}],
+            "dropbear": [{"config_name": "dropbear", "Port": "22"}],
+            "files": [
+                {"path": "/etc/b", "contents": "b", "mode": "0600"},
+                {"path": "/etc/a", "contents": "a", "mode": "0755"}
+            ]
+        }
+        archive = OpenWrt(config).generate().getvalue()
+        # same configuration, different order of packages and files
+        same = deepcopy(config)
+        same['files'].reverse()
+        same = json.dumps(same, sort_keys=True)
+        self.assertEqual(OpenWrt(same).generate().getvalue(), archive)
+        zip = zipfile.ZipFile(BytesIO(archive))
+        self.assertEqual(zip.namelist(), sorted(zip.namelist()))
+        info = zip.getinfo('etc/a')
+        self.assertEqual(info.date_time, (1980, 1, 1, 0, 0, 0))
+        self.assertEqual(info.create_system, 3)
+        self.assertEqual((info.external_attr >> 16) & 0o777, 0o755)
+        self.assertEqual((zip.getinfo('etc/b').external_attr >> 16) & 0o777, 0o600)
+        zip.close()
+        checksum = OpenWrt(config).checksum()
+        self.assertEqual(checksum, hashlib.sha256(archive).hexdigest())
+        self.assertEqual(OpenWrt(same).checksum(), checksum)
+        self.assertNotEqual(OpenWrt({"general": {"hostname": "other"}}).checksum(), checksum)
+        self.assertEqual(len(OpenWrt(config).checksum(algorithm='md5')), 32)
+
+    def test_manifest(self):
+        config = {
+            "general": {"hostname": "manifest"},
+            "files": [{"path": "/etc/crontabs/root", "contents": ["* * * * * a", "b"], "mode": "0600"}]
+        }
+        o = OpenWrt(config)
+        system = o.render_packages()['system'].encode('utf-8')
+        self.assertEqual(o.get_manifest(), {"members": [
+            {
+                "path": "etc/config/system",
+                "mode": "644",
+                "size": len(system),
+                "sha256": hashlib.sha256(system).hexdigest()
+            },
+            {
+                "path": "etc/crontabs/root",
+                "mode": "0600",
+                "size": 13,
+                "sha256": hashlib.sha256(b"* * * * * a\nb").hexdigest()
+            }
+        ]})
+        zip = zipfile.ZipFile(o.generate())
+        self.assertNotIn(OpenWrt.manifest_member, zip.namelist())
+        zip = zipfile.ZipFile(o.generate(manifest=True))
+        self.assertEqual(zip.namelist(), ['etc/config/system',
+                                          'etc/crontabs/root',
+                                          'etc/netjsonconfig/manifest.json'])
+        manifest = json.loads(zip.read('etc/netjsonconfig/manifest.json').decode())
+        self.assertEqual(manifest, o.get_manifest())
+        zip.close()
+        # the manifest is not parsed as an additional file
+        parsed = OpenWrt.parse(o.generate(manifest=True))
+        self.assertEqual([f['path'] for f in parsed['files']], ['/etc/crontabs/root'])
+        self.assertNotEqual(o.checksum(manifest=True), o.checksum())
+
+    def test_generate_delta(self):
+        previous = {
+            "general": {"hostname": "delta"},
+            "dropbear": [{"config_name": "dropbear", "Port": "22"}],
+            "files": [
+                {"path": "/etc/a", "contents": "a"},
+                {"path": "/etc/b", "contents": "b"},
+                {"path": "/etc/c", "contents": "c", "mode": "0600"}
+            ]
+        }
+        config = deepcopy(previous)
+        config['dropbear'][0]['Port'] = '2222'
+        config['files'] = [
+            {"path": "/etc/a", "contents": "a"},
+            {"path": "/etc/c", "contents": "c", "mode": "0700"},
+            {"path": "/etc/d", "contents": "d"}
+        ]
+        o = OpenWrt(config)
+        manifest = OpenWrt(previous).get_manifest()
+        for value in (previous, json.dumps(previous), OpenWrt(previous),
+                      manifest, json.dumps(manifest)):
+            zip = zipfile.ZipFile(o.generate_delta(value))
+            self.assertEqual(zip.namelist(), ['etc/c',
+                                              'etc/config/dropbear',
+                                              'etc/d',
+                                              'etc/netjsonconfig/removed'])
+            self.assertEqual(zip.read('etc/netjsonconfig/removed'), b'etc/b\n')
+            self.assertEqual(zip.read('etc/config/dropbear'),
+                             o.render_packages()['dropbear'].encode())
+            zip.close()
+        # nothing changed
+        zip = zipfile.ZipFile(o.generate_delta(o, manifest=True))
+        self.assertEqual(zip.namelist(), ['etc/netjsonconfig/removed',
+                                          'etc/netjsonconfig/manifest.json'])
+        self.assertEqual(zip.read('etc/netjsonconfig/removed'), b'')
+        # the manifest lists all the members of the configuration
+        manifest = json.loads(zip.read('etc/netjsonconfig/manifest.json').decode())
+        self.assertEqual(manifest, o.get_manifest())
+        zip.close()
+        output = BytesIO()
+        self.assertIs(o.generate_delta(previous, fileobj=output), output)
+        self.assertEqual(output.getvalue(), o.generate_delta(previous).getvalue())
+        # the list of removed members is not parsed as an additional file
+        parsed = OpenWrt.parse(o.generate_delta(previous))
+        self.assertEqual([f['path'] for f in parsed['files']], ['/etc/c', '/etc/d'])
 
     def test_write(self):
         o = OpenWrt({
@@ -191,10 +374,10 @@ config wifi-iface
             }
         })
         o.write(name='test', path='/tmp')
-        tar = tarfile.open('/tmp/test.tar.gz', mode='r')
-        self.assertEqual(len(tar.getmembers()), 1)
-        tar.close()
-        os.remove('/tmp/test.tar.gz')
+        zip = zipfile.ZipFile('/tmp/test.zip')
+        self.assertEqual(len(zip.namelist()), 1)
+        zip.close()
+        os.remove('/tmp/test.zip')
 
     def test_templates_type_error(self):
         config = {
@@ -279,6 +462,61 @@ config wifi-iface
         self.assertEqual(o.config['interfaces'][0]['name'], 'lo')
         self.assertEqual(o.config['interfaces'][1]['name'], 'wlan0')
 
+    def test_template_cache(self):
+        template = {
+            "general": {"timezone": "UTC"},
+            "files": [{"path": "/etc/template", "contents": "template"}]
+        }
+        OpenWrt.template_cache.clear()
+        # dictionaries are merged each time, they are not cached
+        a = OpenWrt({"general": {"hostname": "a"}}, templates=[template])
+        self.assertEqual(OpenWrt.template_cache.stats()['misses'], 0)
+        # JSON strings are cached, keyed by their contents
+        b = OpenWrt({"general": {"hostname": "b"}}, templates=[json.dumps(template)])
+        # equal string, different object
+        c = OpenWrt({"general": {"hostname": "c"}}, templates=[json.dumps(template)])
+        stats = OpenWrt.template_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(a.config['general'], {"hostname": "a", "timezone": "UTC"})
+        self.assertEqual(c.config['general'], {"hostname": "c", "timezone": "UTC"})
+        # instances do not share modified data with the cache
+        a.config['files'] = []
+        a.config['general']['timezone'] = 'CHANGED'
+        self.assertEqual(len(c.config['files']), 1)
+        self.assertEqual(b.config['general']['timezone'], 'UTC')
+        d = OpenWrt({}, templates=[template])
+        self.assertEqual(d.config['files'], template['files'])
+        self.assertEqual(d.config['general'], {"timezone": "UTC"})
+        OpenWrt.template_cache.clear()
+        self.assertEqual(OpenWrt.template_cache.stats()['size'], 0)
+
+    def test_template_cache_nested_objects(self):
+        template = {
+            "interfaces": [{"name": "eth0", "type": "ethernet"}],
+            "files": [{"path": "/etc/template", "contents": "template"}]
+        }
+        OpenWrt.template_cache.clear()
+        for templates in ([template], [template], [json.dumps(template)], [json.dumps(template)]):
+            a = OpenWrt({"general": {"hostname": "a"}}, templates=templates)
+            # changes to nested objects do not leak into the cache
+            a.config['interfaces'][0]['name'] = 'changed'
+            a.config['interfaces'].append({"name": "eth1", "type": "ethernet"})
+            a.config['files'][0]['contents'] = 'changed'
+            b = OpenWrt({"general": {"hostname": "b"}}, templates=templates)
+            self.assertEqual(b.config['interfaces'], [{"name": "eth0", "type": "ethernet"}])
+            self.assertEqual(b.config['files'][0]['contents'], 'template')
+        self.assertEqual(template['interfaces'], [{"name": "eth0", "type": "ethernet"}])
+        OpenWrt.template_cache.clear()
+
+    def test_template_cache_disabled(self):
+        class NoCacheOpenWrt(OpenWrt):
+            template_cache = None
+        template = {"general": {"timezone": "UTC"}}
+        o = NoCacheOpenWrt({}, templates=[template])
+        self.assertEqual(o.config['general'], {"timezone": "UTC"})
+
     def test_file_inclusion(self):
         o = OpenWrt({
             "files": [
@@ -298,21 +536,21 @@ config wifi-iface
         output = o.render()
         self.assertNotIn('package files', output)
         self.assertIn('* * * * * echo', output)
-        # ensure the additional files are there present in the tar.gz archive
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        self.assertEqual(len(tar.getmembers()), 2)
+        # ensure the additional files are there present in the zip archive
+        zip = zipfile.ZipFile(o.generate())
+        self.assertEqual(len(zip.namelist()), 2)
         # first file
-        crontab = tar.getmember('etc/crontabs/root')
-        contents = tar.extractfile(crontab).read().decode()
+        crontab = zip.getinfo('etc/crontabs/root')
+        contents = zip.read(crontab).decode()
         self.assertEqual(contents, '\n'.join(o.config['files'][0]['contents']))
-        self.assertEqual(crontab.mtime, 0)
-        self.assertEqual(crontab.mode, 420)
+        self.assertEqual(crontab.date_time, (1980, 1, 1, 0, 0, 0))
+        self.assertEqual((crontab.external_attr >> 16) & 0o777, 420)
         # second file
-        dummy = tar.getmember('etc/dummy.conf')
-        contents = tar.extractfile(dummy).read().decode()
+        dummy = zip.getinfo('etc/dummy.conf')
+        contents = zip.read(dummy).decode()
         self.assertEqual(contents, o.config['files'][1]['contents'])
-        self.assertEqual(dummy.mode, 420)
-        tar.close()
+        self.assertEqual((dummy.external_attr >> 16) & 0o777, 420)
+        zip.close()
 
     def test_file_inclusion_list_contents(self):
         o = OpenWrt({
@@ -327,13 +565,86 @@ config wifi-iface
                 }
             ]
         })
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        self.assertEqual(len(tar.getmembers()), 1)
+        zip = zipfile.ZipFile(o.generate())
+        self.assertEqual(len(zip.namelist()), 1)
         # check file
-        crontab = tar.getmember('root/.ssh/authorized_keys')
-        contents = tar.extractfile(crontab).read().decode()
+        crontab = zip.getinfo('root/.ssh/authorized_keys')
+        contents = zip.read(crontab).decode()
         self.assertEqual(contents, '\n'.join(o.config['files'][0]['contents']))
-        tar.close()
+        zip.close()
+
+    def test_iter_render(self):
+        o = OpenWrt({
+            "general": {"hostname": "iter_render"},
+            "interfaces": [
+                {
+                    "name": "eth0",
+                    "type": "ethernet"
+                }
+            ],
+            "files": [
+                {
+                    "path": "/etc/first",
+                    "contents": "first\n\n\n"
+                },
+                {
+                    "path": "/etc/second",
+                    "contents": ["second"]
+                }
+            ]
+        })
+        chunks = list(o.iter_render())
+        self.assertEqual(''.join(chunks), o.render())
+        # system, separator, network, files delimiter and 2 files
+        self.assertEqual(len(chunks), 6)
+        self.assertTrue(chunks[0].startswith('package system'))
+        self.assertTrue(chunks[-1].startswith('# path: /etc/second'))
+        self.assertEqual(len(list(o.iter_render(files=False))), 3)
+
+    def test_iter_render_validation(self):
+        o = OpenWrt({"type": "WRONG"})
+        with self.assertRaises(ValidationError):
+            next(o.iter_render())
+
+    def test_render_to(self):
+        o = OpenWrt({
+            "general": {"hostname": "render_to"},
+            "files": [
+                {
+                    "path": "/etc/unicode",
+                    "contents": u"\u00e8"
+                }
+            ]
+        })
+        text = six.StringIO()
+        o.render_to(text)
+        self.assertEqual(text.getvalue(), o.render())
+        binary = BytesIO()
+        o.render_to(binary, files=False)
+        self.assertEqual(binary.getvalue(), o.render(files=False).encode('utf-8'))
+
+    def test_render_packages(self):
+        o = OpenWrt({
+            "general": {"hostname": "render_packages"},
+            "custom_package": [
+                {
+                    "config_name": "custom",
+                    "description": "contains package network"
+                }
+            ]
+        })
+        packages = o.render_packages()
+        self.assertEqual(list(packages.keys()), ['system', 'custom_package'])
+        self.assertEqual(packages['custom_package'], self._tabs("""config custom
+    option description 'contains package network'
+"""))
+        zip = zipfile.ZipFile(BytesIO(), mode='w')
+        o._generate_contents(zip)
+        # archive members are sorted by path
+        self.assertEqual(zip.namelist(), ['etc/config/custom_package', 'etc/config/system'])
+        contents = zip.read('etc/config/custom_package').decode()
+        self.assertEqual(contents, packages['custom_package'])
+        zip.close()
 
     def test_file_permissions(self):
         o = OpenWrt({
@@ -345,11 +656,87 @@ config wifi-iface
                 }
             ]
         })
-        tar = tarfile.open(fileobj=o.generate(), mode='r')
-        script = tar.getmember('tmp/hello.sh')
+        zip = zipfile.ZipFile(o.generate())
+        script = zip.getinfo('tmp/hello.sh')
         # check permissions
-        self.assertEqual(script.mode, 493)
-        tar.close()
+        self.assertEqual((script.external_attr >> 16) & 0o777, 493)
+        zip.close()
+
+    def test_file_permissions_invalid(self):
+        class CompiledOpenWrt(OpenWrt):
+            validation_engine = 'compiled'
+        for backend in (OpenWrt, CompiledOpenWrt):
+            for mode in ('rwx', '999', '75'):
+                o = backend({
+                    "files": [{"path": "/tmp/hello.sh", "contents": "hello", "mode": mode}]
+                })
+                with self.assertRaises(ValidationError):
+                    o.generate()
+
+    def test_timings(self):
+        timings = Timings()
+        config = {
+            "general": {"hostname": "timings"},
+            "files": [{"path": "/etc/a", "contents": "a"}, {"path": "/etc/b", "contents": "b"}]
+        }
+        o = OpenWrt(config, templates=[{"ntp": {"enabled": True}}], timings=timings)
+        o.render()
+        stats = timings.stats()
+        for phase in ('load', 'merge', 'validate', 'SystemRenderer.get_context',
+                      'SystemRenderer.render', 'SystemRenderer.cleanup',
+                      'NetworkRenderer.get_context', 'DefaultRenderer.get_context'):
+            self.assertEqual(stats[phase]['calls'], 1)
+        # empty packages are not rendered
+        self.assertNotIn('NetworkRenderer.render', timings)
+        self.assertEqual(stats['render_files']['calls'], 2)
+        OpenWrt(config, engine='direct', timings=timings).render(files=False)
+        stats = timings.stats()
+        self.assertEqual(stats['validate']['calls'], 2)
+        self.assertEqual(stats['SystemRenderer.render']['calls'], 2)
+        self.assertEqual(stats['SystemRenderer.cleanup']['calls'], 1)
+
+    def test_timings_disabled(self):
+        self.assertIsNone(OpenWrt.timings)
+        o = OpenWrt({"general": {"hostname": "timings"}})
+        self.assertIsNone(o.timings)
+        o.render()
+
+    def test_timings_class_attribute(self):
+        class TimedOpenWrt(OpenWrt):
+            timings = Timings()
+        TimedOpenWrt({}).render()
+        TimedOpenWrt({}).render()
+        self.assertEqual(TimedOpenWrt.timings.stats()['validate']['calls'], 2)
+
+    def test_fingerprint(self):
+        config = {
+            "general": {"hostname": "fingerprint"},
+            "interfaces": [{"name": "eth0", "type": "ethernet", "mtu": 1500}]
+        }
+        fingerprint = OpenWrt(config).fingerprint()
+        self.assertEqual(OpenWrt(json.dumps(config)).fingerprint(), fingerprint)
+        # key order and number representation do not matter
+        same = {
+            "interfaces": [{"mtu": 1500.0, "type": "ethernet", "name": "eth0"}],
+            "general": {"hostname": "fingerprint"}
+        }
+        self.assertEqual(OpenWrt(same).fingerprint(), fingerprint)
+        # templates are included
+        o = OpenWrt({"general": {"hostname": "fingerprint"}},
+                    templates=[{"interfaces": config['interfaces']}])
+        self.assertEqual(o.fingerprint(), fingerprint)
+        config['interfaces'][0]['mtu'] = 1400
+        self.assertNotEqual(OpenWrt(config).fingerprint(), fingerprint)
+        # backend class is included
+        from netjsonconfig import OpenWisp
+        self.assertNotEqual(OpenWisp(config).fingerprint(), OpenWrt(config).fingerprint())
+
+    def test_fingerprint_algorithm(self):
+        o = OpenWrt({"general": {"hostname": "fingerprint"}})
+        self.assertEqual(len(o.fingerprint(algorithm='md5')), 32)
+        self.assertEqual(len(o.fingerprint(algorithm='sha256')), 64)
+        with self.assertRaises(ValueError):
+            o.fingerprint(algorithm='WRONG')
 
     def test_checksum(self):
         """ ensures checksum of same config doesn't change """
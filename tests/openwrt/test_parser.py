@@ -0,0 +1,216 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from io import BytesIO
+
+from netjsonconfig import OpenWrt, OpenWisp
+from netjsonconfig.utils import _TabsMixin
+
+from ..fixtures import collect_configs
+
+
+class TestParser(unittest.TestCase, _TabsMixin):
+    """
+    tests for OpenWrt.parse
+    """
+    def test_parse_network(self):
+        text = self._tabs("""package network
+
+config globals 'globals'
+    option ula_prefix 'fd8e:f40a:6701::/48'
+
+config interface 'lan'
+    option ifname 'eth0'
+    option ipaddr '192.168.1.1'
+    option netmask '255.255.255.0'
+    option proto 'static'
+    option dns '10.0.0.1 10.0.0.2'
+    option mtu '1500'
+    option auto '0'
+
+config interface 'lan_2'
+    option ifname 'eth0'
+    option proto 'dhcpv6'
+
+config route 'route1'
+    option interface 'lan'
+    option target '10.0.3.0'
+    option netmask '255.255.255.0'
+    option gateway '192.168.1.254'
+    option metric '1'
+""")
+        self.assertEqual(OpenWrt.parse(text), {
+            "type": "DeviceConfiguration",
+            "globals": {"ula_prefix": "fd8e:f40a:6701::/48"},
+            "interfaces": [
+                {
+                    "name": "eth0",
+                    "network": "lan",
+                    "type": "ethernet",
+                    "mtu": 1500,
+                    "autostart": False,
+                    "addresses": [
+                        {
+                            "address": "192.168.1.1",
+                            "mask": 24,
+                            "proto": "static",
+                            "family": "ipv4"
+                        },
+                        {
+                            "proto": "dhcp",
+                            "family": "ipv6"
+                        }
+                    ]
+                }
+            ],
+            "dns_servers": ["10.0.0.1", "10.0.0.2"],
+            "routes": [
+                {
+                    "device": "lan",
+                    "destination": "10.0.3.0/24",
+                    "next": "192.168.1.254",
+                    "cost": 1
+                }
+            ]
+        })
+
+    def test_parse_route_without_gateway(self):
+        text = self._tabs("""package network
+
+config route
+    option interface 'lan'
+    option target '10.0.3.0/24'
+
+config route6
+    option interface 'lan'
+    option target 'fd00::/64'
+
+config route
+    option gateway '192.168.1.254'
+""")
+        self.assertEqual(OpenWrt.parse(text)['routes'], [
+            {"device": "lan", "next": "0.0.0.0", "destination": "10.0.3.0/24"},
+            {"device": "lan", "next": "::", "destination": "fd00::/64"}
+        ])
+
+    def test_parse_custom_package(self):
+        text = self._tabs("""package firewall
+
+config rule 'ssh'
+    option src 'wan'
+    list proto 'tcp'
+""")
+        self.assertEqual(OpenWrt.parse(text)['firewall'], [
+            {
+                "config_name": "rule",
+                "config_value": "ssh",
+                "src": "wan",
+                "proto": ["tcp"]
+            }
+        ])
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            OpenWrt.parse('package network\noption wrong\n')
+
+    def test_round_trip(self):
+        """
+        parses the output of the configurations used in the test suites
+        and checks that rendering the result gives the same output
+        """
+        recorded = collect_configs(OpenWrt, 'render', ['openwrt', 'openwisp'])
+        count = 0
+        for backend_class, config in recorded:
+            try:
+                output = backend_class(config).render(files=False)
+            except Exception:
+                continue
+            parsed = backend_class.parse(output)
+            self.assertEqual(backend_class(parsed).render(files=False), output)
+            count += 1
+        self.assertTrue(count > 20)
+
+    def _config(self):
+        return {
+            "general": {"hostname": "parsed", "timezone": "Europe/Rome"},
+            "interfaces": [
+                {
+                    "name": "eth0",
+                    "type": "ethernet",
+                    "addresses": [
+                        {
+                            "address": "10.0.0.1",
+                            "mask": 24,
+                            "proto": "static",
+                            "family": "ipv4"
+                        }
+                    ]
+                },
+                {
+                    "name": "wlan0",
+                    "type": "wireless",
+                    "wireless": {
+                        "radio": "radio0",
+                        "mode": "access_point",
+                        "ssid": "parsed",
+                        "encryption": {
+                            "enabled": True,
+                            "protocol": "wpa2_personal",
+                            "cipher": "auto",
+                            "key": "passphrase"
+                        }
+                    }
+                }
+            ],
+            "radios": [
+                {
+                    "name": "radio0",
+                    "driver": "mac80211",
+                    "protocol": "802.11n",
+                    "channel": 1,
+                    "channel_width": 20
+                }
+            ]
+        }
+
+    def test_parse_zip(self):
+        o = OpenWrt(self._config())
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w') as z:
+            o._generate_contents(z)
+            info = zipfile.ZipInfo('etc/dropbear/authorized_keys')
+            info.external_attr = 0o600 << 16
+            z.writestr(info, 'ssh-rsa key')
+        parsed = OpenWrt.parse(archive)
+        self.assertEqual(parsed['files'], [{
+            "path": "/etc/dropbear/authorized_keys",
+            "contents": "ssh-rsa key",
+            "mode": "600"
+        }])
+        del parsed['files']
+        self.assertEqual(OpenWrt(parsed).render(), o.render())
+
+    def test_parse_directory(self):
+        o = OpenWrt(self._config())
+        directory = tempfile.mkdtemp()
+        try:
+            # copy of /etc/config
+            for name, contents in o.render_packages().items():
+                with open(os.path.join(directory, name), 'w') as f:
+                    f.write(contents)
+            self.assertEqual(OpenWrt(OpenWrt.parse(directory)).render(), o.render())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_parse_openwisp(self):
+        o = OpenWisp(self._config())
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w') as z:
+            for name, contents in o.render_packages().items():
+                z.writestr('uci/{0}.conf'.format(name), contents)
+            z.writestr('install.sh', '#!/bin/sh')
+        parsed = OpenWisp.parse(archive)
+        self.assertNotIn('files', parsed)
+        self.assertEqual(OpenWisp(parsed).render_packages(), o.render_packages())
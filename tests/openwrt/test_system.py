@@ -1,6 +1,7 @@
 import unittest
 
 from netjsonconfig import OpenWrt
+from netjsonconfig.backends.openwrt import timezones
 from netjsonconfig.exceptions import ValidationError
 from netjsonconfig.utils import _TabsMixin
 
@@ -96,3 +97,32 @@ config led 'led_wlan2g'
         })
         with self.assertRaises(ValidationError):
             o.validate()
+
+    def test_timezone_validation(self):
+        config = {"general": {"timezone": "Europe/Rome"}}
+        for engine in ('jsonschema', 'compiled'):
+            class Backend(OpenWrt):
+                validation_engine = engine
+            Backend(config).validate()
+            for timezone in ('Europe/Nowhere', 'rome', 'CET-1CEST,M3'):
+                with self.assertRaises(ValidationError):
+                    Backend({"general": {"timezone": timezone}}).validate()
+            # POSIX TZ strings are still accepted and written as they are
+            for timezone in ('UTC', 'EST5EDT', 'CET-1CEST,M3.5.0,M10.5.0/3', '<+0330>-3:30'):
+                o = Backend({"general": {"timezone": timezone}})
+                self.assertIn("option timezone '{0}'".format(timezone), o.render())
+
+    def test_timezone_default(self):
+        o = OpenWrt({"general": {"hostname": "default"}})
+        self.assertIn("option timezone 'UTC'", o.render())
+
+    def test_timezones(self):
+        self.assertEqual(timezones.get_tz('Europe/Rome'), 'CET-1CEST,M3.5.0,M10.5.0/3')
+        self.assertIsNone(timezones.get_tz('Europe/Nowhere'))
+        self.assertEqual(timezones.get_name('UTC'), 'Coordinated Universal Time')
+        self.assertEqual(list(timezones.get_timezones())[0], 'Coordinated Universal Time')
+        self.assertIs(timezones.timezones, timezones.get_timezones())
+        parsed = OpenWrt.parse(OpenWrt({"general": {"timezone": "Asia/Tokyo"}}).render())
+        self.assertEqual(parsed['general']['timezone'], 'Asia/Tokyo')
+        parsed = OpenWrt.parse(OpenWrt({"general": {"timezone": "UTC"}}).render())
+        self.assertEqual(parsed['general']['timezone'], 'Coordinated Universal Time')
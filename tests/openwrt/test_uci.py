@@ -0,0 +1,249 @@
+import re
+import shlex
+import unittest
+import zipfile
+from collections import OrderedDict
+
+from netjsonconfig import OpenWrt, OpenWisp
+from netjsonconfig.backends.openwrt import uci
+from netjsonconfig.utils import _TabsMixin
+
+from ..fixtures import collect_configs
+
+
+def apply_batch(packages, script):
+    """
+    applies a ``uci batch`` script to parsed packages,
+    emulating the behaviour of the uci command line utility
+    """
+    for line in script.splitlines():
+        command, arguments = line.split(' ', 1)
+        if command == 'commit':
+            continue
+        if command == 'add':
+            package, type_ = arguments.split()
+            packages.setdefault(package, []).append(uci.Section(type_, None, OrderedDict()))
+            continue
+        path, _, value = arguments.partition('=')
+        value = shlex.split(value)[0] if value else None
+        parts = path.split('.')
+        sections = packages.setdefault(parts[0], [])
+        match = re.match(r'^@(.+)\[(-?\d+)\]$', parts[1])
+        if match:
+            of_type = [s for s in sections if s.type == match.group(1)]
+            section = of_type[int(match.group(2))]
+        else:
+            section = ([s for s in sections if s.name == parts[1]] or [None])[0]
+        if command == 'delete':
+            if len(parts) == 2:
+                sections.remove(section)
+            else:
+                del section.options[parts[2]]
+        elif command == 'set' and len(parts) == 2:
+            sections.append(uci.Section(value, parts[1], OrderedDict()))
+        elif command == 'set':
+            section.options[parts[2]] = value
+        elif command == 'add_list':
+            section.options.setdefault(parts[2], []).append(value)
+    return packages
+
+
+def normalize(packages):
+    """
+    the order of named sections and the relative order
+    of anonymous sections of different types are not relevant
+    """
+    result = {}
+    for package, sections in packages.items():
+        named = {}
+        anonymous = {}
+        for s in sections:
+            if s.name:
+                named[s.name] = (s.type, dict(s.options))
+            else:
+                anonymous.setdefault(s.type, []).append(dict(s.options))
+        if named or anonymous:
+            result[package] = (named, anonymous)
+    return result
+
+
+class TestUci(unittest.TestCase, _TabsMixin):
+    """
+    tests for backends.openwrt.uci
+    """
+    def test_parse(self):
+        text = self._tabs("""package network
+
+config interface 'lan'
+    option ifname 'eth0'
+    option description 'it's "quoted"'
+    list dns '10.0.0.1'
+    list dns "10.0.0.2"
+
+config switch
+    option name switch0
+
+package 'system'
+
+# comment
+config system
+    option hostname 'it'\\''s'
+
+# ------ files ------ #
+
+# path: /etc/file
+config ignored
+""")
+        packages = uci.parse(text)
+        self.assertEqual(list(packages.keys()), ['network', 'system'])
+        lan, switch = packages['network']
+        self.assertEqual(lan.type, 'interface')
+        self.assertEqual(lan.name, 'lan')
+        self.assertEqual(lan.options, OrderedDict([
+            ('ifname', 'eth0'),
+            ('description', 'it\'s "quoted"'),
+            ('dns', ['10.0.0.1', '10.0.0.2'])
+        ]))
+        self.assertEqual(switch, uci.Section('switch', None, {'name': 'switch0'}))
+        self.assertEqual(packages['system'][0].options['hostname'], "it's")
+
+    def test_parse_errors(self):
+        for text in ['config system', 'package system\noption a b',
+                     'package system\nconfig system\noption a',
+                     'package system\nconfig', 'WRONG']:
+            with self.assertRaises(ValueError):
+                uci.parse(text)
+
+    def test_parse_package(self):
+        sections = uci.parse_package("config system\n\toption hostname 'a'\n")
+        self.assertEqual(sections, [uci.Section('system', None, {'hostname': 'a'})])
+
+    def test_quote(self):
+        self.assertEqual(uci.quote("it's"), "'it'\\''s'")
+        self.assertEqual(shlex.split(uci.quote("it's"))[0], "it's")
+
+    def test_delta(self):
+        old = OpenWrt({
+            "general": {"hostname": "old"},
+            "interfaces": [
+                {"name": "eth0", "type": "ethernet", "mtu": 1500},
+                {"name": "eth1", "type": "ethernet"}
+            ],
+            "ntp": {"enabled": True, "server": ["0.pool.ntp.org"]},
+            "custom": [
+                {"config_name": "rule", "name": "a"},
+                {"config_name": "rule", "name": "b"}
+            ]
+        })
+        new = OpenWrt({
+            "general": {"hostname": "new"},
+            "interfaces": [
+                {"name": "eth0", "type": "ethernet"},
+                {"name": "eth2", "type": "ethernet"}
+            ],
+            "ntp": {"enabled": True, "server": ["0.pool.ntp.org", "1.pool.ntp.org"]},
+            "custom": [
+                {"config_name": "rule", "name": "a"}
+            ]
+        })
+        self.assertEqual(new.delta(old), """set system.@system[0].hostname='new'
+add_list system.ntp.server='1.pool.ntp.org'
+delete network.eth0.mtu
+delete network.eth1
+set network.eth2='interface'
+set network.eth2.ifname='eth2'
+set network.eth2.proto='none'
+delete custom.@rule[1]
+commit system
+commit network
+commit custom
+""")
+        # configs are loaded with the same backend
+        self.assertEqual(new.delta(old.config), new.delta(old))
+        self.assertEqual(new.delta(new), '')
+
+    def test_delta_anonymous_sections(self):
+        old = [uci.Section('rule', 'named', {'a': '1'}),
+               uci.Section('rule', None, {'a': '2'})]
+        new = [uci.Section('rule', None, {'a': '3'}),
+               uci.Section('rule', None, {'a': '4', 'l': ['x']}),
+               uci.Section('rule', 'named', {'a': '1'})]
+        commands = uci.diff_package('firewall', old, new)
+        # index of anonymous sections counts named sections of the same type
+        self.assertEqual(commands, [
+            "set firewall.@rule[1].a='3'",
+            "add firewall rule",
+            "set firewall.@rule[-1].a='4'",
+            "add_list firewall.@rule[-1].l='x'"
+        ])
+
+    def test_delta_lists(self):
+        old = [uci.Section('s', 'n', OrderedDict([('a', ['1', '2']), ('b', '1'), ('c', ['1'])]))]
+        new = [uci.Section('s', 'n', OrderedDict([('a', ['2']), ('b', ['1']), ('c', '1')]))]
+        self.assertEqual(uci.diff_package('p', old, new), [
+            "delete p.n.a",
+            "add_list p.n.a='2'",
+            "delete p.n.b",
+            "add_list p.n.b='1'",
+            "delete p.n.c",
+            "set p.n.c='1'"
+        ])
+
+    def test_delta_fixtures(self):
+        """
+        applies the delta between the configurations used in
+        the test suites and checks the result is the new configuration
+        """
+        recorded = collect_configs(OpenWrt, 'render', ['openwrt', 'openwisp'])
+        backends = []
+        for backend_class, config in recorded:
+            backend = backend_class(config)
+            try:
+                backend.render_packages()
+            except Exception:
+                continue
+            backends.append(backend)
+        self.assertTrue(len(backends) > 20)
+        self.assertTrue(any(isinstance(b, OpenWisp) for b in backends))
+        for old, new in zip(backends, backends[1:] + backends[:1]):
+            old_packages = old._parse_packages(old.render_packages())
+            new_packages = new._parse_packages(new.render_packages())
+            missing = [p for p, sections in new_packages.items()
+                       if sections and p not in old_packages]
+            if missing:
+                self.assertRaises(ValueError, new.delta, old)
+                # new packages are imported entirely, eg: as empty files
+                for package in missing:
+                    old_packages[package] = []
+                script = uci.diff(old_packages, new_packages)
+            else:
+                script = new.delta(old)
+            result = apply_batch(old_packages, script)
+            self.assertEqual(normalize(result), normalize(new_packages))
+
+    def test_delta_added_package(self):
+        old = OpenWrt({"general": {"hostname": "old"}})
+        new = OpenWrt({
+            "general": {"hostname": "old"},
+            "custom": [{"config_name": "rule", "name": "a"}]
+        })
+        # uci batch cannot create the package
+        with self.assertRaises(ValueError) as context:
+            new.delta(old)
+        self.assertIn('custom', str(context.exception))
+        # delta archives contain the complete package
+        archive = zipfile.ZipFile(new.generate_delta(old))
+        self.assertEqual(archive.read('etc/config/custom').decode(),
+                         new.render_packages()['custom'])
+        # removing all the sections of a package is supported
+        self.assertEqual(old.delta(new), "delete custom.@rule[0]\ncommit custom\n")
+        # the package exists on the router
+        packages = old._parse_packages(old.render_packages())
+        packages['custom'] = []
+        new_packages = new._parse_packages(new.render_packages())
+        self.assertEqual(uci.diff(packages, new_packages),
+                         "add custom rule\nset custom.@rule[-1].name='a'\ncommit custom\n")
+        # empty packages are not created
+        new_packages['empty'] = []
+        self.assertEqual(uci.diff(packages, new_packages),
+                         "add custom rule\nset custom.@rule[-1].name='a'\ncommit custom\n")
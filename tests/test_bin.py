@@ -1,8 +1,10 @@
 import os
 import json
+import shutil
 import unittest
 import subprocess
-import tarfile
+import tempfile
+import zipfile
 
 from netjsonconfig.utils import _TabsMixin
 
@@ -13,7 +15,8 @@ class TestBin(unittest.TestCase, _TabsMixin):
     """
     @classmethod
     def tearDownClass(self):
-        os.remove('test.tar.gz')
+        if os.path.exists('test.zip'):
+            os.remove('test.zip')
 
     def test_file_not_found(self):
         with self.assertRaises(subprocess.CalledProcessError):
@@ -114,9 +117,125 @@ class TestBin(unittest.TestCase, _TabsMixin):
         self.assertNotIn('test.txt', output)
         self.assertNotIn('test_valid_arg', output)
 
+    def test_delta(self):
+        config = json.dumps({'general': {'hostname': 'new'}})
+        previous = json.dumps({'general': {'hostname': 'previous'}})
+        command = "netjsonconfig -c '{0}' -b openwrt -m delta -a previous='{1}'".format(config, previous)
+        output = subprocess.check_output(command, shell=True).decode()
+        self.assertEqual(output, "set system.@system[0].hostname='new'\n"
+                                 "commit system\n\n")
+
+    def test_generate_delta(self):
+        config = json.dumps({'general': {'hostname': 'new'},
+                             'files': [{'path': '/etc/a', 'contents': 'a'}]})
+        previous = json.dumps({'general': {'hostname': 'new'}})
+        command = "netjsonconfig -c '{0}' -b openwrt -m generate_delta -a previous='{1}' manifest=1 > test.zip"
+        subprocess.check_call(command.format(config, previous), shell=True)
+        with zipfile.ZipFile('test.zip') as zip:
+            self.assertEqual(zip.namelist(), ['etc/a',
+                                              'etc/netjsonconfig/removed',
+                                              'etc/netjsonconfig/manifest.json'])
+
+    def test_timings(self):
+        command = """netjsonconfig -c '{"general": { "hostname": "example" }}' -b openwrt -m render --timings"""
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, timings = process.communicate()
+        self.assertIn("hostname 'example'", output.decode())
+        timings = timings.decode()
+        for phase in ('load', 'merge', 'validate', 'SystemRenderer.get_context', 'SystemRenderer.render'):
+            self.assertIn('\n{0} '.format(phase), timings)
+
+    def _batch(self, command, input=None):
+        process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output = process.communicate(input.encode() if input else None)[0]
+        return process.returncode, output.decode().splitlines()
+
+    def test_batch(self):
+        directory = tempfile.mkdtemp()
+        try:
+            records = [
+                json.dumps({'general': {'hostname': 'router1'}}),
+                '',
+                json.dumps({'interfaces': ['w']}),
+                'NOTJSON',
+                json.dumps({'general': {'hostname': '../router2'}}),
+                json.dumps({'general': {'hostname': 'router1'}})
+            ]
+            path = os.path.join(directory, 'fleet.ndjson')
+            with open(path, 'w') as f:
+                f.write('\n'.join(records) + '\n')
+            output_dir = os.path.join(directory, 'output')
+            template = json.dumps({'ntp': {'enabled': True, 'server': ['pool.example.com']}})
+            command = "netjsonconfig --batch {0} -o {1} -b openwrt -m render -j 2 -t '{2}'"
+            code, lines = self._batch(command.format(path, output_dir, template))
+            self.assertEqual(code, 4)
+            self.assertEqual(lines[0], '1: ok router1.uci')
+            self.assertTrue(lines[1].startswith('3: validation error: '))
+            self.assertEqual(lines[2], '4: error: invalid JSON')
+            self.assertEqual(lines[3], '5: ok _router2.uci')
+            # duplicate hostname
+            self.assertEqual(lines[4], '6: ok line6.uci')
+            self.assertEqual(sorted(os.listdir(output_dir)),
+                             ['_router2.uci', 'line6.uci', 'router1.uci'])
+            with open(os.path.join(output_dir, 'router1.uci')) as f:
+                contents = f.read()
+            self.assertIn("hostname 'router1'", contents)
+            self.assertIn("server 'pool.example.com'", contents)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_batch_stdin(self):
+        directory = tempfile.mkdtemp()
+        try:
+            records = '{"general": {"hostname": "a"}}\n{"general": {"hostname": "b"}}\n'
+            command = 'netjsonconfig --batch - -o {0} -b openwisp -m render -a files=0'
+            code, lines = self._batch(command.format(directory), input=records)
+            self.assertEqual(code, 0)
+            self.assertEqual(lines, ['1: ok a.uci', '2: ok b.uci'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_batch_generate(self):
+        directory = tempfile.mkdtemp()
+        try:
+            records = '{"general": {"hostname": "a"}, "files": [{"path": "/etc/a", "contents": "a"}]}\n'
+            command = 'netjsonconfig --batch - -o {0} -b openwrt -m generate -j 2'
+            code, lines = self._batch(command.format(directory), input=records)
+            self.assertEqual((code, lines), (0, ['1: ok a.zip']))
+            with zipfile.ZipFile(os.path.join(directory, 'a.zip')) as zip:
+                self.assertEqual(zip.namelist(), ['etc/a', 'etc/config/system'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_batch_renderer_error(self):
+        directory = tempfile.mkdtemp()
+        try:
+            route = {'device': 'eth0', 'next': '10.0.0.1', 'destination': 'notip'}
+            records = '\n'.join([
+                json.dumps({'general': {'hostname': 'a'}}),
+                json.dumps({'general': {'hostname': 'b'}, 'routes': [route]}),
+                json.dumps({'general': {'hostname': 'c'}})
+            ]) + '\n'
+            for jobs in (1, 2):
+                command = 'netjsonconfig --batch - -o {0} -b openwrt -m render -j {1}'
+                code, lines = self._batch(command.format(directory, jobs), input=records)
+                self.assertEqual(code, 4)
+                self.assertEqual(lines[0], '1: ok a.uci')
+                self.assertTrue(lines[1].startswith("2: error: 'notip'"))
+                self.assertEqual(lines[2], '3: ok c.uci')
+                self.assertEqual(sorted(os.listdir(directory)), ['a.uci', 'c.uci'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_batch_config_exclusive(self):
+        command = "netjsonconfig --batch - -c '{}' -b openwrt -m render"
+        code, lines = self._batch(command)
+        self.assertEqual(code, 2)
+
     def test_generate_redirection(self):
-        command = """netjsonconfig -c '{"general": { "hostname": "example" }}' -b openwrt -m generate > test.tar.gz"""
+        command = """netjsonconfig -c '{"general": { "hostname": "example" }}' -b openwrt -m generate > test.zip"""
         subprocess.check_output(command, shell=True)
-        tar = tarfile.open('test.tar.gz', 'r')
-        self.assertEqual(len(tar.getmembers()), 1)
-        tar.close()
+        zip = zipfile.ZipFile('test.zip')
+        self.assertEqual(zip.namelist(), ['etc/config/system'])
+        zip.close()
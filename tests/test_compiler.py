@@ -0,0 +1,115 @@
+import unittest
+
+from jsonschema import Draft4Validator
+
+from netjsonconfig import OpenWrt, OpenWisp
+from netjsonconfig.compiler import compile_schema
+from netjsonconfig.exceptions import ValidationError
+
+from .fixtures import collect_configs
+
+
+class TestCompiler(unittest.TestCase):
+    """
+    tests for netjsonconfig.compiler
+    """
+    def _assertParity(self, schema, instances):
+        is_valid = compile_schema(schema)
+        validator = Draft4Validator(schema)
+        for instance in instances:
+            self.assertEqual(is_valid(instance), validator.is_valid(instance),
+                             'parity error with {0!r}'.format(instance))
+
+    def test_type(self):
+        self._assertParity({'type': 'integer'}, [1, 1.0, True, '1', None])
+        self._assertParity({'type': 'number'}, [1, 1.5, False, '1'])
+        self._assertParity({'type': ['string', 'null']}, ['a', None, 1])
+        self._assertParity({'type': 'boolean'}, [True, 0])
+
+    def test_enum(self):
+        self._assertParity({'enum': ['a', 'b']}, ['a', 'c', 1, {}, []])
+        self._assertParity({'enum': [1, [1], {'a': 1}]}, [1, 1.0, True, [1], [True], {'a': 1}])
+
+    def test_string(self):
+        schema = {'type': 'string', 'minLength': 2, 'maxLength': 3, 'pattern': '^[a-z]*$'}
+        self._assertParity(schema, ['a', 'ab', 'abc', 'abcd', 'aB', 1])
+
+    def test_number(self):
+        schema = {'minimum': 0, 'maximum': 10, 'exclusiveMaximum': True}
+        self._assertParity(schema, [-1, 0, 9.9, 10, 11, 'x', True])
+        self._assertParity({'multipleOf': 2}, [2, 3, 4.0])
+
+    def test_object(self):
+        schema = {
+            'required': ['a'],
+            'properties': {'a': {'type': 'string'}, 'b': {}},
+            'additionalProperties': False
+        }
+        self._assertParity(schema, [{'a': 'a'}, {'a': 1}, {}, {'a': 'a', 'b': 1},
+                                    {'a': 'a', 'c': 1}, []])
+        schema['additionalProperties'] = {'type': 'integer'}
+        self._assertParity(schema, [{'a': 'a', 'c': 1}, {'a': 'a', 'c': 'c'}])
+
+    def test_array(self):
+        schema = {'minItems': 1, 'maxItems': 3, 'uniqueItems': True,
+                  'items': {'type': 'integer'}}
+        self._assertParity(schema, [[], [1], [1, 1], [1, 1.0], [1, True],
+                                    [1, 2, 3, 4], ['a'], {}])
+        schema = {'items': [{'type': 'string'}], 'additionalItems': False}
+        self._assertParity(schema, [[], ['a'], [1], ['a', 'b']])
+
+    def test_combinators(self):
+        schema = {
+            'definitions': {'str': {'type': 'string'}},
+            'oneOf': [{'$ref': '#/definitions/str'}, {'maxLength': 1}],
+            'not': {'enum': ['x']}
+        }
+        self._assertParity(schema, ['x', 'y', 'yy', 1])
+        schema = {'anyOf': [{'type': 'string'}, {'type': 'integer'}],
+                  'allOf': [{'not': {'type': 'boolean'}}]}
+        self._assertParity(schema, ['a', 1, 1.5, True])
+
+    def test_format(self):
+        schema = {'type': 'string', 'format': 'lower'}
+        formats = {'lower': lambda value: value.islower()}
+        is_valid = compile_schema(schema, formats)
+        self.assertTrue(is_valid('abc'))
+        self.assertFalse(is_valid('ABC'))
+        self.assertFalse(is_valid(1))
+        # unknown formats are annotations
+        self.assertTrue(compile_schema(schema)('ABC'))
+        is_valid = compile_schema({'properties': {'a': {'format': 'lower'}}}, formats)
+        self.assertTrue(is_valid({'a': 1}))
+        self.assertFalse(is_valid({'a': 'A'}))
+
+    def test_unsupported_keyword(self):
+        with self.assertRaises(NotImplementedError):
+            compile_schema({'patternProperties': {'^a': {}}})
+
+    def test_backend_engine(self):
+        class CompiledOpenWrt(OpenWrt):
+            validation_engine = 'compiled'
+        CompiledOpenWrt({'general': {'hostname': 'compiled'}}).validate()
+        o = CompiledOpenWrt({'general': {'hostname': 1}})
+        try:
+            o.validate()
+        except ValidationError as e:
+            # same error raised by the jsonschema engine
+            self.assertEqual(e.message, "1 is not of type 'string'")
+        else:
+            self.fail('ValidationError not raised')
+
+    def test_fixtures_parity(self):
+        """
+        runs the backend test suites recording every validated
+        configuration, then checks the compiled validators against
+        jsonschema on each one of them
+        """
+        recorded = collect_configs(OpenWrt, 'validate', ['openwrt', 'openwisp'])
+        self.assertTrue(len(recorded) > 50)
+        self.assertTrue(any(c is OpenWisp for c, config in recorded))
+        for backend_class, config in recorded:
+            is_valid = backend_class.get_compiled_validator()
+            validator = backend_class.get_validator()
+            self.assertEqual(is_valid(config), validator.is_valid(config),
+                             'parity error with {0!r}'.format(config))
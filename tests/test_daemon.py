@@ -0,0 +1,209 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from netjsonconfig import OpenWrt, daemon
+
+
+class TestDaemon(unittest.TestCase):
+    """
+    tests for netjsonconfig.daemon
+    """
+    config = {"general": {"hostname": "daemon"}}
+
+    def test_handle_request(self):
+        response = daemon.handle_request({
+            'backend': 'openwrt',
+            'method': 'render',
+            'config': self.config,
+            'templates': [{"ntp": {"enabled": True, "server": ["a"]}}],
+            'arguments': {'files': False}
+        })
+        expected = OpenWrt(self.config, templates=[{"ntp": {"enabled": True, "server": ["a"]}}])
+        self.assertEqual(response, {'status': 'ok', 'output': expected.render()})
+
+    def test_handle_request_errors(self):
+        response = daemon.handle_request({'backend': 'openwrt', 'method': 'render',
+                                          'config': {"interfaces": ["w"]}})
+        self.assertEqual(response['status'], 'error')
+        self.assertEqual(response['phase'], 'method')
+        self.assertEqual(response['type'], 'ValidationError')
+        self.assertIn('Failed validating', response['details'])
+        response = daemon.handle_request({'backend': 'openwrt', 'method': 'render',
+                                          'config': 'NOTJSON'})
+        self.assertEqual((response['phase'], response['type']), ('init', 'TypeError'))
+        # only the allowed methods can be called
+        for method in ('__init__', 'validate', '_load'):
+            response = daemon.handle_request({'backend': 'openwrt', 'method': method,
+                                              'config': self.config})
+            self.assertEqual(response['type'], 'ValueError')
+
+    def test_handle_request_unexpected_error(self):
+        def render(self, files=True):
+            raise KeyError('gateway')
+        original = OpenWrt.render
+        OpenWrt.render = render
+        try:
+            response = daemon.handle_request({'backend': 'openwrt', 'method': 'render',
+                                              'config': self.config})
+        finally:
+            OpenWrt.render = original
+        self.assertEqual(response['status'], 'error')
+        self.assertEqual((response['phase'], response['type']), ('method', 'KeyError'))
+
+    def test_default_socket_path(self):
+        environ = dict(os.environ)
+        try:
+            os.environ['NETJSONCONFIG_SOCKET'] = '/tmp/test.sock'
+            self.assertEqual(daemon.default_socket_path(), '/tmp/test.sock')
+            del os.environ['NETJSONCONFIG_SOCKET']
+            os.environ['XDG_RUNTIME_DIR'] = '/run/user/1000'
+            self.assertEqual(daemon.default_socket_path(), '/run/user/1000/netjsonconfig.sock')
+            # shared directories like /tmp are never used
+            del os.environ['XDG_RUNTIME_DIR']
+            self.assertIsNone(daemon.default_socket_path())
+            self.assertIsNone(daemon.forward('openwrt', 'render', self.config))
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+    def test_forward_not_running(self):
+        self.assertIsNone(daemon.forward('openwrt', 'render', self.config,
+                                         path='/tmp/netjsonconfig-not-running.sock'))
+
+
+    def test_forward_broken_daemon(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'broken.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        os.chmod(path, 0o600)
+        server.listen(1)
+
+        def close_connection():
+            connection = server.accept()[0]
+            daemon.receive_message(connection)
+            connection.close()
+        thread = threading.Thread(target=close_connection)
+        thread.start()
+        try:
+            # closed without a response: the request must be run locally
+            self.assertIsNone(daemon.forward('openwrt', 'render', self.config, path=path))
+        finally:
+            thread.join()
+            server.close()
+            os.remove(path)
+            os.rmdir(directory)
+
+
+    def test_untrusted_socket(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'untrusted.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        try:
+            # accessible by other users
+            os.chmod(path, 0o666)
+            self.assertFalse(daemon.is_trusted_socket(path))
+            self.assertIsNone(daemon.forward('openwrt', 'render', self.config, path=path))
+            os.chmod(path, 0o600)
+            self.assertTrue(daemon.is_trusted_socket(path))
+            # owned by another user
+            if os.getuid() == 0:
+                os.chown(path, 12345, -1)
+                self.assertFalse(daemon.is_trusted_socket(path))
+                with self.assertRaises(socket.error):
+                    daemon.Client(path)
+                self.assertIsNone(daemon.forward('openwrt', 'render', self.config, path=path))
+            # not a socket
+            self.assertFalse(daemon.is_trusted_socket(directory))
+        finally:
+            server.close()
+            os.remove(path)
+            os.rmdir(directory)
+
+
+class TestDaemonProcess(unittest.TestCase):
+    """
+    tests which run the daemon in a separate process
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'daemon.sock')
+        # stale socket of a daemon which was killed
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.process = subprocess.Popen([sys.executable, '-m', 'netjsonconfig.daemon',
+                                         '--socket', self.path, '--workers', '2'])
+        for i in range(200):
+            try:
+                daemon.Client(self.path).close()
+                break
+            except socket.error:
+                time.sleep(0.05)
+
+    def tearDown(self):
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.directory)
+
+    def test_client(self):
+        with daemon.Client(self.path) as client:
+            response = client.request('openwrt', 'render', json.dumps({"general": {"hostname": "a"}}))
+            self.assertEqual(response['status'], 'ok')
+            self.assertIn("hostname 'a'", response['output'])
+            # the connection can be reused
+            response = client.request('openwisp', 'render', {"general": {}})
+            self.assertEqual(response['type'], 'ValidationError')
+
+    def test_concurrent_clients(self):
+        results = {}
+
+        def render(index):
+            config = {"general": {"hostname": "router{0}".format(index)}}
+            response = daemon.forward('openwrt', 'render', config, path=self.path)
+            results[index] = response['output']
+        threads = [threading.Thread(target=render, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index in range(8):
+            config = {"general": {"hostname": "router{0}".format(index)}}
+            self.assertEqual(results[index], OpenWrt(config).render())
+
+    def test_already_running(self):
+        process = subprocess.Popen([sys.executable, '-m', 'netjsonconfig.daemon',
+                                    '--socket', self.path],
+                                   stderr=subprocess.PIPE)
+        error = process.communicate()[1].decode()
+        self.assertEqual(process.returncode, 1)
+        self.assertIn('already listening', error)
+
+    def test_cli_forward(self):
+        command = "netjsonconfig --socket {0} -c '{1}' -b openwrt -m render"
+        config = json.dumps({"general": {"hostname": "forwarded"}})
+        output = subprocess.check_output(command.format(self.path, config), shell=True)
+        self.assertIn("hostname 'forwarded'", output.decode())
+        process = subprocess.Popen(command.format(self.path, '{"interfaces": ["w"]}'),
+                                   shell=True, stdout=subprocess.PIPE)
+        output = process.communicate()[0].decode()
+        self.assertEqual(process.returncode, 4)
+        self.assertIn('JSON Schema violation', output)
+
+    def test_stop(self):
+        self.process.send_signal(signal.SIGTERM)
+        self.assertEqual(self.process.wait(), 0)
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,81 @@
+import unittest
+
+from netjsonconfig import OpenWrt
+from netjsonconfig.exceptions import ValidationError
+from netjsonconfig.utils import _TabsMixin
+
+from .fixtures import collect_configs
+
+
+class TestEngines(unittest.TestCase, _TabsMixin):
+    """
+    ensures the "direct" render engine produces
+    the same output of the "jinja2" engine
+    """
+    def _render(self, backend_class, config, engine):
+        try:
+            return backend_class(config, engine=engine).render()
+        except ValidationError:
+            return None
+
+    def test_fixtures_parity(self):
+        recorded = collect_configs(OpenWrt, 'render', ['openwrt'])
+        self.assertTrue(len(recorded) > 40)
+        for backend_class, config in recorded:
+            jinja2_output = self._render(backend_class, config, 'jinja2')
+            direct_output = self._render(backend_class, config, 'direct')
+            self.assertEqual(direct_output, jinja2_output,
+                             'parity error with {0!r}'.format(config))
+
+    def test_custom_packages(self):
+        config = {
+            "custom": [
+                {
+                    "config_name": "section",
+                    "config_value": "name",
+                    "servers": ["a", "b"],
+                    "enabled": True,
+                    "empty": "",
+                    "zero": 0
+                },
+                {
+                    "config_name": "anonymous",
+                    "config_value": ""
+                }
+            ],
+            "empty_package": []
+        }
+        self.assertEqual(OpenWrt(config, engine='direct').render(),
+                         OpenWrt(config, engine='jinja2').render())
+
+    def test_values_not_altered(self):
+        """
+        unlike the cleanup of the jinja2 engine, the direct engine
+        does not alter keys or values containing reserved words
+        """
+        o = OpenWrt({
+            "custom": [
+                {
+                    "config_name": "section",
+                    "blacklist": "True  option"
+                }
+            ]
+        }, engine='direct')
+        self.assertEqual(o.render(), self._tabs("""package custom
+
+config section
+    option blacklist 'True  option'
+"""))
+
+    def test_empty(self):
+        self.assertEqual(OpenWrt({}, engine='direct').render(), '')
+
+    def test_class_attribute(self):
+        class DirectOpenWrt(OpenWrt):
+            engine = 'direct'
+        self.assertEqual(DirectOpenWrt({}).engine, 'direct')
+        self.assertEqual(DirectOpenWrt({}, engine='jinja2').engine, 'jinja2')
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            OpenWrt({}, engine='WRONG')
@@ -0,0 +1,115 @@
+import unittest
+
+from netjsonconfig import OpenWrt, OpenWisp, fleet
+from netjsonconfig.exceptions import ValidationError
+
+
+class TestFleet(unittest.TestCase):
+    """
+    tests for netjsonconfig.fleet
+    """
+    template = {
+        "general": {"hostname": "template"},
+        "ntp": {
+            "enabled": True,
+            "server": ["0.openwrt.pool.ntp.org"]
+        }
+    }
+
+    def _configs(self, count=6):
+        return [{"general": {"hostname": "router{0}".format(i)}}
+                for i in range(count)]
+
+    def test_render_many_ordered(self):
+        configs = self._configs()
+        results = list(OpenWrt.render_many(configs, templates=[self.template], workers=2))
+        self.assertEqual([r.index for r in results], list(range(len(configs))))
+        for config, result in zip(configs, results):
+            self.assertIsNone(result.error)
+            expected = OpenWrt(config, templates=[self.template]).render()
+            self.assertEqual(result.output, expected)
+
+    def test_render_many_unordered(self):
+        configs = self._configs()
+        results = OpenWrt.render_many(configs, templates=[self.template],
+                                      workers=2, ordered=False)
+        indexes = sorted(r.index for r in results)
+        self.assertEqual(indexes, list(range(len(configs))))
+
+    def test_render_many_single_worker(self):
+        configs = self._configs(2)
+        results = list(OpenWrt.render_many(configs, workers=1))
+        self.assertEqual(len(results), 2)
+        self.assertIn("hostname 'router1'", results[1].output)
+
+    def test_render_many_errors(self):
+        configs = self._configs(3)
+        configs.insert(1, {"type": "WRONG"})
+        configs.insert(2, 'NOTJSON')
+        results = list(OpenWrt.render_many(configs, workers=2))
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[1].error, ValidationError)
+        self.assertIsNone(results[1].output)
+        self.assertIsInstance(results[2].error, TypeError)
+        for i in (0, 3, 4):
+            self.assertIsNone(results[i].error)
+            self.assertIn('package system', results[i].output)
+
+    def test_render_many_renderer_error(self):
+        # valid according to the schema, but the renderer fails
+        broken = {"routes": [{"device": "eth0", "next": "10.0.0.1", "destination": "notip"}]}
+        configs = self._configs(2)
+        configs.insert(1, broken)
+        for workers in (1, 2):
+            results = list(OpenWrt.render_many(configs, workers=workers))
+            self.assertEqual(len(results), 3)
+            self.assertIsInstance(results[1].error, ValueError)
+            self.assertIsNone(results[1].output)
+            for i in (0, 2):
+                self.assertIsNone(results[i].error)
+                self.assertIn('package system', results[i].output)
+
+    def test_render_many_method_arguments(self):
+        configs = [{
+            "files": [{"path": "/etc/test.txt", "contents": "test_render_many"}]
+        }]
+        result = list(OpenWrt.render_many(configs, workers=1, files=False))[0]
+        self.assertNotIn('test_render_many', result.output)
+
+    def test_render_many_subclass(self):
+        configs = [{"general": {}}]
+        result = list(OpenWisp.render_many(configs, workers=1))[0]
+        # OpenWisp requires general.hostname
+        self.assertIsInstance(result.error, ValidationError)
+
+    def test_render_many_templates_type_error(self):
+        # raised when called, not when the results are consumed
+        with self.assertRaises(TypeError):
+            OpenWrt.render_many([{}], templates={})
+        with self.assertRaises(TypeError):
+            fleet.render_many(OpenWrt, [{}], templates='{}', workers=1)
+
+    def test_parse_many(self):
+        sources = [OpenWrt(config).render() for config in self._configs(3)]
+        sources.insert(1, 'package network\noption wrong\n')
+        sources.insert(2, '/non/existing/archive.zip')
+        results = list(OpenWrt.parse_many(sources, workers=2))
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsInstance(results[2].error, EnvironmentError)
+        for i, index in ((0, 0), (3, 1), (4, 2)):
+            self.assertIsNone(results[i].error)
+            self.assertEqual(results[i].output['general']['hostname'],
+                             'router{0}'.format(index))
+
+    def test_parse_many_unexpected_error(self):
+        class BrokenOpenWrt(OpenWrt):
+            @classmethod
+            def parse(cls, source):
+                if source == 'broken':
+                    raise KeyError('gateway')
+                return super(BrokenOpenWrt, cls).parse(source)
+        sources = ['broken', OpenWrt(self._configs(1)[0]).render()]
+        results = list(BrokenOpenWrt.parse_many(sources, workers=1))
+        self.assertIsInstance(results[0].error, KeyError)
+        self.assertEqual(results[1].output['general']['hostname'], 'router0')
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import unittest
+
+import netjsonconfig
+
+HEAVY_MODULES = ['jsonschema', 'jinja2', 'multiprocessing',
+                 'netjsonconfig.backends.openwrt.schema']
+
+
+class TestImports(unittest.TestCase):
+    """
+    tests for the lazy imports of netjsonconfig
+    """
+    def _loaded(self, code):
+        code = '{0}\nimport sys\nprint(" ".join(sys.modules))'.format(code)
+        output = subprocess.check_output([sys.executable, '-c', code])
+        return [m for m in HEAVY_MODULES if m in output.decode().split()]
+
+    def test_import(self):
+        self.assertEqual(self._loaded('import netjsonconfig'), [])
+
+    def test_backend_import(self):
+        self.assertEqual(self._loaded('from netjsonconfig import OpenWrt, OpenWisp'), [])
+        loaded = self._loaded('from netjsonconfig import OpenWrt\n'
+                              'OpenWrt({"general": {"hostname": "a"}}).render()')
+        self.assertEqual(loaded, ['jsonschema', 'jinja2',
+                                  'netjsonconfig.backends.openwrt.schema'])
+
+    def test_attributes(self):
+        from netjsonconfig.backends.openwrt.openwrt import OpenWrt
+        self.assertIs(netjsonconfig.OpenWrt, OpenWrt)
+        self.assertIn('OpenWisp', dir(netjsonconfig))
+        with self.assertRaises(AttributeError):
+            netjsonconfig.OpenWrtt
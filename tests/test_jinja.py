@@ -0,0 +1,102 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from jinja2 import ChoiceLoader, Environment, PackageLoader
+
+from netjsonconfig import OpenWrt, OpenWisp
+from netjsonconfig.backends import jinja
+
+
+class TestJinja(unittest.TestCase):
+    """
+    tests for netjsonconfig.backends.jinja
+    """
+    config = {"general": {"hostname": "jinja_test"}}
+
+    def setUp(self):
+        # bytecode cache is not used by precompiled templates
+        jinja.use_precompiled = False
+        jinja.set_bytecode_cache(None)
+
+    def tearDown(self):
+        jinja.use_precompiled = True
+        jinja.set_bytecode_cache(None)
+
+    def test_shared_environment(self):
+        o1 = OpenWrt(self.config)
+        o2 = OpenWisp(self.config)
+        self.assertIs(o1.env, o2.env)
+        self.assertIsNot(o2.openwisp_env, o2.env)
+        self.assertIs(o2.openwisp_env, OpenWisp(self.config).openwisp_env)
+
+    def test_memory_cache(self):
+        cache = jinja.set_bytecode_cache('memory')
+        self.assertIs(jinja.get_bytecode_cache(), cache)
+        output = OpenWrt(self.config).render()
+        self.assertTrue(cache.storage)
+        # new environment reuses compiled templates
+        jinja.set_bytecode_cache(cache)
+        self.assertEqual(OpenWrt(self.config).render(), output)
+        self.assertIs(OpenWrt(self.config).env.bytecode_cache, cache)
+
+    def test_directory_cache(self):
+        directory = os.path.join(tempfile.mkdtemp(), 'cache')
+        try:
+            jinja.set_bytecode_cache(directory)
+            OpenWrt(self.config).render()
+            self.assertTrue(os.listdir(directory))
+        finally:
+            shutil.rmtree(os.path.dirname(directory))
+
+    def test_cache_disabled(self):
+        jinja.set_bytecode_cache(None)
+        self.assertIsNone(OpenWrt(self.config).env.bytecode_cache)
+
+    def test_cache_type_error(self):
+        with self.assertRaises(TypeError):
+            jinja.set_bytecode_cache(1)
+
+    def _precompiled_env(self, directory):
+        package = 'netjsonconfig.backends.openwrt'
+        loader = jinja.PrecompiledLoader(package, 'templates', directory)
+        return Environment(loader=ChoiceLoader([loader, PackageLoader(package)]),
+                           trim_blocks=True)
+
+    def test_precompiled_templates(self):
+        directory = tempfile.mkdtemp()
+        try:
+            jinja.compile_templates('netjsonconfig.backends.openwrt', target=directory)
+            env = self._precompiled_env(directory)
+            template = env.get_template('system.uci')
+            self.assertTrue(template.filename.startswith(directory))
+            source = OpenWrt(self.config).env.get_template('system.uci')
+            self.assertEqual(template.render(system={'hostname': 'x'}),
+                             source.render(system={'hostname': 'x'}))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_precompiled_fallback(self):
+        directory = tempfile.mkdtemp()
+        try:
+            jinja.compile_templates('netjsonconfig.backends.openwrt', target=directory)
+            manifest_path = os.path.join(directory, jinja.MANIFEST_NAME)
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            # simulate a template modified after compilation
+            manifest['templates']['system.uci'] = 'changed'
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f)
+            env = self._precompiled_env(directory)
+            self.assertTrue(env.get_template('system.uci').filename.endswith('system.uci'))
+            self.assertTrue(env.get_template('network.uci').filename.startswith(directory))
+            # compiled with another jinja2 version
+            manifest['jinja2'] = '0.0'
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f)
+            env = self._precompiled_env(directory)
+            self.assertTrue(env.get_template('network.uci').filename.endswith('network.uci'))
+        finally:
+            shutil.rmtree(directory)
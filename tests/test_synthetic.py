@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+from itertools import islice
+
+from netjsonconfig import OpenWisp, OpenWrt
+from netjsonconfig.synthetic import FleetGenerator, main, write_ndjson
+
+
+class TestSynthetic(unittest.TestCase):
+    """
+    tests for netjsonconfig.synthetic
+    """
+    def test_valid(self):
+        for backend_class in (OpenWrt, OpenWisp):
+            generator = FleetGenerator(backend_class, seed=1)
+            for config in generator.generate(50):
+                backend_class(config).validate()
+                self.assertIn('package network', backend_class(config).render())
+
+    def test_contents(self):
+        config = FleetGenerator(OpenWisp, interfaces=6, addresses=3, bridges=2,
+                                radios=2, wifi=3, routes=5, ip_rules=4, vlans=7,
+                                custom=3, files=2, file_size=100).device(0)
+        types = [i['type'] for i in config['interfaces']]
+        self.assertEqual(types.count('ethernet'), 6)
+        self.assertEqual(types.count('bridge'), 2)
+        self.assertEqual(types.count('wireless'), 6)
+        self.assertEqual(len(config['interfaces'][0]['addresses']), 3)
+        self.assertEqual(config['interfaces'][6]['bridge_members'], ['eth2', 'eth3'])
+        self.assertEqual(len(config['radios']), 2)
+        self.assertEqual(len(config['routes']), 5)
+        self.assertEqual(len(config['ip_rules']), 4)
+        self.assertEqual(len(config['switch'][0]['vlan']), 7)
+        self.assertEqual(len(config['firewall']), 3)
+        self.assertEqual(len(config['tc_options']), 2)
+        self.assertEqual([len(f['contents']) for f in config['files']], [100, 100])
+        OpenWisp(config).validate()
+        self.assertNotIn('tc_options', FleetGenerator(OpenWrt).device(0))
+
+    def test_empty(self):
+        generator = FleetGenerator(interfaces=0, bridges=0, radios=0, routes=0,
+                                   ip_rules=0, vlans=0, custom=0, files=0)
+        config = generator.device(0)
+        self.assertEqual(config['interfaces'], [])
+        OpenWrt(config).validate()
+
+    def test_wifi_without_networks(self):
+        config = FleetGenerator(interfaces=0, bridges=0, radios=1, wifi=2).device(0)
+        wireless = [i['wireless'] for i in config['interfaces']]
+        self.assertEqual(len(wireless), 2)
+        self.assertNotIn('network', wireless[0])
+        OpenWrt(config).validate()
+
+    def test_seed(self):
+        a = list(FleetGenerator(seed=1).generate(5))
+        self.assertEqual(a, list(FleetGenerator(seed=1).generate(5)))
+        self.assertNotEqual(a, list(FleetGenerator(seed=2).generate(5)))
+        # slices can be generated on their own
+        self.assertEqual(a[3:], list(FleetGenerator(seed=1).generate(2, start=3)))
+        self.assertEqual(a, list(islice(FleetGenerator(seed=1), 5)))
+
+    def test_write_ndjson(self):
+        path = tempfile.mktemp()
+        try:
+            with open(path, 'w') as f:
+                written = write_ndjson(FleetGenerator().generate(3), f)
+            self.assertEqual(written, 3)
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertEqual(json.loads(lines[2])['general']['hostname'], 'device-2')
+        finally:
+            os.remove(path)
+
+    def test_main(self):
+        path = tempfile.mktemp()
+        try:
+            main(['--backend', 'openwisp', '--count', '2', '--seed', '5',
+                  '--files', '0', '--output', path])
+            with open(path) as f:
+                configs = [json.loads(line) for line in f]
+            self.assertEqual(len(configs), 2)
+            self.assertNotIn('files', configs[0])
+            self.assertIn('tc_options', configs[0])
+            self.assertEqual(configs[1], json.loads(json.dumps(
+                FleetGenerator(OpenWisp, seed=5, files=0).device(1))))
+        finally:
+            os.remove(path)
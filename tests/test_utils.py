@@ -1,6 +1,7 @@
 import unittest
 
-from netjsonconfig.utils import merge_config
+from netjsonconfig.utils import (merge_config, canonical_json,
+                                LazyAttribute, LRUCache, Timings)
 
 
 class TestUtils(unittest.TestCase):
@@ -109,3 +110,77 @@ class TestUtils(unittest.TestCase):
                 {"c": "original"}
             ]
         })
+
+    def test_merge_config_no_copy(self):
+        template = {
+            "dict": {"a": "a"},
+            "shared": {"s": ["s"]},
+            "list": [{"a": "a"}]
+        }
+        config = {
+            "dict": {"b": "b"},
+            "new": {"n": "n"},
+            "list": [{"b": "b"}]
+        }
+        result = merge_config(template, config, copy=False)
+        self.assertEqual(result, merge_config(template, config))
+        # untouched subtrees are shared
+        self.assertIs(result['shared'], template['shared'])
+        self.assertIs(result['new'], config['new'])
+        self.assertIs(result['list'][0], template['list'][0])
+        # changed ones are not
+        self.assertEqual(template['dict'], {"a": "a"})
+        self.assertEqual(config['dict'], {"b": "b"})
+        self.assertEqual(template['list'], [{"a": "a"}])
+        self.assertEqual(config['list'], [{"b": "b"}])
+
+    def test_canonical_json(self):
+        value = {"b": [1.0, {"d": 2.0}, (3.0, 0.5)], "a": True, "c": None}
+        self.assertEqual(canonical_json(value),
+                         '{"a":true,"b":[1,{"d":2},[3,0.5]],"c":null}')
+        # original value is not modified
+        self.assertEqual(value["b"][1], {"d": 2.0})
+        self.assertIsInstance(value["b"][1]["d"], float)
+
+    def test_lru_cache(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        # "b" is the least recently used
+        cache.set('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1,
+                                         'size': 2, 'maxsize': 2})
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0,
+                                         'size': 0, 'maxsize': 2})
+
+    def test_timings(self):
+        calls = []
+        timings = Timings(callback=lambda phase, elapsed: calls.append(phase))
+        with timings.measure('b'):
+            pass
+        timings.add('a', 0.5)
+        timings.add('b', 1.0)
+        stats = timings.stats()
+        self.assertEqual(list(stats.keys()), ['b', 'a'])
+        self.assertEqual(stats['a'], {'calls': 1, 'time': 0.5})
+        self.assertEqual(stats['b']['calls'], 2)
+        self.assertTrue(stats['b']['time'] >= 1.0)
+        self.assertEqual(calls, ['b', 'a', 'b'])
+        self.assertIn('a', timings)
+        self.assertEqual(timings.report().splitlines()[2].split(), ['a', '1', '500.000'])
+        timings.clear()
+        self.assertEqual(len(timings), 0)
+
+    def test_lazy_attribute(self):
+        class Lazy(object):
+            path = LazyAttribute('os', 'path')
+        import os
+        self.assertIs(Lazy.path, os.path)
+        self.assertIs(Lazy().path, os.path)
+        Lazy.path = 'replaced'
+        self.assertEqual(Lazy().path, 'replaced')